@@ -2,9 +2,14 @@
 QFAST Benchmarking Script
 
 This script runs qfast on all ".unitary" files in the current directory.
+Extra model options can be given as a JSON object in the first argument,
+for example: python run_benchmarks.py '{"softmax_growth": 2}'
 """
 
 import os
+import re
+import sys
+import json
 import pickle
 import signal
 import logging
@@ -111,7 +116,14 @@ def term_trial ( signal_number, frame ):
     raise TrialTerminatedException()
 
 
-def run_tests():
+def get_evaluation_count ( log_out ):
+    """Totals the objective evaluations reported in a benchmark log."""
+
+    counts = re.findall( r"Model used (\d+) objective evaluations", log_out )
+    return sum( int( count ) for count in counts )
+
+
+def run_tests ( extra_model_options = {} ):
     # Register Signal Handlers
     signal.signal( signal.SIGALRM, term_trial )
     signal.signal( signal.SIGINT, term_trial )
@@ -155,6 +167,9 @@ def run_tests():
             timeouts = { 3: 10*60, 4: 20*60, 5: 45*60, 6: 90*60, 7: 360*60 }
             signal.alarm( timeouts[ num_qubits ] )
 
+            # Leave time for instantiation, the alarm is only a backstop
+            time_limit = 0.9 * timeouts[ num_qubits ]
+
             # Set Random Seed
             np.random.seed(21211411)
 
@@ -164,10 +179,12 @@ def run_tests():
             try:
                 qasm = synthesize( utry, model = "PermModel",
                                    hierarchy_fn = hierarchy_fn,
+                                   time_limit = time_limit,
                                    intermediate_solution_callback = soltree.add_intermediate,
                                    model_options = {
                                        "partial_solution_callback": soltree.add_partial,
-                                       "success_threshold": 1e-3
+                                       "success_threshold": 1e-3,
+                                       **extra_model_options
                                    } )
 
             except TrialTerminatedException:
@@ -211,9 +228,15 @@ def run_tests():
         print( "CX count:", data[test][1] )
         print( "Time (s):", data[test][2] )
         print( "Error:", data[test][3] )
+        print( "Evaluations:", get_evaluation_count( data[test][5] ) )
     print( "-" * 40 )
 
 
 if __name__ == "__main__":
-    run_tests()
+    extra_model_options = {}
+
+    if len( sys.argv ) > 1:
+        extra_model_options = json.loads( sys.argv[1] )
+
+    run_tests( extra_model_options )
 
@@ -20,6 +20,11 @@ combinersubclasses = {}
 
 # Main API
 from .decomposition.decomposer import Decomposer
+from .decomposition.asyncdecomposer import AsyncDecomposer
 from .instantiation.instantiater import Instantiater
+from .instantiation.asyncinstantiater import AsyncInstantiater
 from .recombination.combiner import Combiner
-from .synthesis import synthesize
+from .workerpool import WorkerPool
+from .synthesis import synthesize, synthesize_async
+from .batch import submit_many, synthesize_many
+from .cache import DecompositionCache
@@ -47,8 +47,25 @@ if __name__ == "__main__":
                          choices = plugins.get_optimizers(),
                          help = "The optimizer to use during decomposition." )
 
+    parser.add_argument( "-t", "--time-limit",
+                         type = float,
+                         default = None,
+                         help = "The number of seconds decomposition may take." )
+
+    parser.add_argument( "-c", "--checkpoint",
+                         type = str,
+                         default = None,
+                         help = "The file decomposition progress is saved to." )
+
+    parser.add_argument( "-r", "--resume",
+                         action = "store_true",
+                         help = "Resume decomposition from the checkpoint." )
+
     args = parser.parse_args()
 
+    if args.resume and args.checkpoint is None:
+        parser.error( "--resume requires --checkpoint." )
+
     # Logger init
     if args.verbose == 2:
         logger.setLevel( logging.DEBUG )
@@ -63,7 +80,10 @@ if __name__ == "__main__":
 
     qasm_out = synthesize( utry, model = args.model,
                            optimizer = args.optimizer,
-                           tool = args.native_tool )
+                           tool = args.native_tool,
+                           time_limit = args.time_limit,
+                           checkpoint_path = args.checkpoint,
+                           resume = args.resume )
 
     with open( args.qasm, "w" ) as f:
         f.write( qasm_out )
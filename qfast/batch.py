@@ -0,0 +1,138 @@
+"""
+This module implements batch synthesis.
+
+A batch synthesizes many unitaries at once. Every item runs as a
+synthesize_async call on a background event loop, so the blocks of all
+items share one warm WorkerPool.
+"""
+
+import asyncio
+import threading
+import concurrent.futures as cf
+
+from qfast.synthesis import synthesize_async
+from qfast.workerpool import get_default_pool
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop ( ):
+    """Returns the background event loop that runs batch items."""
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread( target = _loop.run_forever,
+                                       name = "qfast-batch", daemon = True )
+            thread.start()
+
+    return _loop
+
+
+async def _create_semaphore ( value ):
+    """Creates a semaphore in the background event loop."""
+    return asyncio.Semaphore( value )
+
+
+async def _synthesize_item ( semaphore, utry, synthesize_options ):
+    """Synthesizes one item once the batch has room for it."""
+    async with semaphore:
+        return await synthesize_async( utry, **synthesize_options )
+
+
+def submit_many ( utrys, pool = None, max_in_flight = None,
+                  **synthesize_options ):
+    """
+    Starts synthesizing a batch of unitaries.
+
+    Items are started in order, at most max_in_flight at once. The
+    decomposition models and native tool calls of all started items
+    are scheduled together on the same worker processes, so workers
+    stay busy while some items wait on their last blocks.
+
+    Args:
+        utrys (iterable[np.ndarray]): The unitaries to synthesize.
+
+        pool (None or WorkerPool): The worker processes to use. If None,
+            the default pool is used. It is kept warm between batches.
+
+        max_in_flight (None or int): The largest number of items that
+            are synthesized at once. If None, it defaults to twice the
+            number of worker processes.
+
+        synthesize_options (Dict): kwargs for synthesize_async, given
+            to every item.
+
+    Returns:
+        (list[concurrent.futures.Future]): The future qasm of every item.
+            Cancelling a future stops its item.
+
+    Raises:
+        ValueError: If max_in_flight is not positive.
+    """
+
+    if max_in_flight is not None and max_in_flight <= 0:
+        raise ValueError( "Maximum number of items in flight must be positive." )
+
+    pool = pool or get_default_pool()
+
+    if max_in_flight is None:
+        max_in_flight = 2 * pool.num_workers
+
+    loop = _get_loop()
+    semaphore = asyncio.run_coroutine_threadsafe( _create_semaphore( max_in_flight ),
+                                                  loop ).result()
+
+    synthesize_options = dict( synthesize_options, pool = pool )
+
+    return [ asyncio.run_coroutine_threadsafe( _synthesize_item( semaphore,
+                                                                 utry,
+                                                                 synthesize_options ),
+                                               loop )
+             for utry in utrys ]
+
+
+def synthesize_many ( utrys, pool = None, max_in_flight = None,
+                      **synthesize_options ):
+    """
+    Synthesizes a batch of unitaries, yielding results as they complete.
+
+    See submit_many for how items are scheduled. Closing the generator
+    early cancels the items that have not completed.
+
+    Args:
+        utrys (iterable[np.ndarray]): The unitaries to synthesize.
+
+        pool (None or WorkerPool): The worker processes to use. If None,
+            the default pool is used.
+
+        max_in_flight (None or int): The largest number of items that
+            are synthesized at once, see submit_many.
+
+        synthesize_options (Dict): kwargs for synthesize_async, given
+            to every item.
+
+    Yields:
+        (int, str): The index of an item in utrys and its qasm code.
+
+    Raises:
+        Exception: The error of the first item that fails. The other
+            items are cancelled.
+    """
+
+    futures = submit_many( utrys, pool, max_in_flight, **synthesize_options )
+    indices = { future: i for i, future in enumerate( futures ) }
+
+    try:
+        for future in cf.as_completed( futures ):
+            yield indices[ future ], future.result()
+
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,195 @@
+"""
+This module implements the DecompositionCache class.
+
+A DecompositionCache persists synthesis results on disk, keyed by the
+content of the unitary and the configuration used to synthesize it.
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+
+import numpy as np
+
+from qfast import utils
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+class DecompositionCache():
+    """The DecompositionCache Class."""
+
+    def __init__ ( self, directory, max_size = 2 ** 28, tol = 1e-8 ):
+        """
+        Opens or creates a cache in directory.
+
+        Args:
+            directory (str): The directory that holds the cache entries.
+                It may be shared by several processes.
+
+            max_size (int): The largest total size of all entries in
+                bytes. The least recently used entries are evicted when
+                it is exceeded.
+
+            tol (float): Unitaries that agree within tol up to global
+                phase share their entries.
+
+        Raises:
+            ValueError: If max_size or tol is not positive.
+        """
+
+        if max_size <= 0:
+            raise ValueError( "Cache size must be positive." )
+
+        if tol <= 0:
+            raise ValueError( "Cache tolerance must be positive." )
+
+        self.directory = directory
+        self.max_size = max_size
+        self.tol = tol
+
+        os.makedirs( self.directory, exist_ok = True )
+
+    def canonicalize ( self, utry ):
+        """
+        Removes the global phase of a unitary and rounds it to tol.
+
+        The phase is fixed by making the first element of largest
+        magnitude real and positive.
+
+        Args:
+            utry (np.ndarray): The unitary to canonicalize.
+
+        Returns:
+            (np.ndarray): The integer real and imaginary parts of the
+                canonical unitary in multiples of tol.
+        """
+
+        if not utils.is_square_matrix( utry ):
+            raise TypeError( "Invalid unitary." )
+
+        flat = utry.flatten()
+        mags = np.abs( flat )
+        idx = np.argmax( mags > np.max( mags ) - self.tol )
+        utry = utry * ( np.abs( flat[ idx ] ) / flat[ idx ] )
+
+        parts = np.stack( [ np.real( utry ), np.imag( utry ) ] )
+        return np.round( parts / self.tol ).astype( np.int64 )
+
+    def get_key ( self, utry, **config ):
+        """
+        Computes the cache key of a unitary and a configuration.
+
+        Args:
+            utry (np.ndarray): The unitary.
+
+            config (Dict): Everything else the result depends on.
+                Entries with callable values, such as callbacks,
+                are ignored.
+
+        Returns:
+            (str): The key.
+        """
+
+        config = sorted( ( name, value ) for name, value in config.items()
+                         if not callable( value ) )
+
+        h = hashlib.sha256()
+        h.update( self.canonicalize( utry ).tobytes() )
+        h.update( str( utry.shape ).encode() )
+
+        for name, value in config:
+            if isinstance( value, dict ):
+                value = sorted( ( k, v ) for k, v in value.items()
+                                if not callable( v ) )
+            h.update( repr( ( name, value ) ).encode() )
+
+        return h.hexdigest()
+
+    def get_path ( self, key ):
+        """Returns the file of an entry."""
+        return os.path.join( self.directory, key + ".pkl" )
+
+    def get ( self, key ):
+        """
+        Looks up an entry.
+
+        Args:
+            key (str): The entry's key, see get_key.
+
+        Returns:
+            (None or object): The entry's value or None on a miss.
+        """
+
+        path = self.get_path( key )
+
+        try:
+            with open( path, "rb" ) as f:
+                value = pickle.load( f )
+        except FileNotFoundError:
+            return None
+        except ( EOFError, pickle.UnpicklingError ):
+            logger.warning( "Ignoring corrupt cache entry %s." % key )
+            return None
+
+        # Mark the entry as recently used for eviction
+        try:
+            os.utime( path )
+        except FileNotFoundError:
+            pass
+
+        logger.debug( "Cache hit for %s." % key )
+        return value
+
+    def put ( self, key, value ):
+        """
+        Stores an entry, replacing any previous entry with the same key.
+
+        The entry is written to a temporary file that atomically replaces
+        the entry, so concurrent readers never see partial entries.
+
+        Args:
+            key (str): The entry's key, see get_key.
+
+            value (object): The picklable value to store.
+        """
+
+        with tempfile.NamedTemporaryFile( dir = self.directory,
+                                          suffix = ".tmp",
+                                          delete = False ) as f:
+            pickle.dump( value, f, pickle.HIGHEST_PROTOCOL )
+
+        os.replace( f.name, self.get_path( key ) )
+        self.evict()
+
+    def evict ( self ):
+        """Removes least recently used entries until within max_size."""
+        entries = []
+
+        for name in os.listdir( self.directory ):
+            if not name.endswith( ".pkl" ):
+                continue
+
+            path = os.path.join( self.directory, name )
+
+            try:
+                stat = os.stat( path )
+            except FileNotFoundError:
+                continue
+
+            entries.append( ( stat.st_mtime, stat.st_size, path ) )
+
+        total_size = sum( size for _, size, _ in entries )
+
+        for _, size, path in sorted( entries ):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove( path )
+            except FileNotFoundError:
+                pass
+
+            total_size -= size
@@ -0,0 +1,211 @@
+"""
+This module implements the AsyncDecomposer class.
+
+The async decomposer decomposes like the decomposer, but solves its
+models in worker processes so an asyncio event loop keeps running.
+"""
+
+
+import time
+import asyncio
+import itertools as it
+
+from qfast.gate import Gate
+from qfast.workerpool import get_default_pool
+from qfast.decomposition.decomposer import Decomposer, default_hierarchy_fn
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def _solve_model ( model, time_limit, max_depth ):
+    """Solves a model in a worker process."""
+    gate_list = model.solve( time_limit, max_depth )
+    return gate_list, model.num_evaluations
+
+
+class AsyncDecomposer ( Decomposer ):
+
+    def __init__ ( self, utry, target_gate_size = 2, model = "PermModel",
+                   optimizer = "LBFGSOptimizer",
+                   hierarchy_fn = default_hierarchy_fn,
+                   topology = None, intermediate_solution_callback = None,
+                   model_options = {}, cache = None, pool = None,
+                   max_concurrency = None ):
+        """
+        Initializes an async decomposer.
+
+        Args:
+            utry (np.ndarray): A unitary matrix to decompose
+
+            target_gate_size (int): After decomposition, this will be
+                the largest size of any gate in the returned list.
+
+            model (str): The circuit model to use during decomposition.
+
+            optimizer (str): The optimizer to use during decomposition.
+
+            hierarchy_fn (callable): This function determines the
+                decomposition hierarchy.
+
+            topoology (Topology): Determines the connection of qubits.
+                If none, will be set to all-to-all.
+
+            intermediate_solution_callback (None or callable): Callback
+                function for intermediate solutions. If not None, then
+                a function that takes in a list[Gates] and returns nothing.
+                It is called in the event loop.
+
+            model_options (Dict): kwargs for model. They must be
+                picklable.
+
+            cache (None or DecompositionCache): If not None, finished
+                decompositions are looked up in and stored to this cache.
+
+            pool (None or WorkerPool): The worker processes that solve
+                the models. If None, the default pool is used.
+
+            max_concurrency (None or int): The largest number of models
+                one decompose call solves at once. If None, every gate
+                of a level is decomposed at once.
+
+        Raises:
+            ValueError: If the target_gate_size is nonpositive or too
+                large, or max_concurrency is not positive.
+
+            RuntimeError: If the model or optimizer cannot be found.
+        """
+
+        super().__init__( utry, target_gate_size, model, optimizer,
+                          hierarchy_fn, topology,
+                          intermediate_solution_callback, model_options,
+                          cache = cache )
+
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError( "Maximum concurrency must be positive." )
+
+        self.pool = pool or get_default_pool()
+        self.max_concurrency = max_concurrency
+
+    async def decompose ( self, time_limit = None, max_depth = None ):
+        """
+        Performs the decomposition phase.
+
+        The gates of a level are decomposed concurrently, otherwise
+        this behaves like Decomposer.decompose. Checkpoints are not
+        supported. If the awaiting task is cancelled, the models that
+        are being solved stop at their next step.
+
+        Args:
+            time_limit (None or float): The number of seconds the whole
+                decomposition may take. If None, there is no time limit.
+
+            max_depth (None or int): The largest depth of every model,
+                see CircuitModel.solve. If None, there is no depth limit.
+
+        Returns:
+            (list[gate.Gate]): List of gates that implements the
+                decomposer's unitary. Each gate will have a size less than
+                or equal to the target gate size.
+        """
+
+        deadline = None
+        if time_limit is not None:
+            deadline = time.time() + time_limit
+
+        key = None
+        if self.cache is not None and time_limit is None and max_depth is None:
+            key = self.get_cache_key()
+            entry = self.cache.get( key )
+
+            if entry is not None:
+                logger.info( "Found decomposition in cache." )
+                self.distance = entry[ "distance" ]
+                return entry[ "gate_list" ]
+
+        cancel_event = self.pool.create_event()
+        semaphore = None
+        if self.max_concurrency is not None:
+            semaphore = asyncio.Semaphore( self.max_concurrency )
+
+        gate_list = [ Gate( self.utry, tuple( range( self.num_qubits ) ) ) ]
+
+        try:
+            while any( [ gate.num_qubits > self.target_gate_size
+                         for gate in gate_list ] ):
+
+                sub_gate_lists = await asyncio.gather( *[
+                    self.decompose_gate_async( gate, deadline, max_depth,
+                                               cancel_event, semaphore )
+                    for gate in gate_list ] )
+
+                gate_list = list( it.chain.from_iterable( sub_gate_lists ) )
+
+                if self.intermediate_solution_callback is not None:
+                    self.intermediate_solution_callback( gate_list )
+
+        except BaseException:
+            # Stops the models of sibling gates that are still running
+            cancel_event.set()
+            raise
+
+        self.distance = self.get_distance( gate_list )
+        logger.info( "Decomposition finished at %e distance." % self.distance )
+
+        if key is not None:
+            self.cache.put( key, { "gate_list": gate_list,
+                                   "distance": self.distance } )
+
+        return gate_list
+
+    async def decompose_gate_async ( self, gate, deadline, max_depth,
+                                     cancel_event, semaphore = None ):
+        """
+        Decomposes one gate of an intermediate solution in a worker.
+
+        Args:
+            gate (Gate): The gate to decompose. Gates that are small
+                enough are returned as is.
+
+            deadline (None or float): The time the model must finish by.
+
+            max_depth (None or int): The model's depth limit.
+
+            cancel_event (Event): Stops the model once set.
+
+            semaphore (None or asyncio.Semaphore): If not None, it is
+                held while the model is solved.
+
+        Returns:
+            (list[gate.Gate]): The smaller gates implementing gate, with
+                locations in the decomposer's qubits.
+        """
+
+        if gate.num_qubits <= self.target_gate_size:
+            return [ gate ]
+
+        if semaphore is None:
+            return await self.run_gate_model( gate, deadline, max_depth,
+                                              cancel_event )
+
+        async with semaphore:
+            return await self.run_gate_model( gate, deadline, max_depth,
+                                              cancel_event )
+
+    async def run_gate_model ( self, gate, deadline, max_depth,
+                               cancel_event ):
+        """Solves the model of one gate in a worker process."""
+        remaining = None
+        if deadline is not None:
+            remaining = max( 0, deadline - time.time() )
+
+        m = self.get_gate_model( gate )
+        m.cancel_event = cancel_event
+
+        sub_gate_list, num_evaluations = await self.pool.run( cancel_event,
+                                                              _solve_model, m,
+                                                              remaining,
+                                                              max_depth )
+        logger.info( "Model used %d objective evaluations." % num_evaluations )
+
+        return self.relocate( gate, sub_gate_list )
@@ -8,16 +8,26 @@ All model plugins must extend this class and implement the
 functionality outlined here.
 """
 
+import os
 import abc
+import copy
+import time
+import atexit
 
 import numpy as np
 import functools as ft
 
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+
 import qfast
 from qfast import utils
 from qfast.gate import Gate
 from qfast.decomposition.gatemodel import GateModel
 
+import logging
+logger = logging.getLogger( "qfast" )
+
 
 class ModelMeta ( abc.ABCMeta ):
     """The CircuitModel Metaclass."""
@@ -29,11 +39,88 @@ class ModelMeta ( abc.ABCMeta ):
         super().__init__( name, bases, attr )
 
 
+def _optimize_model ( model, fine = False ):
+    """Optimizes a model in a worker process and sends it back."""
+    model.optimize( fine )
+    return model
+
+
+# Worker pools of optimize_models, keyed by process and size
+_executors = {}
+
+
+def _get_executor ( num_workers ):
+    """
+    Returns the worker pool of optimize_models with num_workers workers.
+
+    Pools are started on first use and reused by later calls, since
+    the coarse optimizations they run are often cheaper than starting
+    worker processes. A process never reuses the pools of its parent.
+    """
+
+    key = ( os.getpid(), num_workers )
+
+    if key not in _executors:
+        _executors[ key ] = ProcessPoolExecutor( num_workers )
+
+    return _executors[ key ]
+
+
+def _shutdown_executors ( ):
+    """Shuts down the worker pools of optimize_models, see _get_executor."""
+    pid = os.getpid()
+
+    for key in list( _executors ):
+        if key[0] == pid:
+            _executors.pop( key ).shutdown()
+
+
+atexit.register( _shutdown_executors )
+
+
+def optimize_models ( models, num_workers = None, fine = False ):
+    """
+    Optimizes several independent models concurrently.
+
+    Calls with the same num_workers share one pool of worker processes.
+
+    Args:
+        models (List[CircuitModel]): The models to optimize. Each is
+            optimized from its current input.
+
+        num_workers (None or int): The size of the worker pool. If None,
+            it defaults to the number of processors on the machine.
+
+        fine (bool): If true, perform fine optimization calls.
+
+    Returns:
+        (List[CircuitModel]): The optimized models in the same order.
+    """
+
+    if num_workers == 1 or len( models ) <= 1:
+        return [ _optimize_model( model, fine ) for model in models ]
+
+    pool = _get_executor( num_workers )
+
+    try:
+        return list( pool.map( _optimize_model, models,
+                               [ fine ] * len( models ) ) )
+
+    except BrokenProcessPool:
+        # A worker died, so the next call starts a new pool
+        _executors.pop( ( os.getpid(), num_workers ), None )
+        raise
+
+
 class CircuitModel ( metaclass = ModelMeta ):
     """The CircuitModel abstract base class."""
 
+    # Models that set this implement get_state and set_state
+    supports_checkpoints = False
+
     def __init__ ( self, utry, gate_size, locations, optimizer,
-                   success_threshold = 1e-3, partial_solution_callback = None ):
+                   success_threshold = 1e-3, partial_solution_callback = None,
+                   objective = "trace", initialization = "random" ):
         """
         Default constructor for CircuitModels.
 
@@ -52,8 +139,20 @@ class CircuitModel ( metaclass = ModelMeta ):
                 partial solutions. If not None, then callable that takes
                 a list[gate.Gate] and returns nothing.
 
+            objective (str): The objective minimized by the optimizer.
+                Either "trace", which minimizes -Re tr( U^dagger M ), or
+                "phase_invariant", which minimizes
+                1 - |tr( U^dagger M )|^2 / N^2 and so ignores global phase
+                like the distance used for success does.
+
+            initialization (str): How new gates are given inputs.
+                Either "random", which draws them uniformly at random, or
+                "residual", which projects the logarithm of the residual
+                of the preceding gates onto the new gate's location.
+
         Raises:
-            ValueError: If the gate_size or locations are invalid.
+            ValueError: If the gate_size, locations, objective or
+                initialization are invalid.
         """
 
         if partial_solution_callback is not None:
@@ -71,7 +170,15 @@ class CircuitModel ( metaclass = ModelMeta ):
                                          self.gate_size ):
             raise TypeError( "Invalid locations" )
 
+        if objective not in [ "trace", "phase_invariant" ]:
+            raise ValueError( "Invalid objective." )
+
+        if initialization not in [ "random", "residual" ]:
+            raise ValueError( "Invalid initialization." )
+
         self.partial_solution_callback = partial_solution_callback
+        self.objective = objective
+        self.initialization = initialization
         self.locations = locations
         self.optimizer = optimizer
         self.utry = utry
@@ -80,33 +187,144 @@ class CircuitModel ( metaclass = ModelMeta ):
         self.gates = []
         self.param_ranges = [ 0 ]
         self.x = self.get_initial_input()
+        self.num_evaluations = 0
+        self.checkpoint_callback = None
+        self.cancel_event = None
+        self.start_budget()
 
     @abc.abstractmethod
-    def solve ( self ):
+    def solve ( self, time_limit = None, max_depth = None ):
         """
         Solve the decomposition problem defined in this CircuitModel.
 
+        If a budget runs out before success, the closest circuit found
+        so far is returned instead. Its distance is best_distance.
+
+        Args:
+            time_limit (None or float): The number of seconds the model
+                may search for. If None, there is no time limit.
+
+            max_depth (None or int): The largest depth the model may
+                search. If None, there is no depth limit.
+
         Returns:
             (List[Gate]): The list of gates that implement the unitary.
         """
 
+    def start_budget ( self, time_limit = None, max_depth = None ):
+        """Starts the budget of a solve call, see solve."""
+        self.deadline = None
+
+        if time_limit is not None:
+            self.deadline = time.time() + time_limit
+
+        self.max_depth = max_depth
+        self.best_distance = np.inf
+        self.best_gate_list = None
+
+    def budget_exhausted ( self ):
+        """
+        If the model has run out of budget.
+
+        A budget never runs out before a circuit has been recorded,
+        see record_best.
+
+        Raises:
+            CancelledError: If the cancel_event is set. A cancel_event
+                is an Event that stops the model from another thread
+                or process.
+        """
+
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CancelledError( "Model was cancelled." )
+
+        if self.best_gate_list is None:
+            return False
+
+        if self.deadline is not None and time.time() >= self.deadline:
+            return True
+
+        if self.max_depth is not None and self.depth() > self.max_depth:
+            return True
+
+        return False
+
+    def record_best ( self ):
+        """
+        Remembers the current circuit if it is the closest so far.
+
+        Generic gates are hardened to one location by get_gate_list,
+        so the distance of the gate list is compared, not the model's.
+        """
+
+        gate_list = self.get_gate_list()
+        distance = self.get_distance( gate_list )
+
+        if distance < self.best_distance:
+            self.best_distance = distance
+            self.best_gate_list = gate_list
+
+    def record_solution ( self, gate_list ):
+        """Records and returns the gates of a successful circuit."""
+        self.best_distance = self.get_distance( gate_list )
+        self.best_gate_list = gate_list
+        return gate_list
+
+    def get_best_gate_list ( self ):
+        """Returns the closest circuit found when the budget ran out."""
+        logger.warning( "Budget exhausted, returning circuit at %e distance."
+                        % self.best_distance )
+        return self.best_gate_list
+
     def get_initial_input ( self ):
         """Get initial input of model."""
         if self.depth() == 0:
             return np.array([])
 
-        return np.concatenate( [ gate.get_initial_input()
-                                 for gate in self.gates ] )
+        if self.initialization == "random":
+            return np.concatenate( [ gate.get_initial_input()
+                                     for gate in self.gates ] )
+
+        # Each gate is informed by the already initialized gates before it
+        x = np.array( [] )
+        M = np.identity( self.utry_dag.shape[0] )
+
+        for gate in self.gates:
+            gate_input = gate.get_initial_input( M @ self.utry_dag )
+            M = gate.get_matrix( gate_input ) @ M
+            x = np.concatenate( ( x, gate_input ) )
+
+        return x
+
+    def get_gate_initial_input ( self, gate, num_gates ):
+        """Produces inputs for a gate placed after num_gates gates."""
+        if self.initialization == "random":
+            return gate.get_initial_input()
+
+        return gate.get_initial_input( self.get_residual( num_gates ) )
 
     def reset_input ( self ):
-        """Resets input and recalculates parameter ranges."""
+        """
+        Resets input and recalculates parameter ranges.
+
+        With residual initialization, the inputs of all but the last gate
+        are kept and only the last gate is initialized from the residual.
+        """
+
         self.param_ranges = [ 0 ]
 
         for gate in self.gates:
             self.param_ranges.append( self.param_ranges[-1]
                                       + gate.get_param_count() )
 
-        self.x = self.get_initial_input()
+        if self.initialization == "random" or self.depth() == 0:
+            self.x = self.get_initial_input()
+            return
+
+        self.x = self.x[ : self.param_ranges[-2] ]
+        gate_input = self.get_gate_initial_input( self.gates[-1],
+                                                  self.depth() - 1 )
+        self.x = np.concatenate( ( self.x, gate_input ) )
 
     def append_gate ( self, gate, init_input = None ):
         """Append a gate onto the model."""
@@ -114,13 +332,13 @@ class CircuitModel ( metaclass = ModelMeta ):
         if not isinstance( gate, GateModel ):
             raise TypeError( "Gate is not a model gate.""" )
 
+        if init_input is None:
+            init_input = self.get_gate_initial_input( gate, self.depth() )
+
         self.gates.append( gate )
         self.param_ranges.append( self.param_ranges[-1]
                                   + gate.get_param_count() )
-        if init_input is not None:
-            self.x = np.concatenate( ( self.x, init_input ) )
-        else:
-            self.x = np.concatenate( ( self.x, gate.get_initial_input() ) )
+        self.x = np.concatenate( ( self.x, init_input ) )
 
     def insert_gate ( self, idx, gate, init_input = None ):
         """Insert a gate into the model."""
@@ -128,23 +346,40 @@ class CircuitModel ( metaclass = ModelMeta ):
         if not isinstance( gate, GateModel ):
             raise TypeError( "Gate is not a model gate.""" )
 
-        self.gates.insert( idx, gate )
-
         idx = len( self.gates ) + idx if idx < 0 else idx
-        if init_input is not None:
-            self.x = np.concatenate( ( self.x[ : self.param_ranges[ idx ] ],
-                                       init_input,
-                                       self.x[ self.param_ranges[ idx ] : ] ) )
-        else:
-            self.x = np.concatenate( ( self.x[ : self.param_ranges[ idx ] ],
-                                       gate.get_initial_input(),
-                                       self.x[ self.param_ranges[ idx ] : ] ) )
+
+        if init_input is None:
+            init_input = self.get_gate_initial_input( gate, idx )
+
+        self.gates.insert( idx, gate )
+        self.x = np.concatenate( ( self.x[ : self.param_ranges[ idx ] ],
+                                   init_input,
+                                   self.x[ self.param_ranges[ idx ] : ] ) )
 
         self.param_ranges = [ 0 ]
         for gate in self.gates:
             self.param_ranges.append( self.param_ranges[-1]
                                       + gate.get_param_count() )
 
+    def remove_gate ( self, idx ):
+        """Remove and return the gate at idx in model."""
+
+        if len( self.gates ) <= 0:
+            raise IndexError( "No gates in model to remove." )
+
+        idx = len( self.gates ) + idx if idx < 0 else idx
+
+        self.x = np.concatenate( ( self.x[ : self.param_ranges[ idx ] ],
+                                   self.x[ self.param_ranges[ idx + 1 ] : ] ) )
+        gate = self.gates.pop( idx )
+
+        self.param_ranges = [ 0 ]
+        for g in self.gates:
+            self.param_ranges.append( self.param_ranges[-1]
+                                      + g.get_param_count() )
+
+        return gate
+
     def pop_gate ( self ):
         """Remove and return the last gate in model."""
 
@@ -170,6 +405,15 @@ class CircuitModel ( metaclass = ModelMeta ):
         dem = M.shape[0]
         return 1 - ( num / dem )
 
+    def get_distance ( self, gate_list ):
+        """Calculates the distance of a gate list to the target unitary."""
+        M = np.identity( self.utry_dag.shape[0] )
+
+        for gate in gate_list:
+            M = gate.get_circuit_matrix( self.num_qubits ) @ M
+
+        return utils.hilbert_schmidt_distance( self.utry, M )
+
     def success ( self ):
         """If the model has successfully modeled the target unitary."""
         if self.partial_solution_callback is not None:
@@ -214,6 +458,32 @@ class CircuitModel ( metaclass = ModelMeta ):
 
         return ft.reduce( np.matmul, reversed( matrices ) )
 
+    def get_residual ( self, num_gates = None ):
+        """
+        Returns the residual of the circuit with respect to the target.
+
+        The residual is R = M U^dagger, where M is the product of the
+        first num_gates gates at the current input and U is the target.
+        A gate G applied after them is optimal when G = R^dagger.
+
+        Args:
+            num_gates (None or int): The number of leading gates to
+                include. If None, all gates are included.
+
+        Returns:
+            (np.ndarray): The residual matrix.
+        """
+
+        if num_gates is None:
+            num_gates = self.depth()
+
+        M = np.identity( self.utry_dag.shape[0] )
+
+        for i in range( num_gates ):
+            M = self.gates[i].get_matrix( self.get_input_slice( i ) ) @ M
+
+        return M @ self.utry_dag
+
     def get_matrix_and_derivatives ( self, x ):
         """Returns the circuit model's matrix and derivatives."""
         if len( self.gates ) == 0:
@@ -256,13 +526,133 @@ class CircuitModel ( metaclass = ModelMeta ):
 
     def objective_fn ( self, x ):
         """The objective function of the optimizer."""
+        self.num_evaluations += 1
         M, dM = self.get_matrix_and_derivatives( x )
-        obj = -np.real( np.trace( self.utry_dag @ M ) )
-        jacs = []
-        for dm in dM:
-            jacs.append( -np.real( np.trace( self.utry_dag @ dm ) ) )
-        jacs = np.array( jacs )
-        return obj, jacs
+
+        # tr( A B ) is the sum of the elementwise product of A^T and B
+        utry_dag_T = self.utry_dag.T
+        tr = np.sum( utry_dag_T * M )
+        dtr = np.einsum( "ij,kij->k", utry_dag_T, dM )
+
+        if self.objective == "phase_invariant":
+            dem = M.shape[0] ** 2
+            obj = 1 - ( np.abs( tr ) ** 2 ) / dem
+            jacs = -2 * np.real( np.conj( tr ) * dtr ) / dem
+            return obj, jacs
+
+        return -np.real( tr ), -np.real( dtr )
+
+    def fork ( self ):
+        """
+        Returns an independent copy of the model.
+
+        The copy does not report partial solutions or checkpoints and
+        cannot be cancelled, so it can be sent to worker processes.
+        """
+
+        callbacks = ( self.partial_solution_callback,
+                      self.checkpoint_callback,
+                      self.cancel_event )
+        self.partial_solution_callback = None
+        self.checkpoint_callback = None
+        self.cancel_event = None
+
+        try:
+            return copy.deepcopy( self )
+        finally:
+            ( self.partial_solution_callback, self.checkpoint_callback,
+              self.cancel_event ) = callbacks
+
+    def adopt ( self, other ):
+        """Takes over the state of another copy of this model."""
+        callbacks = ( self.partial_solution_callback,
+                      self.checkpoint_callback,
+                      self.cancel_event )
+        self.__dict__.update( other.__dict__ )
+        ( self.partial_solution_callback, self.checkpoint_callback,
+          self.cancel_event ) = callbacks
+
+    def get_gate_contribution ( self, gate_idx ):
+        """Returns the distance of a gate's unitary to the identity."""
+        M = self.gates[ gate_idx ].get_gate_matrix( self.get_input_slice( gate_idx ) )
+        return utils.hilbert_schmidt_distance( M, np.identity( M.shape[0] ) )
+
+    def prune ( self, max_attempts = None ):
+        """
+        Removes gates that a successful model does not need.
+
+        Gates are tried in order of their contribution, see
+        get_gate_contribution, smallest first. Each is removed and
+        the remaining gates are finely re-optimized from their current
+        inputs. The removal is kept if the model stays within the
+        success threshold and undone otherwise. Pruning stops early
+        when the budget runs out.
+
+        Args:
+            max_attempts (None or int): The largest number of gates
+                tried. If None, every gate is tried once.
+
+        Returns:
+            (int): The number of gates removed.
+        """
+
+        if self.distance() >= self.success_threshold:
+            return 0
+
+        # Lets the budget stop pruning, see budget_exhausted
+        self.record_best()
+
+        contributions = [ self.get_gate_contribution( i )
+                          for i in range( self.depth() ) ]
+        candidates = [ self.gates[i] for i in np.argsort( contributions,
+                                                           kind = "stable" ) ]
+
+        if max_attempts is not None:
+            candidates = candidates[ : max_attempts ]
+
+        num_removed = 0
+        for gate in candidates:
+            if self.depth() <= 1 or self.budget_exhausted():
+                break
+
+            saved = ( list( self.gates ), list( self.param_ranges ),
+                      np.copy( self.x ) )
+            self.remove_gate( self.gates.index( gate ) )
+            self.optimize( fine = True )
+
+            if self.distance() < self.success_threshold:
+                num_removed += 1
+                logger.info( "Pruned a gate, depth %d at %e distance."
+                             % ( self.depth(), self.distance() ) )
+            else:
+                self.gates, self.param_ranges, self.x = saved
+
+        return num_removed
+
+    def get_state ( self ):
+        """
+        Returns the model's search state.
+
+        Model plugins that set supports_checkpoints override this and
+        implement set_state( state ), which continues the search from
+        a state returned here.
+
+        Returns:
+            (None or Dict): A picklable description of the search so far,
+                or None if there is no state to save.
+        """
+
+        return None
+
+    def checkpoint ( self ):
+        """Reports the model's search state to the checkpoint callback."""
+        if self.checkpoint_callback is None:
+            return
+
+        state = self.get_state()
+
+        if state is not None:
+            self.checkpoint_callback( state )
 
     def optimize ( self, fine = False ):
         """Perform an optimizer call."""
@@ -6,6 +6,12 @@ smaller ones.
 """
 
 
+import os
+import time
+import pickle
+import tempfile
+import functools as ft
+
 import numpy as np
 import itertools as it
 
@@ -18,13 +24,25 @@ import logging
 logger = logging.getLogger( "qfast" )
 
 
+def default_hierarchy_fn ( num_qubits ):
+    """
+    Returns the gate size the default hierarchy decomposes num_qubits into.
+
+    It is a module-level function, so decomposers that use it can be
+    pickled and sent to processes started with any method.
+    """
+
+    return num_qubits // 3 if num_qubits > 5 else 2
+
+
 class Decomposer():
 
     def __init__ ( self, utry, target_gate_size = 2, model = "PermModel",
                    optimizer = "LBFGSOptimizer",
-                   hierarchy_fn = lambda x : x // 3 if x > 5 else 2,
+                   hierarchy_fn = default_hierarchy_fn,
                    topology = None, intermediate_solution_callback = None,
-                   model_options = {} ):
+                   model_options = {}, checkpoint_path = None,
+                   checkpoint_interval = 60, cache = None ):
         """
         Initializes a decomposer.
 
@@ -48,8 +66,21 @@ class Decomposer():
                 function for intermediate solutions. If not None, then
                 a function that takes in a list[Gates] and returns nothing.
 
+            model_options (Dict): kwargs for model
+
+            checkpoint_path (None or str): If not None, the decomposition
+                progress is saved to this file, see decompose.
+
+            checkpoint_interval (float): The minimum number of seconds
+                between two checkpoints of an unfinished model.
+
+            cache (None or DecompositionCache): If not None, finished
+                decompositions are looked up in and stored to this cache.
+
         Raises:
-            ValueError: If the target_gate_size is nonpositive or too large.
+            ValueError: If the target_gate_size is nonpositive or too large,
+                or if checkpoint_path is given for a model that does not
+                support checkpoints.
 
             RuntimeError: If the model or optimizer cannot be found.
         """
@@ -88,46 +119,341 @@ class Decomposer():
 
         self.model = plugins.get_model( model )
 
+        if checkpoint_path is not None and not self.model.supports_checkpoints:
+            raise ValueError( f"Model does not support checkpoints: {model}" )
+
         if optimizer not in plugins.get_optimizers():
             raise RuntimeError( f"Cannot find optimizer: {optimizer}" )
 
         self.model_options = model_options
         self.optimizer = plugins.get_optimizer( optimizer )
 
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint = time.time()
+        self.cache = cache
+
         logger.debug( "Created decomposer with %s and %s."
                       % ( model, optimizer ) )
 
-    def decompose ( self ):
+    def decompose ( self, time_limit = None, max_depth = None,
+                    resume = False ):
         """
         Performs the decomposition phase.
 
+        If a budget runs out, every model returns the closest circuit it
+        has found so far. Gates still left to decompose are then given
+        no time, so they return after their first optimization. The
+        distance of the returned gates to the unitary is stored
+        in distance.
+
+        With a checkpoint_path, the progress is saved after every
+        decomposed gate and periodically while a model searches.
+        A checkpoint holds the current level's gates, the finished
+        smaller gates and the search state of the unfinished model.
+        It is written to a temporary file that then replaces the
+        previous checkpoint, so a crash never leaves a partial file.
+
+        With a cache, a decomposition without budgets is first looked
+        up in the cache and stored to it once finished. Decompositions
+        cut short by a budget are never cached.
+
+        Args:
+            time_limit (None or float): The number of seconds the whole
+                decomposition may take. If None, there is no time limit.
+
+            max_depth (None or int): The largest depth of every model,
+                see CircuitModel.solve. If None, there is no depth limit.
+
+            resume (bool): If true, continue from the checkpoint at
+                checkpoint_path instead of starting over.
+
         Returns:
             (list[gate.Gate]): List of gates that implements the
                 decomposer's unitary. Each gate will have a size less than
                 or equal to the target gate size.
+
+        Raises:
+            ValueError: If resuming from a checkpoint of another
+                unitary or model.
         """
 
-        gate_list = [ Gate( self.utry, tuple( range( self.num_qubits ) ) ) ] 
+        deadline = None
+        if time_limit is not None:
+            deadline = time.time() + time_limit
 
-        while any( [ gate.num_qubits > self.target_gate_size
-                     for gate in gate_list ] ):
+        self.level = 0
+        self.gate_list = [ Gate( self.utry, tuple( range( self.num_qubits ) ) ) ] 
+        self.new_gate_list = []
+        self.index = 0
+        model_state = None
+
+        key = None
+        if self.cache is not None and time_limit is None and max_depth is None:
+            key = self.get_cache_key()
+
+        if resume:
+            model_state = self.load_checkpoint()
+
+        elif key is not None:
+            entry = self.cache.get( key )
 
-            new_gate_list = []
+            if entry is not None:
+                logger.info( "Found decomposition in cache." )
+                self.gate_list = entry[ "gate_list" ]
+                self.distance = entry[ "distance" ]
+                return self.gate_list
 
-            for gate in gate_list:
+        while any( [ gate.num_qubits > self.target_gate_size
+                     for gate in self.gate_list ] ):
+
+            while self.index < len( self.gate_list ):
+                gate = self.gate_list[ self.index ]
 
                 if gate.num_qubits <= self.target_gate_size:
-                    new_gate_list.append( gate )
+                    self.new_gate_list.append( gate )
                 else:
-                    next_gate_size = self.hierarchy_fn( gate.num_qubits )
-                    t = self.topology.get_locations( next_gate_size )
-                    m = self.model( self.utry, next_gate_size, t, self.optimizer(), **self.model_options )
-                    new_gate_list += m.solve()
+                    remaining = None
+                    if deadline is not None:
+                        remaining = max( 0, deadline - time.time() )
+
+                    self.new_gate_list += self.decompose_gate( gate,
+                                                               remaining,
+                                                               max_depth,
+                                                               model_state )
+                    model_state = None
 
-            gate_list = new_gate_list
+                self.index += 1
+                self.save_checkpoint( force = True )
+
+            self.level += 1
+            self.gate_list = self.new_gate_list
+            self.new_gate_list = []
+            self.index = 0
 
             if self.intermediate_solution_callback is not None:
-                self.intermediate_solution_callback( gate_list )
+                self.intermediate_solution_callback( self.gate_list )
+
+        self.distance = self.get_distance( self.gate_list )
+        logger.info( "Decomposition finished at %e distance." % self.distance )
+
+        if key is not None:
+            self.cache.put( key, { "gate_list": self.gate_list,
+                                   "distance": self.distance } )
+
+        return self.gate_list
+
+    def decompose_iter ( self, time_limit = None, max_depth = None ):
+        """
+        Performs the decomposition phase, yielding gates once final.
+
+        Unlike decompose, gates are decomposed depth-first, so the first
+        final gate is available after one model per hierarchy level.
+        Only the unfinished siblings of the current gate are kept in
+        memory. The final gates are the same as decompose's, in the
+        same order. When the generator is exhausted, their distance to
+        the unitary is stored in distance. Intermediate solutions,
+        checkpoints and the cache are not used.
+
+        Args:
+            time_limit (None or float): The number of seconds the whole
+                decomposition may take, see decompose.
+
+            max_depth (None or int): The largest depth of every model,
+                see decompose.
+
+        Yields:
+            (int, gate.Gate): The position of a final gate in the
+                decomposition and the gate.
+        """
+
+        deadline = None
+        if time_limit is not None:
+            deadline = time.time() + time_limit
+
+        M = np.identity( 2 ** self.num_qubits )
+        position = 0
+        stack = [ Gate( self.utry, tuple( range( self.num_qubits ) ) ) ]
+
+        while len( stack ) > 0:
+            gate = stack.pop()
+
+            if gate.num_qubits <= self.target_gate_size:
+                M = gate.get_circuit_matrix( self.num_qubits ) @ M
+                yield position, gate
+                position += 1
+                continue
+
+            remaining = None
+            if deadline is not None:
+                remaining = max( 0, deadline - time.time() )
+
+            sub_gate_list = self.decompose_gate( gate, remaining, max_depth )
+            stack += reversed( sub_gate_list )
+
+        self.distance = utils.hilbert_schmidt_distance( self.utry, M )
+        logger.info( "Decomposition finished at %e distance." % self.distance )
+
+    def get_cache_key ( self ):
+        """Returns the cache key of this decomposition."""
+        sizes = range( self.target_gate_size + 1, self.num_qubits + 1 )
+        hierarchy = [ self.hierarchy_fn( size ) for size in sizes ]
+
+        return self.cache.get_key( self.utry,
+                                   model = self.model.__name__,
+                                   optimizer = self.optimizer.__name__,
+                                   target_gate_size = self.target_gate_size,
+                                   hierarchy = hierarchy,
+                                   coupling_graph = sorted( self.topology.coupling_graph ),
+                                   model_options = self.model_options )
+
+    def decompose_gate ( self, gate, time_limit = None, max_depth = None,
+                         model_state = None ):
+        """
+        Decomposes one gate of an intermediate solution.
+
+        The gate is modeled on its own, restricted to the part of the
+        topology within its location.
+
+        Args:
+            gate (Gate): The gate to decompose.
+
+            time_limit (None or float): The model's time limit.
+
+            max_depth (None or int): The model's depth limit.
+
+            model_state (None or Dict): If not None, the model continues
+                from this checkpointed search state.
+
+        Returns:
+            (list[gate.Gate]): The smaller gates implementing gate, with
+                locations in the decomposer's qubits.
+        """
+
+        m = self.get_gate_model( gate, model_state )
+
+        if self.checkpoint_path is not None:
+            m.checkpoint_callback = self.save_checkpoint
+
+        sub_gate_list = m.solve( time_limit, max_depth )
+        logger.info( "Model used %d objective evaluations."
+                     % m.num_evaluations )
+
+        return self.relocate( gate, sub_gate_list )
+
+    def get_gate_model ( self, gate, model_state = None ):
+        """
+        Builds the model that decomposes one gate, see decompose_gate.
+
+        Args:
+            gate (Gate): The gate to decompose.
+
+            model_state (None or Dict): If not None, the model continues
+                from this checkpointed search state.
+
+        Returns:
+            (CircuitModel): The unsolved model of gate's unitary, with
+                locations in gate's qubits.
+        """
+
+        next_gate_size = self.hierarchy_fn( gate.num_qubits )
+        location = gate.location
+        subgraph = self.topology.get_local_subgraph( location )
+        topology = Topology( gate.num_qubits, subgraph )
+
+        t = topology.get_locations( next_gate_size )
+        m = self.model( gate.utry, next_gate_size, t, self.optimizer(), **self.model_options )
+
+        if model_state is not None:
+            m.set_state( model_state )
+
+        return m
+
+    def relocate ( self, gate, sub_gate_list ):
+        """Maps the gates of gate's model to the decomposer's qubits."""
+        location = gate.location
+        return [ Gate( sub_gate.utry,
+                       tuple( location[q] for q in sub_gate.location ) )
+                 for sub_gate in sub_gate_list ]
+
+    def save_checkpoint ( self, model_state = None, force = False ):
+        """
+        Atomically saves the decomposition progress.
+
+        Args:
+            model_state (None or Dict): The search state of the model
+                decomposing the current gate, see CircuitModel.get_state.
+
+            force (bool): If false, skip saving if the last checkpoint
+                is more recent than checkpoint_interval.
+        """
+
+        if self.checkpoint_path is None:
+            return
+
+        if not force:
+            if time.time() - self.last_checkpoint < self.checkpoint_interval:
+                return
+
+        state = {
+            "utry": self.utry,
+            "model": self.model.__name__,
+            "level": self.level,
+            "gate_list": self.gate_list,
+            "new_gate_list": self.new_gate_list,
+            "index": self.index,
+            "model_state": model_state
+        }
+
+        directory = os.path.dirname( os.path.abspath( self.checkpoint_path ) )
+
+        with tempfile.NamedTemporaryFile( dir = directory,
+                                          delete = False ) as f:
+            pickle.dump( state, f, pickle.HIGHEST_PROTOCOL )
+            f.flush()
+            os.fsync( f.fileno() )
+
+        os.replace( f.name, self.checkpoint_path )
+        self.last_checkpoint = time.time()
+        logger.debug( "Saved checkpoint at level %d, gate %d."
+                      % ( self.level, self.index ) )
+
+    def load_checkpoint ( self ):
+        """
+        Restores the decomposition progress from checkpoint_path.
+
+        Returns:
+            (None or Dict): The search state of the unfinished model.
+
+        Raises:
+            ValueError: If the checkpoint belongs to another unitary
+                or model.
+        """
+
+        with open( self.checkpoint_path, "rb" ) as f:
+            state = pickle.load( f )
+
+        if state[ "utry" ].shape != self.utry.shape \
+           or not np.allclose( state[ "utry" ], self.utry ):
+            raise ValueError( "Checkpoint belongs to another unitary." )
+
+        if state[ "model" ] != self.model.__name__:
+            raise ValueError( "Checkpoint belongs to another model." )
+
+        self.level = state[ "level" ]
+        self.gate_list = state[ "gate_list" ]
+        self.new_gate_list = state[ "new_gate_list" ]
+        self.index = state[ "index" ]
+
+        logger.info( "Resuming from level %d, gate %d."
+                     % ( self.level, self.index ) )
+
+        return state[ "model_state" ]
 
-        return gate_list
+    def get_distance ( self, gate_list ):
+        """Returns the distance of a gate list to the unitary."""
+        matrices = [ gate.get_circuit_matrix( self.num_qubits )
+                     for gate in gate_list ]
+        M = ft.reduce( np.matmul, reversed( matrices ) )
+        return utils.hilbert_schmidt_distance( self.utry, M )
 
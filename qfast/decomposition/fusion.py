@@ -0,0 +1,164 @@
+"""
+This module implements gate fusion and near-identity elision.
+
+Decomposition can leave gates that act on the same or nested qubits
+back to back, and gates that are close to the identity. Every gate
+costs a native tool call during instantiation, so these are fused into
+or dropped from the gate list before it is instantiated.
+"""
+
+import numpy as np
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def group_blocks ( ops, fits ):
+    """
+    Groups gates into blocks that can be merged.
+
+    Every gate joins the latest earlier block that fits the union of
+    their qubits, as long as the blocks after that one act on other
+    qubits. Otherwise, it starts a new block.
+
+    Args:
+        ops (list[tuple[tuple[int], np.ndarray]]): The location and
+            unitary of every gate, in the order they are applied.
+
+        fits (callable): Takes a set of qubits and returns true if a
+            block may act on them.
+
+    Returns:
+        (list[tuple[set[int], list[tuple[tuple[int], np.ndarray]]]]):
+            The qubits and gates of every block, in the order they
+            are applied.
+    """
+
+    blocks = []
+
+    for op in ops:
+        qubits = set( op[0] )
+        target = None
+
+        for block in reversed( blocks ):
+            if fits( block[0] | qubits ):
+                target = block
+                break
+
+            if len( block[0] & qubits ) > 0:
+                break
+
+        if target is None:
+            blocks.append( ( qubits, [ op ] ) )
+        else:
+            target[0].update( qubits )
+            target[1].append( op )
+
+    return blocks
+
+
+def merge_block ( location, ops ):
+    """
+    Multiplies the gates of a block into one unitary.
+
+    Args:
+        location (tuple[int]): The qubits of the merged unitary. They
+            must hold the qubits of every gate.
+
+        ops (list[tuple[tuple[int], np.ndarray]]): The location and
+            unitary of every gate, in the order they are applied.
+
+    Returns:
+        (np.ndarray): The product of the gates on location.
+    """
+
+    M = np.identity( 2 ** len( location ) )
+
+    for op_location, utry in ops:
+        relative = tuple( location.index( q ) for q in op_location )
+        M = Gate( utry, relative ).get_circuit_matrix( len( location ) ) @ M
+
+    return M
+
+
+def fuse_gates ( gate_list, max_gate_size, topology = None,
+                 max_error = 1e-8 ):
+    """
+    Fuses adjacent gates and drops gates close to the identity.
+
+    Gates are dropped closest to the identity first, for as long as the
+    sum of their distances to the identity stays within max_error. Each
+    remaining gate is fused into the latest earlier gate that the union
+    of their qubits fits, if the gates after that one act on other
+    qubits.
+
+    Args:
+        gate_list (list[Gate]): The gates in the order they are applied.
+
+        max_gate_size (int): The largest number of qubits of a fused gate.
+
+        topology (None or Topology): Determines the connection of
+            qubits. Fused gates act on connected qubits. If none,
+            will be set to all-to-all.
+
+        max_error (float): The largest sum of the distances of the
+            dropped gates.
+
+    Returns:
+        (tuple[list[Gate], float]): The new gates and the sum of the
+            distances of the dropped gates.
+
+    Raises:
+        ValueError: If max_gate_size is not positive or max_error
+            is negative.
+    """
+
+    if max_gate_size <= 0:
+        raise ValueError( "Maximum gate size must be positive." )
+
+    if max_error < 0:
+        raise ValueError( "Maximum error must be nonnegative." )
+
+    if topology is None:
+        num_qubits = max( [ max( g.location ) for g in gate_list ], default = 0 )
+        topology = Topology( num_qubits + 1 )
+
+    # Drop the gates closest to the identity within the budget
+    distances = [ utils.hilbert_schmidt_distance( g.utry,
+                                                  np.identity( g.utry.shape[0] ) )
+                  for g in gate_list ]
+
+    error = 0
+    dropped = set()
+    for i in sorted( range( len( gate_list ) ), key = lambda i : distances[i] ):
+        if error + distances[i] > max_error:
+            break
+
+        error += distances[i]
+        dropped.add( i )
+
+    def fits ( qubits ):
+        return len( qubits ) <= max_gate_size \
+               and topology.is_connected( tuple( qubits ) )
+
+    ops = [ ( g.location, g.utry ) for i, g in enumerate( gate_list )
+            if i not in dropped ]
+
+    fused_list = []
+    for qubits, block_ops in group_blocks( ops, fits ):
+        if len( block_ops ) == 1:
+            fused_list.append( Gate( block_ops[0][1], block_ops[0][0] ) )
+            continue
+
+        location = tuple( sorted( qubits ) )
+        fused_list.append( Gate( merge_block( location, block_ops ), location ) )
+
+    logger.info( "Fused %d gates into %d gates, dropping %d at %e distance"
+                 " of a %e budget." % ( len( gate_list ), len( fused_list ),
+                                        len( dropped ), error, max_error ) )
+
+    return fused_list, error
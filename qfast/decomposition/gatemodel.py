@@ -36,11 +36,44 @@ class GateModel( abc.ABC ):
         self.num_qubits = num_qubits
         self.gate_size = gate_size
 
-    def get_initial_input ( self ):
-        """Produces a random vector of inputs."""
+    def get_initial_input ( self, residual = None ):
+        """
+        Produces a vector of inputs.
+
+        Args:
+            residual (None or np.ndarray): If None, the inputs are random.
+                Otherwise, the inputs move the circuit before this gate
+                towards the target, see get_residual_input.
+        """
+
+        if residual is not None:
+            return self.get_residual_input( residual, self.get_location( None ) )
+
         return np.random.random( self.get_param_count() )
         # return [ np.pi ] * self.get_param_count()
 
+    def get_residual_input ( self, residual, location ):
+        """
+        Produces function values informed by the circuit's residual.
+
+        The ideal next gate is R^dagger for the residual R = M U^dagger.
+        Its logarithm is projected onto location and expanded in the
+        Pauli basis, then scaled to this gate's parameterization.
+
+        Args:
+            residual (np.ndarray): The residual of the circuit before
+                this gate, see CircuitModel.get_residual.
+
+            location (tuple[int]): The qubits to project onto.
+
+        Returns:
+            (np.ndarray): The function values for location.
+        """
+
+        H = pauli.unitary_log_no_i( residual.conj().T, tol = 1e-8 )
+        coefs = pauli.get_location_expansion( H, location )
+        return -( 2 ** self.num_qubits ) * coefs
+
     @abc.abstractmethod
     def get_location ( self, x ):
         """Returns the gate's location."""
@@ -0,0 +1,172 @@
+"""
+This module implements the GenericGateModel abstract class.
+
+A GenericGateModel is a gate with variable location and function. It
+keeps track of the locations the gate currently considers, its working
+locations, and of the per-location data the subclass derives from them.
+"""
+
+import abc
+
+import numpy as np
+
+from qfast import pauli
+from qfast import utils
+from qfast.decomposition.gatemodel import GateModel
+
+
+class GenericGateModel ( GateModel ):
+
+    def __init__ ( self, num_qubits, gate_size, locations, beta = 10 ):
+        """
+        GenericGateModel Constructor
+
+        Args:
+            num_qubits (int): The number of qubits in the entire circuit
+
+            gate_size (int): The number of qubits this gate acts on
+
+            locations (list[tuple[int]]): The potential locations of this gate
+
+            beta (float): The inverse temperature of the location softmax.
+                Larger values commit the gate to one location more sharply.
+        """
+
+        super().__init__( num_qubits, gate_size )
+
+        self.beta = beta
+        self.Hcoef = -1j / ( 2 ** num_qubits )
+        self.locations = locations
+        self.working_locations = list( locations )
+        self.unsampled_locations = []
+
+    @abc.abstractmethod
+    def update_working_data ( self ):
+        """Recomputes the per-location data of the working locations."""
+        pass
+
+    def get_location_count ( self ):
+        """Returns the number of location input parameters."""
+        return len( self.working_locations )
+
+    def cannot_restrict ( self ):
+        """Return true if the gate's location cannot be restricted."""
+        count = len( self.working_locations ) + len( self.unsampled_locations )
+        return count <= 1
+
+    def restrict ( self, location ):
+        """Restrict the gate's model by removing a potential location."""
+        self.working_locations.remove( location )
+        self.update_working_data()
+
+    def lift_restrictions ( self ):
+        """Remove previous restrictions on the gate's model."""
+        self.working_locations = list( self.locations )
+        self.unsampled_locations = []
+        self.update_working_data()
+
+    def get_location_scores ( self, residual ):
+        """
+        Scores each working location by the objective's gradient norm.
+
+        The score of a location is the norm of the gradient of
+        Re tr( G R ) with respect to the function values of a
+        near-identity gate G placed at that location. All locations
+        are contracted against the residual R in one batched pass.
+
+        Args:
+            residual (np.ndarray): The residual of the rest of the
+                circuit, see CircuitModel.get_residual.
+
+        Returns:
+            (np.ndarray): The score of each working location.
+        """
+
+        reduced = np.array( [ utils.partial_trace( residual, location )
+                              for location in self.working_locations ] )
+        paulis = pauli.get_norder_paulis( self.gate_size )
+        grads = np.real( self.Hcoef * np.einsum( "kij,lji->lk",
+                                                 paulis, reduced ) )
+        return np.linalg.norm( grads, axis = 1 )
+
+    def screen ( self, residual, num_locations ):
+        """Restrict the gate's model to its highest scoring locations."""
+        if num_locations >= len( self.working_locations ):
+            return
+
+        scores = self.get_location_scores( residual )
+        order = np.argsort( -scores, kind = "stable" )
+        keep = np.sort( order[ : num_locations ] )
+        self.working_locations = [ self.working_locations[ idx ]
+                                   for idx in keep ]
+        self.update_working_data()
+
+    def anneal ( self, growth, max_beta = None ):
+        """
+        Lowers the temperature of the location softmax.
+
+        Args:
+            growth (float): The factor beta is multiplied by.
+
+            max_beta (None or float): If not None, the largest beta.
+        """
+
+        self.beta *= growth
+
+        if max_beta is not None:
+            self.beta = min( self.beta, max_beta )
+
+    def sample ( self, num_locations, residual = None ):
+        """
+        Restrict the gate's model to a random subset of its locations.
+
+        Locations sampled out by a previous call are returned first,
+        so repeated calls rotate the subset. Restrictions are kept.
+
+        Args:
+            num_locations (int): The size of the subset.
+
+            residual (None or np.ndarray): If not None, locations are
+                drawn with probability proportional to their score
+                against this residual, see get_location_scores.
+                Otherwise, locations are drawn uniformly.
+        """
+
+        self.unsample()
+
+        count = len( self.working_locations )
+        if num_locations >= count:
+            return
+
+        p = None
+        if residual is not None:
+            p = self.get_location_scores( residual ) + np.finfo( float ).eps
+            p = p / np.sum( p )
+
+        keep = np.random.choice( count, num_locations, replace = False, p = p )
+        keep = np.sort( keep )
+
+        self.unsampled_locations = [ location for idx, location
+                                     in enumerate( self.working_locations )
+                                     if idx not in keep ]
+        self.working_locations = [ self.working_locations[ idx ]
+                                   for idx in keep ]
+        self.update_working_data()
+
+    def unsample ( self ):
+        """Return sampled-out locations to the gate's model in order."""
+        if len( self.unsampled_locations ) == 0:
+            return
+
+        returned = set( self.working_locations + self.unsampled_locations )
+        self.working_locations = [ location for location in self.locations
+                                   if location in returned ]
+        self.unsampled_locations = []
+        self.update_working_data()
+
+    def set_working_locations ( self, working_locations,
+                                unsampled_locations = [] ):
+        """Replaces the gate's working and sampled-out locations."""
+        self.working_locations = list( working_locations )
+        self.unsampled_locations = list( unsampled_locations )
+        self.update_working_data()
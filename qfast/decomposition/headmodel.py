@@ -0,0 +1,132 @@
+"""
+This module implements the search logic shared by head models.
+
+A head model leads its fixed gates with a generic gate, the head, that
+multiplexes gate placement. The mixin is not a CircuitModel, so it is
+not registered as a model itself; models list it before CircuitModel.
+"""
+
+import logging
+
+import numpy as np
+
+from qfast.decomposition.circuitmodel import optimize_models
+
+
+logger = logging.getLogger( "qfast" )
+
+
+class HeadModelMixin():
+    """
+    Shared search steps of models led by a generic gate.
+
+    The model must set head to its generic gate, which is the last
+    gate, restrict_workers to the number of restricted variants, and
+    sample_size, sample_weighting, softmax_growth and softmax_max_beta,
+    see PermModel. Its fixed_gate class attribute is the class of
+    the gates before the head, which are restored from checkpoints.
+    """
+
+    supports_checkpoints = True
+
+    def anneal_head ( self ):
+        """Lowers the temperature of the head's location softmax."""
+        self.head.anneal( self.softmax_growth, self.softmax_max_beta )
+
+    def sample_head ( self ):
+        """Rotates the subset of head locations used in optimization."""
+        residual = None
+
+        if self.sample_weighting == "score":
+            residual = self.get_residual( self.depth() - 1 )
+
+        self.head.sample( self.sample_size, residual )
+
+    def explore_restrictions ( self ):
+        """
+        Optimizes several restricted copies of the model in parallel.
+
+        The head's working locations are ranked by their location values.
+        The i-th variant excludes the i+1 highest ranked locations. With
+        a sample_size, every variant then resamples its head, so the
+        subset keeps rotating and a variant never runs out of working
+        locations. All variants are coarsely optimized at once and the
+        model adopts the one closest to the target.
+
+        Returns:
+            (List[Tuple[Tuple[int], float]]): The chosen location and
+                distance of every variant that was not adopted.
+        """
+
+        values = self.head.get_location_values( self.get_input_slice( -1 ) )
+        ranked = [ self.head.working_locations[ idx ]
+                   for idx in np.argsort( -values, kind = "stable" ) ]
+        count = len( ranked ) + len( self.head.unsampled_locations )
+        num_variants = min( self.restrict_workers, len( ranked ), count - 1 )
+
+        variants = []
+        for i in range( num_variants ):
+            variant = self.fork()
+            for location in ranked[ : i + 1 ]:
+                variant.head.restrict( location )
+            if self.sample_size is not None:
+                variant.sample_head()
+            variant.reset_input()
+            variants.append( variant )
+
+        logger.info( "Optimizing %d restricted variants in parallel."
+                     % num_variants )
+
+        variants = optimize_models( variants, self.restrict_workers )
+        results = [ ( v.head.get_location( v.get_input_slice( -1 ) ),
+                      v.distance() ) for v in variants ]
+
+        num_evaluations = self.num_evaluations
+        for variant in variants:
+            num_evaluations += variant.num_evaluations - self.num_evaluations
+
+        best = int( np.argmin( [ dist for _, dist in results ] ) )
+        self.adopt( variants[ best ] )
+        self.num_evaluations = num_evaluations
+        return results[ : best ] + results[ best + 1 : ]
+
+    def get_state ( self ):
+        """Returns the model's search state, see CircuitModel."""
+        return {
+            "structure": [ gate.location for gate in self.gates[ : -1 ] ],
+            "working_locations": list( self.head.working_locations ),
+            "unsampled_locations": list( self.head.unsampled_locations ),
+            "beta": self.head.beta,
+            "param_ranges": list( self.param_ranges ),
+            "x": np.copy( self.x ),
+            "last_dist": self.last_dist,
+            "failed_locs": list( self.failed_locs ),
+            "num_evaluations": self.num_evaluations
+        }
+
+    def set_state ( self, state ):
+        """Continues the search from a state, see CircuitModel.get_state."""
+        self.gates = []
+        self.param_ranges = [ 0 ]
+        self.x = np.array( [] )
+
+        for location in state[ "structure" ]:
+            gate = self.fixed_gate( self.num_qubits, self.gate_size, location )
+            self.append_gate( gate, np.zeros( gate.get_param_count() ) )
+
+        self.head.set_working_locations( state[ "working_locations" ],
+                                         state[ "unsampled_locations" ] )
+        self.head.beta = state[ "beta" ]
+        self.append_gate( self.head, np.zeros( self.head.get_param_count() ) )
+
+        # The head's ranges are recomputed when its input is reset
+        num_fixed = len( state[ "structure" ] ) + 1
+        saved_ranges = state[ "param_ranges" ]
+        if self.param_ranges[ : num_fixed ] != saved_ranges[ : num_fixed ]:
+            raise ValueError( "State does not match the model." )
+
+        self.param_ranges = list( state[ "param_ranges" ] )
+        self.x = np.copy( state[ "x" ] )
+        self.last_dist = state[ "last_dist" ]
+        self.failed_locs = list( state[ "failed_locs" ] )
+        self.num_evaluations = state[ "num_evaluations" ]
@@ -0,0 +1,196 @@
+"""
+QFAST Beam Search Model Module
+
+This models a circuit as a sequence of fixed gates. Instead of
+greedily committing to one location per depth, a beam of the best
+partial structures is kept and expanded at every depth.
+"""
+
+
+import logging
+
+import numpy as np
+
+from qfast.decomposition.circuitmodel import CircuitModel, optimize_models
+from qfast.decomposition.models.fixedmodel import FixedModel
+from qfast.decomposition.models.perm.fixedgate import FixedGate
+from qfast.decomposition.models.perm.genericgate import GenericGate
+
+
+logger = logging.getLogger( "qfast" )
+
+
+class BeamModel ( CircuitModel ):
+
+    def __init__ ( self, utry, gate_size, locations, optimizer,
+                   success_threshold = 1e-3, partial_solution_callback = None,
+                   beam_width = 3, branch_factor = None, num_workers = None,
+                   objective = "trace", initialization = "random" ):
+        """
+        Beam Search Model Constructor
+
+        Args:
+            utry (np.ndarray): The unitary to model.
+
+            gate_size (int): The size of the model's gate.
+
+            locations (list[tuple[int]): The valid locations for gates.
+
+            optimizer (Optimizer): The optimizer available for use.
+
+            success_threshold (float): The distance criteria for success.
+
+            partial_solution_callback (None or callable): callback for
+                partial solutions. If not None, then callable that takes
+                a list[gate.Gate] and returns nothing.
+
+            beam_width (int): The number of partial structures kept
+                at every depth.
+
+            branch_factor (None or int): The number of locations each
+                beam member is expanded with. Locations are ranked by
+                the gradient norm of a near-identity gate placed there,
+                computed once from the member's circuit. If None, every
+                location is tried.
+
+            num_workers (None or int): The number of processes used to
+                optimize expansions. If None, it defaults to the number
+                of processors on the machine.
+
+            objective (str): The objective minimized by the optimizer,
+                see CircuitModel.
+
+            initialization (str): How new gates are given inputs,
+                see CircuitModel.
+        """
+
+        super().__init__( utry, gate_size, locations, optimizer,
+                          success_threshold, partial_solution_callback,
+                          objective, initialization )
+
+        if beam_width <= 0:
+            raise ValueError( "Beam width must be positive." )
+
+        if branch_factor is not None and branch_factor <= 0:
+            raise ValueError( "Branch factor must be positive." )
+
+        self.beam_width = beam_width
+        self.branch_factor = branch_factor or len( self.locations )
+        self.num_workers = num_workers
+        self.scorer = GenericGate( self.num_qubits, self.gate_size,
+                                   self.locations )
+
+        # The best fixed-structure models of the last depth searched
+        self.beam = []
+
+    def rank_locations ( self, member ):
+        """
+        Ranks the locations a beam member can be expanded with.
+
+        Args:
+            member (None or FixedModel): The beam member. None stands
+                for the empty circuit.
+
+        Returns:
+            (List[Tuple[int]]): The best locations, in decreasing order.
+        """
+
+        if member is None:
+            residual = self.utry_dag
+        else:
+            residual = member.get_residual()
+
+        scores = self.scorer.get_location_scores( residual )
+        order = np.argsort( -scores, kind = "stable" )
+        return [ self.locations[ idx ] for idx in order ]
+
+    def expand ( self, member ):
+        """Returns the structures and inputs of a beam member's children."""
+        if member is None:
+            structure, x = [], np.array( [] )
+        else:
+            structure, x = member.structure, member.x
+
+        children = []
+
+        for location in self.rank_locations( member ):
+            if len( children ) >= self.branch_factor:
+                break
+
+            if len( structure ) > 0 and structure[-1] == location:
+                continue
+
+            children.append( ( structure + [ location ], x ) )
+
+        return children
+
+    def make_candidate ( self, structure, x ):
+        """Builds a warm-started fixed-structure model."""
+        candidate = FixedModel( self.utry, self.gate_size, self.locations,
+                                self.optimizer,
+                                success_threshold = self.success_threshold,
+                                structure = structure,
+                                objective = self.objective,
+                                initialization = self.initialization )
+        candidate.x[ : len( x ) ] = x
+
+        if self.initialization == "residual":
+            depth = candidate.depth()
+            residual = candidate.get_residual( depth - 1 )
+            gate_input = candidate.gates[-1].get_initial_input( residual )
+            candidate.x[ candidate.param_ranges[-2] : ] = gate_input
+
+        return candidate
+
+    def solve ( self, time_limit = None, max_depth = None ):
+        """Solve the model for the target unitary, see CircuitModel."""
+        self.start_budget( time_limit, max_depth )
+        self.beam = [ None ]
+
+        while True:
+
+            if self.budget_exhausted():
+                return self.get_best_gate_list()
+
+            candidates = {}
+
+            for member in self.beam:
+                for structure, x in self.expand( member ):
+                    key = tuple( structure )
+                    if key not in candidates:
+                        candidates[ key ] = self.make_candidate( structure, x )
+
+            candidates = optimize_models( list( candidates.values() ),
+                                          self.num_workers )
+            self.num_evaluations += sum( candidate.num_evaluations
+                                         for candidate in candidates )
+            candidates.sort( key = lambda candidate : candidate.distance() )
+            self.beam = candidates[ : self.beam_width ]
+
+            self.set_structure( self.beam[0].structure, self.beam[0].x )
+
+            logger.info( "Finished beam at depth %d, best distance %e."
+                         % ( self.depth(), self.distance() ) )
+
+            if self.success():
+                logger.info( "Exploration finished: success" )
+                self.optimize( fine = True )
+                return self.record_solution( self.get_gate_list() )
+
+            self.record_best()
+
+            # Every expansion of the beam would exceed the depth limit
+            if self.max_depth is not None and self.depth() >= self.max_depth:
+                return self.get_best_gate_list()
+
+    def set_structure ( self, structure, x ):
+        """Replaces the model's gates with fixed gates at structure."""
+        self.gates = []
+        self.param_ranges = [ 0 ]
+        self.x = np.array( [] )
+
+        for location in structure:
+            gate = FixedGate( self.num_qubits, self.gate_size, location )
+            self.append_gate( gate )
+
+        self.x = np.copy( x )
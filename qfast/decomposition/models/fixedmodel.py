@@ -20,9 +20,13 @@ logger = logging.getLogger( "qfast" )
 
 class FixedModel ( CircuitModel ):
 
+    supports_checkpoints = True
+
     def __init__ ( self, utry, gate_size, locations, optimizer,
                    success_threshold = 1e-3, partial_solution_callback = None,
-                   structure = None, repeat = False ):
+                   structure = None, repeat = False,
+                   objective = "trace", initialization = "random",
+                   depth_search = "linear", prescreen_threshold = 1e-2 ):
         """
         Fixed Structure Model Constructor
 
@@ -45,10 +49,31 @@ class FixedModel ( CircuitModel ):
                 model.
 
             repeat (bool): If true, repeat structure until success.
+
+            objective (str): The objective minimized by the optimizer,
+                see CircuitModel.
+
+            initialization (str): How new gates are given inputs,
+                see CircuitModel.
+
+            depth_search (str): How the number of repetitions of
+                structure is searched when repeat is true. Either
+                "linear", which adds one repetition at a time, or
+                "bisect", which doubles the repetitions until success
+                and then bisects between the last failure and success.
+                Probes are warm-started from the previous probe.
+
+            prescreen_threshold (float): When bisecting, a probe is only
+                optimized finely if a coarse optimization reaches this
+                distance.
+
+        Raises:
+            ValueError: If structure or depth_search is invalid.
         """
 
         super().__init__( utry, gate_size, locations, optimizer,
-                          success_threshold, partial_solution_callback )
+                          success_threshold, partial_solution_callback,
+                          objective, initialization )
 
         if structure is None:
             raise ValueError( "Must include structure." )
@@ -59,23 +84,64 @@ class FixedModel ( CircuitModel ):
             gate = FixedGate( self.num_qubits, self.gate_size, location )
             self.append_gate( gate )
 
+        if depth_search not in [ "linear", "bisect" ]:
+            raise ValueError( "Invalid depth search." )
+
         self.repeat = repeat
+        self.depth_search = depth_search
+        self.prescreen_threshold = prescreen_threshold
+
+    def get_state ( self ):
+        """
+        Returns the model's search state, see CircuitModel.
+
+        Only the linear depth search supports checkpoints.
+        """
+
+        if self.depth_search != "linear":
+            return None
+
+        return {
+            "num_reps": self.depth() // len( self.structure ),
+            "x": np.copy( self.x ),
+            "num_evaluations": self.num_evaluations
+        }
+
+    def set_state ( self, state ):
+        """Continues the search from a state, see CircuitModel.get_state."""
+        self.set_repetitions( state[ "num_reps" ], state[ "x" ] )
 
-    def solve ( self ):
+        if self.get_param_count() != len( state[ "x" ] ):
+            raise ValueError( "State does not match the model." )
+
+        self.num_evaluations = state[ "num_evaluations" ]
+
+    def solve ( self, time_limit = None, max_depth = None ):
+        """Solve the model for the target unitary, see CircuitModel."""
+        self.start_budget( time_limit, max_depth )
+
+        if self.repeat and self.depth_search == "bisect":
+            return self.bisect()
 
         while True:
 
+            if self.budget_exhausted():
+                return self.get_best_gate_list()
+
+            self.checkpoint()
             self.optimize( fine = True )
 
             if self.success():
                 logger.info( "Successfully completed at distance: %e"
                              % self.distance() )
-                return self.get_gate_list()
+                return self.record_solution( self.get_gate_list() )
 
             if not self.repeat:
                 logger.info( "Unsuccessfully completed at distance: %e"
                              % self.distance() )
-                return self.get_gate_list()
+                return self.record_solution( self.get_gate_list() )
+
+            self.record_best()
 
             logger.info( "Finished depth %d at distance: %e"
                          % ( self.depth(), self.distance() ) )
@@ -84,3 +150,95 @@ class FixedModel ( CircuitModel ):
                 gate = FixedGate( self.num_qubits, self.gate_size, location )
                 self.append_gate( gate )
 
+    def set_repetitions ( self, num_reps, x = None ):
+        """
+        Rebuilds the model as num_reps repetitions of structure.
+
+        Args:
+            num_reps (int): The number of repetitions.
+
+            x (None or np.ndarray): Inputs to warm-start from. Gates
+                covered by x take their inputs from it, the remaining
+                gates are initialized as usual.
+        """
+
+        self.gates = []
+        self.param_ranges = [ 0 ]
+        self.x = np.array( [] )
+
+        for i in range( num_reps * len( self.structure ) ):
+            location = self.structure[ i % len( self.structure ) ]
+            gate = FixedGate( self.num_qubits, self.gate_size, location )
+            lower_bound = self.param_ranges[-1]
+            upper_bound = lower_bound + gate.get_param_count()
+
+            if x is not None and upper_bound <= len( x ):
+                self.append_gate( gate, x[ lower_bound : upper_bound ] )
+            else:
+                self.append_gate( gate )
+
+    def probe ( self, num_reps, x = None ):
+        """
+        Optimizes num_reps repetitions of structure.
+
+        A coarse optimization screens out depths that are far from
+        success before the expensive fine optimization.
+
+        Args:
+            num_reps (int): The number of repetitions.
+
+            x (None or np.ndarray): Inputs to warm-start from,
+                see set_repetitions.
+
+        Returns:
+            (bool): If the probe succeeded.
+        """
+
+        self.set_repetitions( num_reps, x )
+        self.optimize()
+
+        if self.distance() < self.prescreen_threshold:
+            self.optimize( fine = True )
+
+        logger.info( "Finished depth %d at distance: %e"
+                     % ( self.depth(), self.distance() ) )
+
+        self.record_best()
+        return self.success()
+
+    def bisect ( self ):
+        """Solves the model by doubling and then bisecting repetitions."""
+        max_reps = None
+
+        if self.max_depth is not None:
+            max_reps = max( 1, self.max_depth // len( self.structure ) )
+
+        failed_reps, failed_x = 0, None
+        num_reps, x = 1, None
+
+        while not self.probe( num_reps, x ):
+            failed_reps, failed_x = num_reps, np.copy( self.x )
+
+            if num_reps == max_reps or self.budget_exhausted():
+                return self.get_best_gate_list()
+
+            num_reps, x = 2 * num_reps, self.x
+
+            if max_reps is not None:
+                num_reps = min( num_reps, max_reps )
+
+        success_reps, success_x = num_reps, np.copy( self.x )
+
+        # An exhausted budget keeps the smallest success found so far
+        while success_reps - failed_reps > 1 and not self.budget_exhausted():
+            num_reps = ( failed_reps + success_reps ) // 2
+
+            if self.probe( num_reps, failed_x ):
+                success_reps, success_x = num_reps, np.copy( self.x )
+            else:
+                failed_reps, failed_x = num_reps, np.copy( self.x )
+
+        self.set_repetitions( success_reps, success_x )
+        logger.info( "Successfully completed at distance: %e"
+                     % self.distance() )
+        return self.record_solution( self.get_gate_list() )
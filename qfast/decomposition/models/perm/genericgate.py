@@ -6,20 +6,18 @@ This is done using permutation matrices.
 """
 
 
-from copy import deepcopy
-
 import numpy as np
 import scipy as sp
 
 from qfast import pauli
 from qfast import perm
 from qfast import utils
-from qfast.decomposition.gatemodel import GateModel
+from qfast.decomposition.genericgatemodel import GenericGateModel
 
 
-class GenericGate ( GateModel ):
+class GenericGate ( GenericGateModel ):
 
-    def __init__ ( self, num_qubits, gate_size, locations ):
+    def __init__ ( self, num_qubits, gate_size, locations, beta = 10 ):
         """
         GenericGate Constructor
 
@@ -29,23 +27,21 @@ class GenericGate ( GateModel ):
             gate_size (int): The number of qubits this gate acts on
 
             locations (list[tuple[int]]): The potential locations of this gate
+
+            beta (float): The inverse temperature of the location softmax.
+                Larger values commit the gate to one location more sharply.
         """
 
-        super().__init__( num_qubits, gate_size )
+        super().__init__( num_qubits, gate_size, locations, beta )
 
         if not utils.is_valid_locations( locations, num_qubits, gate_size ):
             raise TypeError( "Specified locations is invalid." )
 
-        self.locations = locations
-
-        self.Hcoef = -1j / ( 2 ** self.num_qubits )
         self.paulis = pauli.get_norder_paulis( self.gate_size )
         self.sigmav = self.Hcoef * np.array( self.paulis )
         self.I = np.identity( 2 ** ( num_qubits - gate_size ) )
         self.perms = np.array( [ perm.calc_permutation_matrix( num_qubits, l )
                                  for l in self.locations ] )
-
-        self.working_locations = deepcopy( locations )
         self.working_perms = np.copy( self.perms )
 
     def get_location ( self, x ):
@@ -57,28 +53,14 @@ class GenericGate ( GateModel ):
         """Returns the number of function input parameters."""
         return 4 ** self.gate_size
 
-    def get_location_count ( self ):
-        """Returns the number of location input parameters."""
-        return len( self.working_locations )
-
     def get_param_count ( self ):
         """Returns the number of the gate's input parameters."""
         return self.get_function_count() + self.get_location_count()
 
-    def cannot_restrict ( self ):
-        """Return true if the gate's location cannot be restricted."""
-        return len( self.working_locations ) <= 1
-
-    def restrict ( self, location ):
-        """Restrict the gate's model by removing a potential location."""
-        idx = self.working_locations.index( location )
-        self.working_locations.pop( idx )
-        self.working_perms = np.delete( self.working_perms, idx, 0 )
-
-    def lift_restrictions ( self ):
-        """Remove previous restrictions on the gate's model."""
-        self.working_locations = deepcopy( self.locations )
-        self.working_perms = np.copy( self.perms )
+    def update_working_data ( self ):
+        """Recomputes the perms of the working locations."""
+        self.working_perms = np.array( [ self.perms[ self.locations.index( l ) ]
+                                         for l in self.working_locations ] )
 
     def get_function_values ( self, x ):
         """Returns the function values."""
@@ -88,8 +70,25 @@ class GenericGate ( GateModel ):
         """Returns the location values."""
         return x[ self.get_function_count() : ]
 
-    def get_initial_input ( self ):
-        """Produces a random vector of inputs."""
+    def get_initial_input ( self, residual = None ):
+        """
+        Produces a vector of inputs.
+
+        Args:
+            residual (None or np.ndarray): If None, the function values
+                are random. Otherwise, they are informed by the residual
+                at the highest scoring working location, which is also
+                favored by the location values.
+        """
+
+        if residual is not None:
+            scores = self.get_location_scores( residual )
+            location = self.working_locations[ np.argmax( scores ) ]
+            ain = self.get_residual_input( residual, location )
+            lin = np.zeros( self.get_location_count() )
+            lin[ np.argmax( scores ) ] = 1
+            return np.concatenate( [ ain, lin ] )
+
         ain = np.random.random( self.get_function_count() )
         # ain = [ np.pi ] * self.get_function_count()
         lin = [ 0 ] * self.get_location_count()
@@ -121,7 +120,7 @@ class GenericGate ( GateModel ):
     def get_matrix ( self, x ):
         """Produces the circuit matrix for this gate."""
         alpha, l = self.partition_input( x )
-        l = utils.softmax( l, 10 )
+        l = utils.softmax( l, self.beta )
 
         H = utils.dot_product( alpha, self.sigmav )
         U = sp.linalg.expm( H )
@@ -131,7 +130,7 @@ class GenericGate ( GateModel ):
     def get_matrix_and_derivatives ( self, x ):
         """Produces the circuit matrix and partials for this gate."""
         alpha, l = self.partition_input( x )
-        l = utils.softmax( l, 10 )
+        l = utils.softmax( l, self.beta )
 
         H = utils.dot_product( alpha, self.sigmav )
         P = utils.dot_product( l, self.working_perms )
@@ -144,6 +143,6 @@ class GenericGate ( GateModel ):
         dav = np.kron( dav, self.I )
         dav = P @ dav @ P.T
         dlv = self.working_perms @ UP + PU @ self.working_perms.transpose( ( 0, 2, 1 ) ) - 2*PUP
-        dlv = np.array( [ x*y for x, y in zip( 10*l, dlv ) ] )
+        dlv = np.array( [ x*y for x, y in zip( self.beta * l, dlv ) ] )
         return PUP, np.concatenate( [ dav, dlv ] )
 
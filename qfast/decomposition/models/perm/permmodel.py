@@ -15,6 +15,7 @@ import functools as ft
 from qfast import utils
 from qfast import gate
 from qfast.decomposition.circuitmodel import CircuitModel
+from qfast.decomposition.headmodel import HeadModelMixin
 from qfast.decomposition.models.perm.genericgate import GenericGate
 from qfast.decomposition.models.perm.fixedgate import FixedGate
 
@@ -22,11 +23,18 @@ from qfast.decomposition.models.perm.fixedgate import FixedGate
 logger = logging.getLogger( "qfast" )
 
 
-class PermModel ( CircuitModel ):
+class PermModel ( HeadModelMixin, CircuitModel ):
+
+    fixed_gate = FixedGate
 
     def __init__ ( self, utry, gate_size, locations, optimizer,
                    success_threshold = 1e-3, partial_solution_callback = None,
-                   progress_threshold = 5e-3 ):
+                   progress_threshold = 5e-3, screen_size = None,
+                   restrict_workers = 1, sample_size = None,
+                   sample_weighting = "uniform", softmax_beta = 10,
+                   softmax_growth = 1, softmax_max_beta = None,
+                   objective = "trace", initialization = "random",
+                   pruning = False ):
         """
         Permutation Model Constructor
 
@@ -47,16 +55,74 @@ class PermModel ( CircuitModel ):
 
             progress_threshold (float): The distance increase criteria
                 for successful expansion.
+
+            screen_size (None or int): If not None, the head only
+                considers the screen_size locations where appending
+                a near-identity gate has the largest gradient norm.
+                The remaining locations are screened out.
+
+            restrict_workers (int): The number of restricted variants
+                of the model optimized in parallel when progress stalls.
+                If 1, the head is restricted one location at a time.
+
+            sample_size (None or int): If not None, every coarse
+                optimization only instantiates a random subset of
+                sample_size head locations. The subset rotates between
+                optimizations.
+
+            sample_weighting (str): How head locations are sampled.
+                Either "uniform" or "score", which draws locations in
+                proportion to their gradient norm, see screen_size.
+
+            softmax_beta (float): The initial inverse temperature of
+                the head's location softmax at every depth.
+
+            softmax_growth (float): The factor the head's inverse
+                temperature is multiplied by after every coarse
+                optimization that does not increase the depth.
+
+            softmax_max_beta (None or float): If not None, the largest
+                inverse temperature the head is annealed to.
+
+            objective (str): The objective minimized by the optimizer,
+                see CircuitModel.
+
+            initialization (str): How new gates are given inputs,
+                see CircuitModel.
+
+            pruning (bool): If true, gates the finalized circuit does
+                not need are removed, see CircuitModel.prune.
+
+        Raises:
+            ValueError: If sample_weighting is invalid.
         """
 
         super().__init__( utry, gate_size, locations, optimizer,
-                          success_threshold, partial_solution_callback )
+                          success_threshold, partial_solution_callback,
+                          objective, initialization )
+
+        if sample_weighting not in [ "uniform", "score" ]:
+            raise ValueError( "Invalid sample weighting." )
 
         self.progress_threshold = progress_threshold
+        self.screen_size = screen_size
+        self.restrict_workers = restrict_workers
+        self.sample_size = sample_size
+        self.sample_weighting = sample_weighting
+        self.softmax_beta = softmax_beta
+        self.softmax_growth = softmax_growth
+        self.softmax_max_beta = softmax_max_beta
+        self.pruning = pruning
+
+        self.head = GenericGate( self.num_qubits, self.gate_size,
+                                 self.locations, self.softmax_beta )
+
+        if self.screen_size is not None:
+            self.head.screen( self.get_residual(), self.screen_size )
 
-        self.head = GenericGate( self.num_qubits, self.gate_size, self.locations )
         self.append_gate( self.head )
         self.last_dist = 1
+        self.failed_locs = []
 
     def progress ( self ):
         """If the model has made progress."""
@@ -67,10 +133,16 @@ class PermModel ( CircuitModel ):
         logger.info( "Expanding by adding a gate at location %s"
                      % str( location ) )
 
+        fun_vals = self.head.get_function_values( self.get_input_slice( -1 ) )
         new_gate = FixedGate( self.num_qubits, self.gate_size, location )
-        self.insert_gate( -1, new_gate )
+        self.insert_gate( -1, new_gate, fun_vals )
         self.head.lift_restrictions()
         self.head.restrict( location )
+        self.head.beta = self.softmax_beta
+
+        if self.screen_size is not None:
+            residual = self.get_residual( self.depth() - 1 )
+            self.head.screen( residual, self.screen_size )
 
     def finalize ( self ):
         """Finalize the circuit by replacing the head if necessary."""
@@ -82,24 +154,40 @@ class PermModel ( CircuitModel ):
         self.append_gate( new_gate, fun_vals )
         self.optimize( fine = True )
 
+        if self.pruning:
+            self.prune()
+
         return self.get_gate_list()
 
-    def solve ( self ):
-        """Solve the model for the target unitary."""
-        failed_locs = []
+    def solve ( self, time_limit = None, max_depth = None ):
+        """Solve the model for the target unitary, see CircuitModel."""
+        self.start_budget( time_limit, max_depth )
+        explored = False
 
         while True:
 
-            self.reset_input()
+            if self.budget_exhausted():
+                return self.get_best_gate_list()
 
-            self.optimize()
+            if not explored:
+                self.checkpoint()
+
+                if self.sample_size is not None:
+                    self.sample_head()
+
+                self.reset_input()
+                self.optimize()
+
+            explored = False
 
             logger.info( "Finished optimizing depth %d at %e distance."
                          % ( self.depth(), self.distance() ) )
 
             if self.success():
                 logger.info( "Exploration finished: success" )
-                return self.finalize()
+                return self.record_solution( self.finalize() )
+
+            self.record_best()
 
             location = self.head.get_location( self.get_input_slice( -1 ) )
 
@@ -112,21 +200,29 @@ class PermModel ( CircuitModel ):
                 logger.info( "Progress has not been made." )
                 logger.info( "Cannot restrict further, depth increasing." )
 
-                failed_locs.append( ( location, self.distance() ) )
+                self.failed_locs.append( ( location, self.distance() ) )
 
-                if len( failed_locs ) > 0:
-                    failed_locs.sort( key = lambda x : x[1] )
-                    location, self.last_dist = failed_locs[0]
+                if len( self.failed_locs ) > 0:
+                    self.failed_locs.sort( key = lambda x : x[1] )
+                    location, self.last_dist = self.failed_locs[0]
                 else:
                     self.last_dist = self.distance()
 
                 self.expand( location )
-                failed_locs = []
+                self.failed_locs = []
 
             else:
                 logger.info( "Progress has not been made, restricting model." )
-                failed_locs.append( ( location, self.distance() ) )
-                self.head.restrict( location )
+                self.failed_locs.append( ( location, self.distance() ) )
+                self.anneal_head()
+
+                if self.restrict_workers > 1:
+                    # Adopting a variant replaces failed_locs, so extend after
+                    results = self.explore_restrictions()
+                    self.failed_locs += results
+                    explored = True
+                else:
+                    self.head.restrict( location )
 
         return self.finalize()
 
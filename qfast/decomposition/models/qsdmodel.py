@@ -0,0 +1,232 @@
+"""
+QFAST Quantum Shannon Decomposition Model Module
+
+This models a circuit with the Quantum Shannon Decomposition. The
+cosine-sine decomposition splits the unitary into two multiplexors and
+a multiplexed Ry, the multiplexors are demultiplexed into unitaries on
+one qubit fewer and diagonals, and the diagonals are decomposed into
+CNOT and Rz gates. This repeats until every unitary fits a location.
+The resulting small gates are then merged into gates of the model's
+size. No optimizer is used, so the run time only depends on the size
+of the unitary.
+"""
+
+
+import logging
+import itertools as it
+
+import numpy as np
+import scipy as sp
+import scipy.linalg
+
+from qfast import pauli
+from qfast import diagonal
+from qfast import multiplexor
+from qfast.topology import Topology
+from qfast.decomposition.circuitmodel import CircuitModel
+from qfast.decomposition.fusion import group_blocks, merge_block
+from qfast.decomposition.models.perm.fixedgate import FixedGate
+
+
+logger = logging.getLogger( "qfast" )
+
+
+CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                   [ 0, 1, 0, 0 ],
+                   [ 0, 0, 0, 1 ],
+                   [ 0, 0, 1, 0 ] ] )
+
+# A CNOT controlled by the second qubit of its location
+CNOT_REVERSED = np.array( [ [ 1, 0, 0, 0 ],
+                            [ 0, 0, 0, 1 ],
+                            [ 0, 0, 1, 0 ],
+                            [ 0, 1, 0, 0 ] ] )
+
+# Conjugating Rz by S H gives Ry
+SH = np.array( [ [ 1, 1 ], [ 1j, -1j ] ] ) / np.sqrt( 2 )
+
+
+class QSDModel ( CircuitModel ):
+
+    def __init__ ( self, utry, gate_size, locations, optimizer,
+                   success_threshold = 1e-3, partial_solution_callback = None,
+                   objective = "trace", initialization = "random" ):
+        """
+        Quantum Shannon Decomposition Model Constructor
+
+        Args:
+            utry (np.ndarray): The unitary to model.
+
+            gate_size (int): The size of the model's gate.
+
+            locations (list[tuple[int]): The valid locations for gates.
+                Two qubits are connected if a location holds both.
+
+            optimizer (Optimizer): Unused, the model is not optimized.
+
+            success_threshold (float): The distance criteria for success.
+
+            partial_solution_callback (None or callable): callback for
+                partial solutions. If not None, then callable that takes
+                a list[gate.Gate] and returns nothing.
+
+            objective (str): Unused, see CircuitModel.
+
+            initialization (str): Unused, see CircuitModel.
+        """
+
+        super().__init__( utry, gate_size, locations, optimizer,
+                          success_threshold, partial_solution_callback,
+                          objective, initialization )
+
+        self.location_sets = [ set( location ) for location in locations ]
+        pairs = set( pair for location in locations
+                     for pair in it.combinations( location, 2 ) )
+        self.topology = Topology( self.num_qubits, sorted( pairs ) )
+
+    def solve ( self, time_limit = None, max_depth = None ):
+        """
+        Solve the model for the target unitary, see CircuitModel.
+
+        The decomposition is exact up to the tolerance of the diagonal
+        gates and is always completed, so time_limit and max_depth
+        are ignored.
+        """
+
+        self.start_budget( time_limit, max_depth )
+
+        ops = self.decompose( self.utry, tuple( range( self.num_qubits ) ) )
+        blocks = self.merge( ops )
+
+        self.gates = []
+        self.param_ranges = [ 0 ]
+        self.x = np.array( [] )
+
+        for location, utry in blocks:
+            gate = FixedGate( self.num_qubits, self.gate_size, location )
+            # A complex dtype keeps the Schur form of real blocks triangular
+            H = pauli.unitary_log_no_i( utry.astype( np.complex128 ), tol = 1e-8 )
+            x = -( 2 ** self.num_qubits ) * pauli.pauli_expansion( H, tol = 1e-8 )
+            self.append_gate( gate, x )
+
+        if self.success():
+            logger.info( "Successfully completed at distance: %e"
+                         % self.distance() )
+        else:
+            logger.info( "Unsuccessfully completed at distance: %e"
+                         % self.distance() )
+
+        return self.record_solution( self.get_gate_list() )
+
+    def get_structure ( self ):
+        """
+        Returns the locations of the solved model's gates.
+
+        They can seed the structure of a FixedModel.
+        """
+
+        return [ gate.location for gate in self.gates ]
+
+    def fits ( self, qubits ):
+        """Returns true if a location holds all of qubits."""
+        return any( set( qubits ) <= s for s in self.location_sets )
+
+    def decompose ( self, utry, location ):
+        """
+        Decomposes a unitary into gates that each fit a location.
+
+        Args:
+            utry (np.ndarray): The unitary to decompose.
+
+            location (tuple[int]): The sorted qubits utry acts on.
+
+        Returns:
+            (list[tuple[tuple[int], np.ndarray]]): The sorted qubits and
+                unitary of every gate, in the order they are applied.
+        """
+
+        # Raises CancelledError when cancelled
+        self.budget_exhausted()
+
+        if len( location ) == 1 or self.fits( location ):
+            return [ ( location, utry ) ]
+
+        # Split on a qubit that leaves the others connected
+        for i, control in enumerate( location ):
+            rest = location[ : i ] + location[ i + 1 : ]
+
+            if self.topology.is_connected( rest ):
+                break
+
+        size = utry.shape[0] // 2
+        ( L0, L1 ), theta, ( R0, R1 ) = sp.linalg.cossin( multiplexor.reorder( utry, i ),
+                                                           p = size, q = size,
+                                                           separate = True )
+
+        phases = np.concatenate( [ np.exp( -1j * theta ), np.exp( 1j * theta ) ] )
+        middle = multiplexor.reorder( np.diag( phases ), i, inverse = True )
+
+        return ( self.decompose_multiplexor( R0, R1, i, location )
+                 + [ ( ( control, ), SH.conj().T ) ]
+                 + self.decompose_diagonal( middle, location )
+                 + [ ( ( control, ), SH ) ]
+                 + self.decompose_multiplexor( L0, L1, i, location ) )
+
+    def decompose_multiplexor ( self, A, B, i, location ):
+        """Decomposes the multiplexor A ⊕ B controlled by location[i]."""
+        rest = location[ : i ] + location[ i + 1 : ]
+        V, D, W = multiplexor.demultiplex_blocks( A, B )
+        phases = np.concatenate( [ D, D.conj() ] )
+        middle = multiplexor.reorder( np.diag( phases ), i, inverse = True )
+
+        return ( self.decompose( W, rest )
+                 + self.decompose_diagonal( middle, location )
+                 + self.decompose( V, rest ) )
+
+    def decompose_diagonal ( self, utry, location ):
+        """Decomposes a diagonal unitary into CNOT and Rz gates."""
+        subgraph = self.topology.get_local_subgraph( location )
+        topology = Topology( len( location ), list( subgraph ) )
+        ops = []
+
+        for name, args in diagonal.get_diagonal_gates( utry, topology ):
+            if name == "cx":
+                control, target = location[ args[0] ], location[ args[1] ]
+
+                if control < target:
+                    ops.append( ( ( control, target ), CNOT ) )
+                else:
+                    ops.append( ( ( target, control ), CNOT_REVERSED ) )
+
+            else:
+                qubit, angle = location[ args[0] ], args[1]
+                ops.append( ( ( qubit, ), np.diag( [ np.exp( -0.5j * angle ),
+                                                     np.exp( 0.5j * angle ) ] ) ) )
+
+        return ops
+
+    def merge ( self, ops ):
+        """
+        Merges small gates into gates at the model's locations.
+
+        Every gate is merged into the latest earlier block it fits with,
+        as long as the blocks after that one act on other qubits.
+
+        Args:
+            ops (list[tuple[tuple[int], np.ndarray]]): The gates to merge,
+                see decompose.
+
+        Returns:
+            (list[tuple[tuple[int], np.ndarray]]): The location and
+                unitary of every merged gate, in the order they are
+                applied.
+        """
+
+        merged = []
+        for qubits, block_ops in group_blocks( ops, self.fits ):
+            location = next( l for l in self.locations if qubits <= set( l ) )
+            merged.append( ( location, merge_block( location, block_ops ) ) )
+
+        logger.info( "Merged %d gates into %d gates." % ( len( ops ), len( merged ) ) )
+
+        return merged
@@ -6,19 +6,17 @@ This is done using the softmax of all groups of pauli matrices.
 """
 
 
-from copy import deepcopy
-
 import numpy as np
 import scipy as sp
 
 from qfast import pauli
 from qfast import utils
-from qfast.decomposition.gatemodel import GateModel
+from qfast.decomposition.genericgatemodel import GenericGateModel
 
 
-class GenericGate ( GateModel ):
+class GenericGate ( GenericGateModel ):
 
-    def __init__ ( self, num_qubits, gate_size, locations ):
+    def __init__ ( self, num_qubits, gate_size, locations, beta = 10 ):
         """
         GenericGate Constructor
 
@@ -28,17 +26,16 @@ class GenericGate ( GateModel ):
             gate_size (int): The number of qubits this gate acts on
 
             locations (list[tuple[int]]): The potential locations of this gate
+
+            beta (float): The inverse temperature of the location softmax.
+                Larger values commit the gate to one location more sharply.
         """
 
-        super().__init__( num_qubits, gate_size )
+        super().__init__( num_qubits, gate_size, locations, beta )
 
-        self.Hcoef  = -1j / ( 2 ** num_qubits )
-        self.locations = locations
         self.paulis = [ pauli.get_pauli_n_qubit_projection( num_qubits, location )
                         for location in locations ]
         self.sigmav = self.Hcoef * np.array( self.paulis )
-
-        self.working_locations = deepcopy( locations )
         self.working_sigmav = np.copy( self.sigmav )
 
     def get_location ( self, x ):
@@ -50,28 +47,14 @@ class GenericGate ( GateModel ):
         """Returns the number of function input parameters."""
         return (4 ** self.gate_size) * self.get_location_count()
 
-    def get_location_count ( self ):
-        """Returns the number of location input parameters."""
-        return len( self.working_locations )
-
     def get_param_count ( self ):
         """Returns the number of the gate's input parameters."""
         return self.get_function_count() + self.get_location_count()
 
-    def cannot_restrict ( self ):
-        """Return true if the gate's location cannot be restricted."""
-        return len( self.working_locations ) <= 1
-
-    def restrict ( self, location ):
-        """Restrict the gate's model by removing a potential location."""
-        idx = self.working_locations.index( location )
-        self.working_locations.pop( idx )
-        self.working_sigmav = np.delete( self.working_sigmav, idx, 0 )
-
-    def lift_restrictions ( self ):
-        """Remove previous restrictions on the gate's model."""
-        self.working_locations = deepcopy( self.locations )
-        self.working_sigmav = np.copy( self.sigmav )
+    def update_working_data ( self ):
+        """Recomputes the sigmav of the working locations."""
+        self.working_sigmav = np.array( [ self.sigmav[ self.locations.index( l ) ]
+                                          for l in self.working_locations ] )
 
     def get_function_values ( self, x, only_max = False ):
         """Returns the function values."""
@@ -87,8 +70,24 @@ class GenericGate ( GateModel ):
         """Returns the location values."""
         return x[ self.get_function_count() : ]
 
-    def get_initial_input ( self ):
-        """Produces a random vector of inputs."""
+    def get_initial_input ( self, residual = None ):
+        """
+        Produces a vector of inputs.
+
+        Args:
+            residual (None or np.ndarray): If None, the function values
+                are random. Otherwise, each working location's function
+                values are informed by the residual, and the highest
+                scoring working location is favored by the location values.
+        """
+
+        if residual is not None:
+            ain = [ self.get_residual_input( residual, location )
+                    for location in self.working_locations ]
+            lin = np.zeros( self.get_location_count() )
+            lin[ np.argmax( self.get_location_scores( residual ) ) ] = 1
+            return np.concatenate( ain + [ lin ] )
+
         ain = np.random.random( self.get_function_count() )
         # ain = [ np.pi ] * self.get_function_count()
         lin = [ 0 ] * self.get_location_count()
@@ -119,7 +118,7 @@ class GenericGate ( GateModel ):
     def get_matrix ( self, x ):
         """Produces the circuit matrix for this gate."""
         alpha, l = self.partition_input( x )
-        l = utils.softmax( l, 10 )
+        l = utils.softmax( l, self.beta )
 
         Hv = []
 
@@ -133,7 +132,7 @@ class GenericGate ( GateModel ):
     def get_matrix_and_derivatives ( self, x ):
         """Produces the circuit matrix and partials for this gate."""
         alpha, l = self.partition_input( x )
-        l = utils.softmax( l, 10 )
+        l = utils.softmax( l, self.beta )
 
         Hv = []
 
@@ -153,7 +152,7 @@ class GenericGate ( GateModel ):
         # Partials of H with respect to location variables
         L = np.tile( l, ( self.working_sigmav.shape[0], 1 ) )
         L = np.identity( self.working_sigmav.shape[0] ) - L
-        L = 10 * ( np.diag( l ) @ L )
+        L = self.beta * ( np.diag( l ) @ L )
 
         l_der = np.array( [ utils.dot_product( Lr, Hv ) for Lr in L ] )
 
@@ -0,0 +1,182 @@
+"""
+This module implements portfolio decomposition.
+
+A portfolio races several decomposer configurations on the same
+unitary in separate processes and keeps the best finished result.
+"""
+
+
+import time
+import queue
+import multiprocessing as mp
+
+from qfast.decomposition.decomposer import Decomposer, default_hierarchy_fn
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+# The number of seconds between checks for crashed worker processes
+_poll_interval = 1
+
+
+def _run_decomposer ( index, decomposer, results, decompose_options ):
+    """Decomposes in a worker process and reports the result."""
+    try:
+        gate_list = decomposer.decompose( **decompose_options )
+        results.put( ( index, gate_list, decomposer.distance, None ) )
+    except Exception as e:
+        results.put( ( index, None, None, repr( e ) ) )
+
+
+def decompose_portfolio ( utry, portfolio, target_gate_size = 2,
+                          hierarchy_fn = default_hierarchy_fn,
+                          topology = None, time_limit = None,
+                          wait_for_best = False, decompose_options = {},
+                          mp_context = None, success_threshold = 1e-3 ):
+    """
+    Decomposes a unitary with several configurations at once.
+
+    Every configuration runs a Decomposer in its own process. Only
+    results closer to the unitary than success_threshold are accepted.
+    If none are, the closest result is returned instead. Unfinished
+    processes are terminated once a result is chosen.
+
+    Args:
+        utry (np.ndarray): A unitary matrix to decompose
+
+        portfolio (list[tuple[str, str, Dict]]): The configurations to
+            race. Each is a (model, optimizer, model_options) tuple,
+            see Decomposer.
+
+        target_gate_size (int): After decomposition, this will be
+            the largest size of any gate in the returned list.
+
+        hierarchy_fn (callable): This function determines the
+            decomposition hierarchy.
+
+        topology (Topology): Determines the connection of qubits.
+            If none, will be set to all-to-all.
+
+        time_limit (None or float): The number of seconds to wait for
+            better results when wait_for_best is true. If None, wait for
+            every configuration to finish.
+
+        wait_for_best (bool): If false, the first accepted result wins.
+            Otherwise, the accepted result with the fewest gates, then
+            the smallest distance, that finished within the time limit
+            wins. The first accepted result is still awaited if none
+            finish within the time limit.
+
+        decompose_options (Dict): kwargs for Decomposer.decompose,
+            given to every configuration.
+
+        mp_context (None or multiprocessing.context.BaseContext): The
+            context the processes are started with. If None, the
+            default start method is used. Every configuration and
+            hierarchy_fn must be picklable for the spawn and forkserver
+            start methods.
+
+        success_threshold (float): The largest distance of an
+            accepted result.
+
+    Returns:
+        (list[gate.Gate]): List of gates that implements the unitary.
+
+    Raises:
+        ValueError: If the portfolio is empty.
+
+        RuntimeError: If every configuration fails or its process
+            exits without reporting a result.
+    """
+
+    if len( portfolio ) == 0:
+        raise ValueError( "Portfolio must include a configuration." )
+
+    # Validates all configurations before any process is started
+    decomposers = [ Decomposer( utry, target_gate_size, model, optimizer,
+                                hierarchy_fn, topology,
+                                model_options = model_options )
+                    for model, optimizer, model_options in portfolio ]
+
+    mp_context = mp_context or mp.get_context()
+    results = mp_context.Queue()
+    processes = [ mp_context.Process( target = _run_decomposer,
+                              args = ( i, decomposer, results,
+                                       decompose_options ) )
+                  for i, decomposer in enumerate( decomposers ) ]
+
+    for process in processes:
+        process.start()
+
+    start = time.time()
+    pending = set( range( len( processes ) ) )
+    best = None
+    closest = None
+
+    try:
+        while len( pending ) > 0:
+
+            timeout = _poll_interval
+            if best is not None:
+                if not wait_for_best:
+                    break
+
+                if time_limit is not None:
+                    remaining = time_limit - ( time.time() - start )
+                    if remaining <= 0:
+                        break
+                    timeout = min( timeout, remaining )
+
+            # A process that exited before the wait has flushed its result
+            exited = [ i for i in pending if processes[i].exitcode is not None ]
+
+            try:
+                index, gate_list, distance, error = results.get( timeout = timeout )
+            except queue.Empty:
+                for i in exited:
+                    logger.warning( "Portfolio configuration %d exited with"
+                                    " code %d before reporting."
+                                    % ( i, processes[i].exitcode ) )
+                    pending.discard( i )
+                continue
+
+            pending.discard( index )
+
+            if error is not None:
+                logger.warning( "Portfolio configuration %d failed: %s"
+                                % ( index, error ) )
+                continue
+
+            logger.info( "Portfolio configuration %d finished with %d gates"
+                         " at %e distance." % ( index, len( gate_list ),
+                                                distance ) )
+
+            if closest is None or distance < closest[2]:
+                closest = ( index, gate_list, distance )
+
+            if distance >= success_threshold:
+                continue
+
+            if best is None or ( len( gate_list ), distance ) \
+                               < ( len( best[1] ), best[2] ):
+                best = ( index, gate_list, distance )
+
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        results.close()
+
+    if best is None:
+        if closest is None:
+            raise RuntimeError( "Every portfolio configuration failed." )
+
+        logger.warning( "No portfolio configuration converged,"
+                        " returning the closest result." )
+        best = closest
+
+    logger.info( "Portfolio configuration %d won." % best[0] )
+    return best[1]
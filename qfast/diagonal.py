@@ -0,0 +1,237 @@
+"""
+This module implements direct synthesis of diagonal unitaries.
+
+A diagonal unitary is a phase polynomial: its phases are a sum of
+parity terms, one per subset of qubits, given by the Walsh-Hadamard
+transform of the phase vector. Each term is an Rz on a qubit holding
+the parity of the subset, which CNOTs along the topology compute and
+uncompute. No numerical optimization is needed.
+"""
+
+import numpy as np
+import scipy as sp
+import scipy.linalg
+
+from qfast import utils
+from qfast.topology import Topology
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def is_diagonal ( utry, tol = 1e-8 ):
+    """Returns true if every off-diagonal element of utry is within tol."""
+    off_diagonal = utry - np.diag( np.diag( utry ) )
+    return np.all( np.abs( off_diagonal ) <= tol )
+
+
+def get_parity_terms ( utry, tol = 1e-8 ):
+    """
+    Expands the phases of a diagonal unitary into parity terms.
+
+    Args:
+        utry (np.ndarray): The diagonal unitary.
+
+        tol (float): Terms with smaller coefficients are dropped.
+
+    Returns:
+        (List[Tuple[Tuple[int], float]]): Every qubit subset S with its
+            coefficient c, such that utry equals the product of
+            exp( i c Z_S ) up to global phase.
+    """
+
+    num_qubits = utils.get_num_qubits( utry )
+    phases = np.angle( np.diag( utry ) )
+    coefs = sp.linalg.hadamard( 2 ** num_qubits ) @ phases / 2 ** num_qubits
+
+    terms = []
+    for mask in range( 1, 2 ** num_qubits ):
+        if abs( coefs[ mask ] ) <= tol:
+            continue
+
+        subset = tuple( q for q in range( num_qubits )
+                        if mask >> ( num_qubits - 1 - q ) & 1 )
+        terms.append( ( subset, coefs[ mask ] ) )
+
+    return terms
+
+
+def get_parity_network ( subset, topology ):
+    """
+    Returns the CNOTs that compute the parity of subset on its first qubit.
+
+    The CNOTs follow the shortest paths in the topology from the first
+    qubit to the others. Qubits on those paths outside of subset are
+    bridged, so their values cancel. Every other qubit ends up where it
+    started once the network is applied in reverse.
+
+    Args:
+        subset (Tuple[int]): The qubits whose parity is computed.
+
+        topology (Topology): Determines the connection of qubits.
+
+    Returns:
+        (List[Tuple[int]]): The (control, target) qubits of every CNOT.
+
+    Raises:
+        ValueError: If subset is not connected in topology.
+    """
+
+    root = subset[0]
+
+    # Breadth-first search tree rooted at the target
+    parents = { root: None }
+    frontier = [ root ]
+    while len( frontier ) > 0:
+        q0 = frontier.pop( 0 )
+        for q1 in topology.adjlist[ q0 ]:
+            if q1 not in parents:
+                parents[ q1 ] = q0
+                frontier.append( q1 )
+
+    if not all( q in parents for q in subset ):
+        raise ValueError( "Subset is not connected in the topology." )
+
+    # The smallest subtree that connects the subset
+    children = {}
+    for q in subset[1:]:
+        while q != root and q not in children.get( parents[q], [] ):
+            children.setdefault( parents[q], [] ).append( q )
+            q = parents[q]
+
+    def accumulate ( q ):
+        """Adds the parity of the subset below q onto q."""
+        cnots = []
+        for child in children.get( q, [] ):
+            cnots += contribute( child, q )
+        return cnots
+
+    def contribute ( q, parent ):
+        """Adds the parity of the subset at and below q onto parent."""
+        below = accumulate( q )
+
+        if q in subset:
+            return below + [ ( q, parent ) ]
+
+        # Bridge q: add it with the subset below, restore it, add it alone
+        return below + [ ( q, parent ) ] + below[::-1] + [ ( q, parent ) ]
+
+    return accumulate( root )
+
+
+def append_cnot ( gates, cnot ):
+    """
+    Appends a CNOT to a gate list, cancelling it against an earlier one.
+
+    The gate list is scanned backwards over gates that commute with
+    the CNOT. If an identical CNOT is found, both are removed.
+
+    Args:
+        gates (List[Tuple[str, Tuple]]): The gates, each a ("cx",
+            (control, target)) or ("rz", (qubit, angle)) tuple.
+
+        cnot (Tuple[int]): The (control, target) qubits of the CNOT.
+    """
+
+    control, target = cnot
+
+    for i in range( len( gates ) - 1, -1, -1 ):
+        name, args = gates[i]
+
+        if name == "cx":
+            if args == cnot:
+                del gates[i]
+                return
+
+            if args[0] == target or args[1] == control:
+                break
+
+        elif args[0] == target:
+            break
+
+    gates.append( ( "cx", cnot ) )
+
+
+def get_diagonal_gates ( utry, topology = None, tol = 1e-8 ):
+    """
+    Decomposes a diagonal unitary into CNOT and Rz gates.
+
+    Args:
+        utry (np.ndarray): The diagonal unitary.
+
+        topology (None or Topology): Determines the connection of
+            qubits. If none, will be set to all-to-all.
+
+        tol (float): Parity terms with smaller coefficients are dropped.
+
+    Returns:
+        (List[Tuple[str, Tuple]]): The gates in the order they are
+            applied, each a ("cx", (control, target)) or
+            ("rz", (qubit, angle)) tuple. They implement utry up to
+            global phase.
+
+    Raises:
+        ValueError: If utry is not diagonal or the topology is not
+            connected.
+    """
+
+    if not is_diagonal( utry, tol ):
+        raise ValueError( "Unitary is not diagonal." )
+
+    num_qubits = utils.get_num_qubits( utry )
+    topology = topology or Topology( num_qubits )
+
+    # Terms sharing a target are adjacent, so their networks cancel more
+    terms = sorted( get_parity_terms( utry, tol ), key = lambda t : t[0] )
+
+    gates = []
+    for subset, coef in terms:
+        network = get_parity_network( subset, topology )
+
+        for cnot in network:
+            append_cnot( gates, cnot )
+
+        gates.append( ( "rz", ( subset[0], -2 * coef ) ) )
+
+        for cnot in reversed( network ):
+            append_cnot( gates, cnot )
+
+    logger.info( "Decomposed diagonal unitary with %d parity terms."
+                 % len( terms ) )
+
+    return gates
+
+
+def synthesize_diagonal ( utry, topology = None, tol = 1e-8 ):
+    """
+    Synthesizes a diagonal unitary into CNOT and Rz gates.
+
+    Args:
+        utry (np.ndarray): The diagonal unitary.
+
+        topology (None or Topology): Determines the connection of
+            qubits. If none, will be set to all-to-all.
+
+        tol (float): Parity terms with smaller coefficients are dropped.
+
+    Returns:
+        (str): Qasm code implementing utry up to global phase.
+
+    Raises:
+        ValueError: If utry is not diagonal or the topology is not
+            connected.
+    """
+
+    gates = get_diagonal_gates( utry, topology, tol )
+
+    qasm  = "OPENQASM 2.0;\n"
+    qasm += "include \"qelib1.inc\";\n"
+    qasm += "qreg q[%d];\n" % utils.get_num_qubits( utry )
+
+    for name, args in gates:
+        if name == "cx":
+            qasm += "cx q[%d],q[%d];\n" % args
+        else:
+            qasm += "rz(%.17g) q[%d];\n" % ( args[1], args[0] )
+
+    return qasm
@@ -0,0 +1,153 @@
+"""
+This module implements tensor-product factorization of unitaries.
+
+A unitary that factors as A ⊗ B over some bipartition of its qubits
+can be synthesized one factor at a time. Factorizations are detected
+with the operator-Schmidt rank across a bipartition, which is one
+exactly when the unitary is a tensor product over it.
+"""
+
+import numpy     as np
+import itertools as it
+
+from qfast import utils
+from qfast.topology import Topology
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def split ( utry, part, tol = 1e-8 ):
+    """
+    Splits a unitary into a tensor product over a bipartition.
+
+    Args:
+        utry (np.ndarray): The unitary to split.
+
+        part (Tuple[int]): The sorted qubits of the first factor.
+            The remaining qubits make up the second factor.
+
+        tol (float): The largest relative weight of the discarded
+            operator-Schmidt coefficients.
+
+    Returns:
+        (None or Tuple[np.ndarray]): None if utry is not a tensor
+            product over the bipartition. Otherwise the unitaries A
+            and B on part and the remaining qubits, each in sorted qubit
+            order, such that utry equals A ⊗ B up to global phase and
+            the qubit ordering.
+    """
+
+    num_qubits = utils.get_num_qubits( utry )
+    rest = tuple( q for q in range( num_qubits ) if q not in part )
+    order = part + rest
+    dim_a = 2 ** len( part )
+    dim_b = 2 ** len( rest )
+
+    # Realign utry so its operator-Schmidt coefficients are singular values
+    tensor = utry.reshape( [ 2 ] * ( 2 * num_qubits ) )
+    tensor = tensor.transpose( order + tuple( num_qubits + q for q in order ) )
+    tensor = tensor.reshape( dim_a, dim_b, dim_a, dim_b )
+    realigned = tensor.transpose( 0, 2, 1, 3 ).reshape( dim_a ** 2, dim_b ** 2 )
+
+    U, S, Vh = np.linalg.svd( realigned, full_matrices = False )
+    weights = S ** 2
+
+    if np.sum( weights[1:] ) > tol * np.sum( weights ):
+        return None
+
+    A = utils.closest_unitary( U[:, 0].reshape( dim_a, dim_a ) )
+    B = utils.closest_unitary( Vh[0, :].reshape( dim_b, dim_b ) )
+    return A, B
+
+
+def factorize ( utry, topology = None, tol = 1e-8 ):
+    """
+    Factors a unitary into a tensor product of the smallest unitaries.
+
+    Bipartitions are tried from the smallest first factor upwards, and
+    both factors of a split are factored further. Only bipartitions with
+    both parts connected in the topology are considered, so every factor
+    can still be synthesized within its own qubits.
+
+    Args:
+        utry (np.ndarray): The unitary to factor.
+
+        topology (None or Topology): Determines the connection of
+            qubits. If none, will be set to all-to-all.
+
+        tol (float): The tolerance of every split, see split.
+
+    Returns:
+        (List[Tuple[Tuple[int], np.ndarray]]): The sorted qubits of every
+            factor and its unitary. Their tensor product equals utry up
+            to global phase. A unitary that does not factor is returned
+            as the only factor.
+    """
+
+    num_qubits = utils.get_num_qubits( utry )
+    topology = topology or Topology( num_qubits )
+    factors = _factorize( utry, tuple( range( num_qubits ) ), topology, tol )
+
+    if len( factors ) > 1:
+        logger.info( "Factored unitary into %s."
+                     % [ location for location, _ in factors ] )
+
+    return factors
+
+
+def _factorize ( utry, location, topology, tol ):
+    """Factors a unitary acting on location, see factorize."""
+    num_qubits = len( location )
+
+    for size in range( 1, num_qubits // 2 + 1 ):
+        for part in it.combinations( range( num_qubits ), size ):
+            rest = tuple( q for q in range( num_qubits ) if q not in part )
+            part_location = tuple( location[q] for q in part )
+            rest_location = tuple( location[q] for q in rest )
+
+            if not topology.is_connected( part_location ) \
+               or not topology.is_connected( rest_location ):
+                continue
+
+            factors = split( utry, part, tol )
+
+            if factors is not None:
+                return ( _factorize( factors[0], part_location, topology, tol )
+                         + _factorize( factors[1], rest_location, topology, tol ) )
+
+    return [ ( location, utry ) ]
+
+
+def is_identity ( utry, tol = 1e-8 ):
+    """Returns true if utry is the identity up to global phase."""
+    return np.allclose( utry, utry[0, 0] * np.identity( utry.shape[0] ),
+                        atol = tol )
+
+
+def get_u3_qasm ( utry ):
+    """
+    Returns qasm code implementing a single-qubit unitary with one u3.
+
+    Args:
+        utry (np.ndarray): The single-qubit unitary.
+
+    Returns:
+        (str): Qasm code with a u3 gate on q[0], up to global phase.
+    """
+
+    # Remove the global phase, so utry is in SU(2)
+    utry = np.asarray( utry, dtype = np.complex128 )
+    utry = utry / np.sqrt( np.linalg.det( utry ) )
+
+    theta = 2 * np.arctan2( np.abs( utry[1, 0] ), np.abs( utry[0, 0] ) )
+    phi_plus_lambda = 2 * np.angle( utry[1, 1] )
+    phi_minus_lambda = 2 * np.angle( utry[1, 0] )
+    phi = ( phi_plus_lambda + phi_minus_lambda ) / 2
+    lam = ( phi_plus_lambda - phi_minus_lambda ) / 2
+
+    qasm  = "OPENQASM 2.0;\n"
+    qasm += "include \"qelib1.inc\";\n"
+    qasm += "qreg q[1];\n"
+    qasm += "u3(%.17g, %.17g, %.17g) q[0];\n" % ( theta, phi, lam )
+    return qasm
@@ -6,6 +6,7 @@ A gate is a unitary operation applied to a set of qubits.
 
 import numpy as np
 
+from qfast import perm
 from qfast import utils
 
 class Gate():
@@ -53,3 +54,20 @@ class Gate():
                + str( self.utry[-1][-1] ) \
                + "]]"
 
+    def get_circuit_matrix ( self, num_qubits ):
+        """
+        Returns the gate's unitary acting on num_qubits qubits.
+
+        Args:
+            num_qubits (int): The total number of qubits.
+
+        Returns:
+            (np.ndarray): The gate's unitary padded with identities.
+        """
+
+        if not utils.is_valid_location( self.location, num_qubits ):
+            raise ValueError( "Gate does not fit in circuit." )
+
+        P = perm.calc_permutation_matrix( num_qubits, self.location )
+        I = np.identity( 2 ** ( num_qubits - self.num_qubits ) )
+        return P @ np.kron( self.utry, I ) @ P.T
@@ -0,0 +1,115 @@
+"""
+This module implements the AsyncInstantiater class.
+
+The async instantiater instantiates gates in worker processes so an
+asyncio event loop keeps running.
+"""
+
+import asyncio
+import logging
+
+from qfast import gate
+from qfast.workerpool import get_default_pool
+from qfast.instantiation.instantiater import Instantiater
+
+
+logger = logging.getLogger( "qfast" )
+
+
+def _instantiate_gate ( tool, topology, basis_gates, g ):
+    """Instantiates a gate in a worker process."""
+    return Instantiater( tool, topology, basis_gates ).instantiate_gate( g )
+
+
+class AsyncInstantiater ( Instantiater ):
+    """The AsyncInstantiater Class."""
+
+    def __init__ ( self, tool, topology, basis_gates = None, pool = None,
+                   max_concurrency = None ):
+        """
+        Construct an async instantiater with a native tool.
+
+        Args:
+            tool (str): The name of the native tool to use.
+
+            topology (Topology): The topology of the circuit.
+
+            basis_gates (List[str]): The two-qubit gate native gate.
+
+            pool (None or WorkerPool): The worker processes that
+                instantiate the gates. If None, the default pool
+                is used.
+
+            max_concurrency (None or int): The largest number of gates
+                one instantiate call instantiates at once. If None,
+                every gate is submitted at once.
+
+        Raises:
+            RuntimeError: If the native tool cannot be found.
+
+            ValueError: If max_concurrency is not positive.
+        """
+
+        super().__init__( tool, topology, basis_gates )
+
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError( "Maximum concurrency must be positive." )
+
+        self.pool = pool or get_default_pool()
+        self.max_concurrency = max_concurrency
+
+    async def instantiate ( self, gate_list ):
+        """
+        Perform the instantiation phase.
+
+        If the awaiting task is cancelled, gates that have not started
+        instantiating are dropped.
+
+        Args:
+            gate_list (list[Gates]): The list of generic gates.
+
+        Returns:
+            (list[tuple[str, tuple[int]]]): List of qasm and
+                gate locations.
+        """
+
+        if not isinstance( gate_list, list ):
+            raise TypeError( "Invalid gate list." )
+
+        if not all( [ isinstance( g, gate.Gate ) for g in gate_list ] ):
+            raise TypeError( "Invalid gate list." )
+
+        logger.debug( "Starting async Instantiation with %s."
+                      % self.tool.__class__.__name__ )
+
+        semaphore = None
+        if self.max_concurrency is not None:
+            semaphore = asyncio.Semaphore( self.max_concurrency )
+
+        return await asyncio.gather( *[ self.instantiate_gate_async( g,
+                                                                     semaphore )
+                                        for g in gate_list ] )
+
+    async def instantiate_gate_async ( self, g, semaphore = None ):
+        """
+        Instantiate a single gate in a worker process.
+
+        Args:
+            g (gate.Gate): The generic gate.
+
+            semaphore (None or asyncio.Semaphore): If not None, it is
+                held while the gate is instantiated.
+
+        Returns:
+            (tuple[str, tuple[int]]): The gate's qasm and location.
+        """
+
+        if semaphore is None:
+            return await self.pool.run( None, _instantiate_gate,
+                                        self.tool_name, self.topology,
+                                        self.basis_gates, g )
+
+        async with semaphore:
+            return await self.pool.run( None, _instantiate_gate,
+                                        self.tool_name, self.topology,
+                                        self.basis_gates, g )
@@ -5,7 +5,9 @@ The instantiater uses a native tool to convert small generic gates
 to a native gate set.
 """
 
+import os
 import logging
+import concurrent.futures as cf
 
 from qfast import gate
 from qfast import plugins
@@ -15,6 +17,21 @@ from qfast.topology import Topology
 logger = logging.getLogger( "qfast" )
 
 
+# The instantiater of a pipeline worker process
+_worker_instantiater = None
+
+
+def _init_worker ( tool, topology, basis_gates ):
+    """Builds the instantiater of a pipeline worker process."""
+    global _worker_instantiater
+    _worker_instantiater = Instantiater( tool, topology, basis_gates )
+
+
+def _instantiate_gate ( g ):
+    """Instantiates a gate in a pipeline worker process."""
+    return _worker_instantiater.instantiate_gate( g )
+
+
 class Instantiater():
     """The Instantiater Class."""
 
@@ -39,6 +56,7 @@ class Instantiater():
         if not isinstance( topology, Topology ):
             raise TypeError( "Invalid topology" )
 
+        self.tool_name = tool
         self.tool = plugins.get_native_tool( tool )()
         self.topology = topology
         self.basis_gates = basis_gates
@@ -64,16 +82,102 @@ class Instantiater():
         logger.debug( "Starting Instantiation with %s."
                       % self.tool.__class__.__name__ )
 
-        qasm_list = []
+        return [ self.instantiate_gate( g ) for g in gate_list ]
+
+    def instantiate_gate ( self, g ):
+        """
+        Instantiate a single gate.
+
+        Args:
+            g (gate.Gate): The generic gate.
+
+        Returns:
+            (tuple[str, tuple[int]]): The gate's qasm and location.
+        """
+
+        coupling_graph = self.topology.get_local_subgraph( g.location )
+        qasm = self.tool.synthesize( g.utry,
+                                     basis_gates = self.basis_gates,
+                                     coupling_graph = coupling_graph )
+        return ( qasm, g.location )
+
+    def instantiate_iter ( self, gate_iter, num_workers = None,
+                           max_in_flight = None ):
+        """
+        Perform the instantiation phase while gates are still produced.
+
+        Gates are instantiated by worker processes as soon as gate_iter
+        yields them, so a producer such as Decomposer.decompose_iter
+        keeps running concurrently. At most max_in_flight gates are
+        pending at once; gate_iter is not advanced further until one
+        finishes.
+
+        Args:
+            gate_iter (iterable[tuple[int, gate.Gate]]): The positions
+                of gates, numbered from zero, and the gates.
+
+            num_workers (None or int): The number of worker processes.
+                If None, it defaults to the number of processors on
+                the machine.
+
+            max_in_flight (None or int): The largest number of pending
+                gates. If None, it defaults to twice the number of
+                worker processes.
+
+        Yields:
+            (tuple[str, tuple[int]]): The qasm and location of every
+                gate, in position order.
+
+        Raises:
+            ValueError: If max_in_flight is not positive.
+        """
+
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError( "Maximum number of pending gates must be positive." )
+
+        logger.debug( "Starting pipelined Instantiation with %s."
+                      % self.tool.__class__.__name__ )
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+
+        if max_in_flight is None:
+            max_in_flight = 2 * num_workers
+
+        pool = cf.ProcessPoolExecutor( num_workers, initializer = _init_worker,
+                                       initargs = ( self.tool_name,
+                                                    self.topology,
+                                                    self.basis_gates ) )
+
+        pending = {}
+        finished = {}
+        next_position = 0
+
+        try:
+            for position, g in gate_iter:
+                if not isinstance( g, gate.Gate ):
+                    raise TypeError( "Invalid gate." )
+
+                while len( pending ) >= max_in_flight:
+                    done, _ = cf.wait( pending, return_when = cf.FIRST_COMPLETED )
+                    for future in done:
+                        finished[ pending.pop( future ) ] = future.result()
+
+                pending[ pool.submit( _instantiate_gate, g ) ] = position
+
+                while next_position in finished:
+                    yield finished.pop( next_position )
+                    next_position += 1
+
+            for future in cf.as_completed( list( pending ) ):
+                finished[ pending.pop( future ) ] = future.result()
 
-        for g in gate_list: 
-            coupling_graph = self.topology.get_subgraph( g.location )
-            renum_map = { q:i for i, q in enumerate(g.location) }
-            coupling_graph = [ (renum_map[i], renum_map[j]) for i, j in coupling_graph ]
-            qasm = self.tool.synthesize( g.utry,
-                                         basis_gates = self.basis_gates, 
-                                         coupling_graph = coupling_graph )
-            qasm_list.append( ( qasm, g.location ) )
+                while next_position in finished:
+                    yield finished.pop( next_position )
+                    next_position += 1
 
-        return qasm_list
+        finally:
+            for future in pending:
+                future.cancel()
 
+            pool.shutdown()
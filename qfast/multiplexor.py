@@ -0,0 +1,174 @@
+"""
+This module implements demultiplexing of controlled unitaries.
+
+A unitary that is block diagonal over one qubit is a multiplexor: it
+applies A to the other qubits when that qubit is zero and B when it is
+one. With the eigendecomposition A B† = V D² V†, it equals
+
+    ( I ⊗ V ) ( D ⊕ D† ) ( I ⊗ W ),  where W = D V† B.
+
+V and W act on one qubit fewer, and D ⊕ D† is diagonal, so it can be
+synthesized directly, see diagonal.synthesize_diagonal.
+"""
+
+import numpy as np
+import scipy as sp
+import scipy.linalg
+
+from qfast import utils
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def reorder ( utry, control, inverse = False ):
+    """
+    Moves a qubit of a unitary to the front.
+
+    Args:
+        utry (np.ndarray): The unitary to reorder.
+
+        control (int): The qubit to move.
+
+        inverse (bool): If true, the first qubit is moved back to
+            control instead.
+
+    Returns:
+        (np.ndarray): The unitary with its qubits ordered as control
+            followed by the remaining qubits in sorted order.
+    """
+
+    num_qubits = utils.get_num_qubits( utry )
+    order = [ control ] + [ q for q in range( num_qubits ) if q != control ]
+
+    if inverse:
+        order = list( np.argsort( order ) )
+
+    tensor = utry.reshape( [ 2 ] * ( 2 * num_qubits ) )
+    tensor = tensor.transpose( order + [ num_qubits + q for q in order ] )
+    return tensor.reshape( utry.shape )
+
+
+def get_blocks ( utry, control, tol = 1e-8 ):
+    """
+    Splits a unitary into the blocks it applies for each control value.
+
+    Args:
+        utry (np.ndarray): The unitary to split.
+
+        control (int): The qubit that controls the blocks.
+
+        tol (float): The largest off-diagonal block element.
+
+    Returns:
+        (None or Tuple[np.ndarray]): None if utry is not block diagonal
+            over control. Otherwise the unitaries A and B applied to the
+            remaining qubits, in sorted order, when control is zero
+            and one.
+    """
+
+    utry = reorder( utry, control )
+
+    dim = utry.shape[0] // 2
+    if np.any( np.abs( utry[ :dim, dim: ] ) > tol ) \
+       or np.any( np.abs( utry[ dim:, :dim ] ) > tol ):
+        return None
+
+    A = utils.closest_unitary( utry[ :dim, :dim ] )
+    B = utils.closest_unitary( utry[ dim:, dim: ] )
+    return A, B
+
+
+def get_control ( utry, topology, tol = 1e-8 ):
+    """
+    Finds a qubit that a unitary can be demultiplexed on.
+
+    Args:
+        utry (np.ndarray): The unitary to check.
+
+        topology (Topology): Determines the connection of qubits. The
+            remaining qubits must stay connected without the control.
+
+        tol (float): The tolerance of the block structure, see get_blocks.
+
+    Returns:
+        (None or int): The first qubit that utry is block diagonal over,
+            or None if there is none.
+    """
+
+    num_qubits = utils.get_num_qubits( utry )
+
+    if num_qubits < 2:
+        return None
+
+    for control in range( num_qubits ):
+        rest = tuple( q for q in range( num_qubits ) if q != control )
+
+        if not topology.is_connected( rest ):
+            continue
+
+        if get_blocks( utry, control, tol ) is not None:
+            return control
+
+    return None
+
+
+def demultiplex_blocks ( A, B ):
+    """
+    Demultiplexes the blocks A ⊕ B of a multiplexor.
+
+    Args:
+        A (np.ndarray): The unitary applied when the control is zero.
+
+        B (np.ndarray): The unitary applied when the control is one.
+
+    Returns:
+        (Tuple[np.ndarray]): The unitaries V and W and the phases D,
+            such that A ⊕ B equals ( I ⊗ V ) ( D ⊕ D† ) ( I ⊗ W ).
+    """
+
+    # A B† is normal, so its complex Schur form is its eigendecomposition
+    T, V = sp.linalg.schur( A @ B.conj().T, output = "complex" )
+    D = np.sqrt( np.diag( T ) / np.abs( np.diag( T ) ) )
+    W = np.diag( D ) @ V.conj().T @ B
+    return V, D, W
+
+
+def demultiplex ( utry, control, tol = 1e-8 ):
+    """
+    Demultiplexes a unitary that is block diagonal over control.
+
+    Args:
+        utry (np.ndarray): The unitary to demultiplex.
+
+        control (int): The qubit that controls the blocks.
+
+        tol (float): The tolerance of the block structure, see get_blocks.
+
+    Returns:
+        (List[Tuple[Tuple[int], np.ndarray]]): The location and unitary
+            of W, D ⊕ D† and V in the order they are applied. Their
+            product equals utry up to global phase.
+
+    Raises:
+        ValueError: If utry is not block diagonal over control.
+    """
+
+    blocks = get_blocks( utry, control, tol )
+
+    if blocks is None:
+        raise ValueError( "Unitary is not block diagonal over the control." )
+
+    num_qubits = utils.get_num_qubits( utry )
+    rest = tuple( q for q in range( num_qubits ) if q != control )
+    V, D, W = demultiplex_blocks( *blocks )
+
+    # D ⊕ D† with the control moved back into place is still diagonal
+    phases = np.concatenate( [ D, D.conj() ] )
+    diag = reorder( np.diag( phases ), control, inverse = True )
+
+    logger.info( "Demultiplexed unitary on qubit %d." % control )
+
+    return [ ( rest, W ),
+             ( tuple( range( num_qubits ) ), diag ),
+             ( rest, V ) ]
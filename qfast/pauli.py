@@ -145,3 +145,28 @@ def pauli_expansion ( H, tol = 1e-15 ):
     X = np.real( np.matmul( np.linalg.inv( A ), flatten_H ) )
     return X
 
+
+def get_location_expansion ( H, location, tol = 1e-8 ):
+    """
+    Computes a Pauli expansion of H projected onto the qubits in location.
+
+    The projection is the partial trace of H over all other qubits,
+    normalized so that H = A kron I projects back onto A.
+
+    Args:
+        H (np.ndarray): The hermitian matrix acting on all qubits
+
+        location (Tuple[int]): The qubits to project onto
+
+        tol (float): The tolerance used to check that H is hermitian
+
+    Returns:
+        X (np.ndarray): The coefficients of a Pauli expansion for the
+                        projection of H, ordered as the Pauli matrices
+                        from get_norder_paulis( len( location ) )
+    """
+
+    num_other_qubits = utils.get_num_qubits( H ) - len( location )
+    H_loc = utils.partial_trace( H, location ) / ( 2 ** num_other_qubits )
+    H_loc = 0.5 * ( H_loc + H_loc.conj().T )
+    return pauli_expansion( H_loc, tol )
@@ -1,13 +1,99 @@
 """This module implements a basic synthesize function."""
 
+import time
+
 from qfast import Decomposer, Instantiater, Combiner, plugins, utils
+from qfast import diagonal
+from qfast import factorization
+from qfast import multiplexor
+from qfast.gate import Gate
 from qfast.topology import Topology
+from qfast.decomposition.fusion import fuse_gates
+from qfast.decomposition.decomposer import default_hierarchy_fn
+from qfast.decomposition.portfolio import decompose_portfolio
+from qfast.decomposition.asyncdecomposer import AsyncDecomposer
+from qfast.instantiation.asyncinstantiater import AsyncInstantiater
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+def _get_cache_key ( cache, utry, topology, target_gate_size, hierarchy_fn,
+                     model, optimizer, portfolio, tool, combiner, basis_gates,
+                     model_options, layout, factorize, detect_diagonal,
+                     demultiplex, fuse, fuse_tolerance ):
+    """
+    Returns the cache key of a synthesized unitary's qasm.
+
+    Every option that changes the qasm is a required argument, so
+    synthesize and synthesize_async key the same configuration alike.
+    """
+
+    sizes = range( target_gate_size + 1, topology.num_qubits + 1 )
+    return cache.get_key( utry, stage = "qasm",
+                          hierarchy = [ hierarchy_fn( size ) for size in sizes ],
+                          coupling_graph = sorted( topology.coupling_graph ),
+                          model = model, optimizer = optimizer,
+                          portfolio = portfolio, tool = tool,
+                          combiner = combiner, basis_gates = basis_gates,
+                          model_options = model_options, layout = layout,
+                          factorize = factorize,
+                          detect_diagonal = detect_diagonal,
+                          demultiplex = demultiplex, fuse = fuse,
+                          fuse_tolerance = fuse_tolerance )
+
+
+def _get_layout ( coupling_graph, num_qubits, layout, gate_size ):
+    """
+    Restricts a device's coupling graph to the region given by layout.
+
+    Args:
+        coupling_graph (None or list[tuple[int]]): The device's coupling
+            graph.
+
+        num_qubits (int): The number of qubits of the unitary.
+
+        layout (str or tuple[int]): The device qubit of every qubit of
+            the unitary, or "auto" to select the best region.
+
+        gate_size (int): The size of the gates the region is selected
+            for, see Topology.select_layout.
+
+    Returns:
+        (tuple[int], list[tuple[int]]): The layout and the coupling graph
+            of its region, in the unitary's qubits.
+
+    Raises:
+        ValueError: If there is no coupling graph or the layout is invalid.
+    """
+
+    if coupling_graph is None:
+        raise ValueError( "A layout requires a coupling graph." )
+
+    num_device_qubits = max( max( pair ) for pair in coupling_graph ) + 1
+    device = Topology( num_device_qubits, coupling_graph )
+
+    if layout == "auto":
+        layout = device.select_layout( num_qubits, min( gate_size, num_qubits ) )
+
+    elif not utils.is_valid_location( layout, num_device_qubits ) \
+         or len( layout ) != num_qubits:
+        raise ValueError( "Invalid layout." )
+
+    return layout, list( device.get_local_subgraph( layout ) )
+
 
 def synthesize ( utry, model = "PermModel", optimizer = "LBFGSOptimizer",
                  tool = "QSearchTool", combiner = "NaiveCombiner",
-                 hierarchy_fn = lambda x : x // 3 if x > 5 else 2,
+                 hierarchy_fn = default_hierarchy_fn,
                  coupling_graph = None, basis_gates = None,
-                 intermediate_solution_callback = None, model_options = {} ):
+                 intermediate_solution_callback = None, model_options = {},
+                 portfolio = None, portfolio_time_limit = None,
+                 portfolio_wait_for_best = False, time_limit = None,
+                 max_depth = None, checkpoint_path = None, resume = False,
+                 cache = None, pipeline = False, num_workers = None,
+                 layout = None, factorize = False, detect_diagonal = True,
+                 demultiplex = False, fuse = False, fuse_tolerance = 1e-8 ):
     """
     Synthesize a unitary matrix and return qasm code using QFAST.
 
@@ -35,15 +121,100 @@ def synthesize ( utry, model = "PermModel", optimizer = "LBFGSOptimizer",
         intermediate_solution_callback (None or callable): Callback
             function for intermediate solutions. If not None, then
             a function that takes in a list[Gates] and returns nothing.
+            Intermediate solutions of factored or demultiplexed blocks
+            are not reported.
 
         model_options (Dict): kwargs for model
 
+        portfolio (None or list[tuple[str, str, Dict]]): If not None,
+            the (model, optimizer, model_options) configurations that
+            are raced in separate processes during decomposition. This
+            replaces model, optimizer and model_options, and
+            intermediate solutions are not reported.
+
+        portfolio_time_limit (None or float): The time limit in seconds
+            for portfolio decomposition, see decompose_portfolio.
+
+        portfolio_wait_for_best (bool): If true, portfolio decomposition
+            keeps the result with the fewest gates within the time limit
+            instead of the first result.
+
+        time_limit (None or float): The number of seconds decomposition
+            may take. When it runs out, the closest circuit found so far
+            is instantiated instead, see Decomposer.decompose. Factored
+            and demultiplexed blocks share the time that remains.
+
+        max_depth (None or int): The largest depth of every model used
+            during decomposition, see Decomposer.decompose. Factored and
+            demultiplexed blocks each get an equal share of it.
+
+        checkpoint_path (None or str): If not None, the decomposition
+            progress is saved to this file, see Decomposer.decompose.
+            This cannot be combined with a portfolio.
+
+        resume (bool): If true, continue the decomposition from the
+            checkpoint at checkpoint_path.
+
+        cache (None or DecompositionCache): If not None, the qasm and
+            decomposition of unitaries synthesized without budgets are
+            looked up in and stored to this cache.
+
+        pipeline (bool): If true, gates are instantiated by worker
+            processes as soon as the decomposer finalizes them, see
+            Decomposer.decompose_iter and Instantiater.instantiate_iter.
+            This cannot be combined with a portfolio or checkpoints.
+
+        num_workers (None or int): The number of instantiation worker
+            processes when pipelining. If None, it defaults to the
+            number of processors on the machine.
+
+        layout (None, str or tuple[int]): If not None, coupling_graph
+            describes a larger device and utry is synthesized on the
+            region of it given by layout, which holds the device qubit
+            of every qubit of utry. If "auto", the best connected region
+            is selected, see Topology.select_layout. The qasm code then
+            acts on the device's qubits.
+
+        factorize (bool): If true, utry is first factored into a tensor
+            product over connected groups of qubits, see
+            factorization.factorize. Every factor is synthesized on its
+            own, with the other options, and the results are combined.
+            This cannot be combined with checkpoints.
+
+        detect_diagonal (bool): If true, diagonal unitaries are
+            synthesized directly into CNOT and Rz gates, without
+            decomposition or the native tool, see
+            diagonal.synthesize_diagonal. This only applies when the
+            basis gates include cx.
+
+        demultiplex (bool): If true, a unitary that is block diagonal
+            over a control qubit is split into two unitaries on the
+            other qubits and a diagonal one, see multiplexor.demultiplex.
+            The smaller unitaries are synthesized on their own, with the
+            other options. This only applies when the basis gates
+            include cx, and cannot be combined with checkpoints.
+
+        fuse (bool): If true, the decomposed gates are fused and gates
+            close to the identity are dropped before instantiation, see
+            fusion.fuse_gates. Fused gates are no larger than the
+            largest decomposed gate. This cannot be combined with
+            pipelining.
+
+        fuse_tolerance (float): The largest sum of the distances to
+            the identity of the gates dropped by fusion.
+
     Returns:
         (str): Qasm code implementing utry.
 
     Raises:
         TypeError: If the coupling_graph is invalid.
 
+        ValueError: If a portfolio is combined with checkpoints or
+            pipelining, pipelining, factorization or demultiplexing is
+            combined with checkpoints, fusion is combined with
+            pipelining, the model does not support checkpoints,
+            or the layout is invalid.
+
         RuntimeError: If the native tool cannot be found.
     """
 
@@ -52,6 +223,24 @@ def synthesize ( utry, model = "PermModel", optimizer = "LBFGSOptimizer",
             raise TypeError( "The specified coupling graph is invalid." )
 
 
+    if portfolio is not None and checkpoint_path is not None:
+        raise ValueError( "Portfolios do not support checkpoints." )
+
+    if pipeline and portfolio is not None:
+        raise ValueError( "Portfolios do not support pipelining." )
+
+    if pipeline and checkpoint_path is not None:
+        raise ValueError( "Pipelining does not support checkpoints." )
+
+    if factorize and checkpoint_path is not None:
+        raise ValueError( "Factorization does not support checkpoints." )
+
+    if demultiplex and checkpoint_path is not None:
+        raise ValueError( "Demultiplexing does not support checkpoints." )
+
+    if fuse and pipeline:
+        raise ValueError( "Pipelining does not support fusion." )
+
     if combiner not in plugins.get_combiners():
         raise RuntimeError( "Cannot find combiner." )
 
@@ -59,29 +248,417 @@ def synthesize ( utry, model = "PermModel", optimizer = "LBFGSOptimizer",
     if tool not in plugins.get_native_tools():
         raise RuntimeError( "Cannot find native tool." )
 
+    deadline = None
+    if time_limit is not None:
+        deadline = time.time() + time_limit
+
     target_gate_size = plugins.get_native_tool( tool )().get_maximum_size()
 
     num_qubits = utils.get_num_qubits( utry )
+
+    if layout is not None:
+        layout, coupling_graph = _get_layout( coupling_graph, num_qubits,
+                                              layout, hierarchy_fn( num_qubits ) )
+
     topology = Topology( num_qubits, coupling_graph )
 
+    key = None
+    if cache is not None and time_limit is None and max_depth is None:
+        key = _get_cache_key( cache, utry, topology, target_gate_size,
+                              model = model, optimizer = optimizer,
+                              portfolio = portfolio, tool = tool,
+                              combiner = combiner, hierarchy_fn = hierarchy_fn,
+                              basis_gates = basis_gates,
+                              model_options = model_options,
+                              layout = layout, factorize = factorize,
+                              detect_diagonal = detect_diagonal,
+                              demultiplex = demultiplex, fuse = fuse,
+                              fuse_tolerance = fuse_tolerance )
+
+        if not resume:
+            entry = cache.get( key )
+
+            if entry is not None:
+                return entry[ "qasm" ]
+
+    # Synthesize diagonal unitaries without numerical optimization
+    if detect_diagonal and _use_diagonal( utry, basis_gates ):
+        qasm = diagonal.synthesize_diagonal( utry, topology )
+        qasm_list = [ ( qasm, tuple( range( num_qubits ) ) ) ]
+        return _recombine( qasm_list, combiner, layout, cache, key )
+
+    instantiater = Instantiater( tool, topology, basis_gates = basis_gates )
+    options = { "model": model, "optimizer": optimizer, "tool": tool,
+                "combiner": combiner, "hierarchy_fn": hierarchy_fn,
+                "basis_gates": basis_gates,
+                "model_options": model_options, "portfolio": portfolio,
+                "portfolio_time_limit": portfolio_time_limit,
+                "portfolio_wait_for_best": portfolio_wait_for_best,
+                "cache": cache, "pipeline": pipeline,
+                "num_workers": num_workers,
+                "detect_diagonal": detect_diagonal,
+                "demultiplex": demultiplex, "fuse": fuse,
+                "fuse_tolerance": fuse_tolerance }
+
+    # Synthesize the factors of a separable unitary one at a time
+    if factorize:
+        factors = factorization.factorize( utry, topology )
+
+        if len( factors ) > 1:
+            budget = _Budget( deadline, max_depth, factors, target_gate_size )
+            qasm_list = [ _synthesize_block( factor, location, topology,
+                                             target_gate_size, instantiater,
+                                             budget.split( factor, location,
+                                                           options ) )
+                          for location, factor in factors ]
+
+            return _recombine( qasm_list, combiner, layout, cache, key )
+
+    # Split a multiplexed unitary into smaller unitaries and a diagonal
+    if demultiplex and ( basis_gates is None or "cx" in basis_gates ):
+        control = multiplexor.get_control( utry, topology )
+
+        if control is not None:
+            W, D, V = multiplexor.demultiplex( utry, control )
+            options = dict( options, factorize = factorize )
+            budget = _Budget( deadline, max_depth, [ W, V ], target_gate_size )
+            qasm_list = [ _synthesize_block( W[1], W[0], topology,
+                                             target_gate_size, instantiater,
+                                             budget.split( W[1], W[0], options ) ),
+                          ( diagonal.synthesize_diagonal( D[1], topology ),
+                            D[0] ),
+                          _synthesize_block( V[1], V[0], topology,
+                                             target_gate_size, instantiater,
+                                             budget.split( V[1], V[0], options ) ) ]
+
+            return _recombine( qasm_list, combiner, layout, cache, key )
+
+    if deadline is not None:
+        time_limit = max( 0, deadline - time.time() )
+
     # Decompose the big input unitary into smaller unitary gates.
-    decomposer = Decomposer( utry, target_gate_size = target_gate_size,
-                             model = model,
-                             optimizer = optimizer,
-                             topology = topology,
-                             hierarchy_fn = hierarchy_fn,
-                             intermediate_solution_callback = intermediate_solution_callback,
-                             model_options = model_options )
+    if portfolio is not None:
+        gate_list = decompose_portfolio( utry, portfolio,
+                                         target_gate_size = target_gate_size,
+                                         hierarchy_fn = hierarchy_fn,
+                                         topology = topology,
+                                         time_limit = portfolio_time_limit,
+                                         wait_for_best = portfolio_wait_for_best,
+                                         decompose_options = {
+                                             "time_limit": time_limit,
+                                             "max_depth": max_depth
+                                         } )
+
+    else:
+        decomposer = Decomposer( utry, target_gate_size = target_gate_size,
+                                 model = model,
+                                 optimizer = optimizer,
+                                 topology = topology,
+                                 hierarchy_fn = hierarchy_fn,
+                                 intermediate_solution_callback = intermediate_solution_callback,
+                                 model_options = model_options,
+                                 checkpoint_path = checkpoint_path,
+                                 cache = cache )
+
+        if pipeline:
+            gate_iter = decomposer.decompose_iter( time_limit, max_depth )
+        else:
+            gate_list = decomposer.decompose( time_limit, max_depth, resume )
 
-    gate_list = decomposer.decompose()
+    # Fuse adjacent gates and drop gates close to the identity
+    if fuse:
+        gate_list = _fuse( gate_list, topology, fuse_tolerance )
 
     # Instantiate the small unitary gates into native code
-    instantiater = Instantiater( tool, topology, basis_gates = basis_gates )
-    qasm_list = instantiater.instantiate( gate_list )
+    if pipeline:
+        qasm_list = list( instantiater.instantiate_iter( gate_iter,
+                                                         num_workers ) )
+    else:
+        qasm_list = instantiater.instantiate( gate_list )
 
     # Recombine all small circuits into one large output
+    return _recombine( qasm_list, combiner, layout, cache, key )
+
+
+
+class _Budget():
+    """
+    Splits the budgets of synthesize among the blocks of a unitary.
+
+    Only blocks that are synthesized recursively use the budgets, see
+    _synthesize_block. Each is given the time that remains until the
+    deadline shared by the blocks still left, and an equal share of
+    the depth.
+    """
+
+    def __init__ ( self, deadline, max_depth, blocks, target_gate_size ):
+        """
+        Budget Constructor
+
+        Args:
+            deadline (None or float): The time synthesis must end by.
+
+            max_depth (None or int): The largest depth of every model.
+
+            blocks (list[tuple[tuple[int], np.ndarray]]): The location
+                and unitary of every block.
+
+            target_gate_size (int): The largest block instantiated directly.
+        """
+
+        self.deadline = deadline
+        self.target_gate_size = target_gate_size
+        self.num_blocks = sum( _is_synthesized( block, location,
+                                                target_gate_size )
+                               for location, block in blocks )
+
+        self.max_depth = max_depth
+        if max_depth is not None and self.num_blocks > 0:
+            self.max_depth = max( 1, max_depth // self.num_blocks )
+
+    def split ( self, block, location, options ):
+        """Returns the synthesize options of the next block in order."""
+        if not _is_synthesized( block, location, self.target_gate_size ):
+            return options
+
+        time_limit = None
+        if self.deadline is not None:
+            remaining = max( 0, self.deadline - time.time() )
+            time_limit = remaining / self.num_blocks
+
+        self.num_blocks -= 1
+        return dict( options, time_limit = time_limit,
+                     max_depth = self.max_depth )
+
+
+def _is_synthesized ( block, location, target_gate_size ):
+    """Returns true if _synthesize_block calls synthesize on the block."""
+    return len( location ) > target_gate_size \
+           and not factorization.is_identity( block )
+
+
+def _synthesize_block ( block, location, topology, target_gate_size,
+                        instantiater, options ):
+    """
+    Synthesizes one block of a factored or demultiplexed unitary.
+
+    Args:
+        block (np.ndarray): The block's unitary.
+
+        location (tuple[int]): The block's qubits.
+
+        topology (Topology): The topology of the whole unitary.
+
+        target_gate_size (int): The largest block instantiated directly.
+
+        instantiater (Instantiater): The instantiater of the whole unitary.
+
+        options (Dict): kwargs for synthesize.
+
+    Returns:
+        (tuple[str, tuple[int]]): The block's qasm and location.
+    """
+
+    if factorization.is_identity( block ):
+        qasm  = "OPENQASM 2.0;\n"
+        qasm += "include \"qelib1.inc\";\n"
+        qasm += "qreg q[%d];\n" % len( location )
+        return ( qasm, location )
+
+    if len( location ) == 1:
+        return ( factorization.get_u3_qasm( block ), location )
+
+    if len( location ) <= target_gate_size:
+        return instantiater.instantiate_gate( Gate( block, location ) )
+
+    coupling_graph = list( topology.get_local_subgraph( location ) )
+    qasm = synthesize( block, coupling_graph = coupling_graph, **options )
+    return ( qasm, location )
+
+
+def _fuse ( gate_list, topology, fuse_tolerance ):
+    """Fuses decomposed gates within an error budget, see synthesize."""
+    max_gate_size = max( [ g.num_qubits for g in gate_list ], default = 1 )
+    gate_list, error = fuse_gates( gate_list, max_gate_size, topology,
+                                   fuse_tolerance )
+    logger.info( "Fusion used %e of its %e error budget."
+                 % ( error, fuse_tolerance ) )
+    return gate_list
+
+
+def _use_diagonal ( utry, basis_gates ):
+    """Returns true if utry is synthesized with diagonal.synthesize_diagonal."""
+    if basis_gates is not None and "cx" not in basis_gates:
+        return False
+
+    return diagonal.is_diagonal( utry )
+
+
+def _recombine ( qasm_list, combiner, layout, cache, key ):
+    """Combines the qasm of all blocks and caches the result."""
+    if layout is not None:
+        qasm_list = [ ( qasm, tuple( layout[q] for q in location ) )
+                      for qasm, location in qasm_list ]
+
     combiner = plugins.get_combiner( combiner )()
     qasm_out = combiner.combine( qasm_list )
 
+    if key is not None:
+        cache.put( key, { "qasm": qasm_out } )
+
     return qasm_out
 
+
+async def synthesize_async ( utry, model = "PermModel",
+                             optimizer = "LBFGSOptimizer",
+                             tool = "QSearchTool", combiner = "NaiveCombiner",
+                             hierarchy_fn = default_hierarchy_fn,
+                             coupling_graph = None, basis_gates = None,
+                             intermediate_solution_callback = None,
+                             model_options = {}, time_limit = None,
+                             max_depth = None, cache = None, pool = None,
+                             max_concurrency = None, layout = None,
+                             detect_diagonal = True, fuse = False,
+                             fuse_tolerance = 1e-8 ):
+    """
+    Synthesize a unitary matrix in worker processes, see synthesize.
+
+    The event loop keeps running while the models and native tools
+    run in the pool's worker processes. Cancelling the awaiting task
+    stops the models that are being solved and drops the work that
+    has not started. Portfolios, checkpoints and pipelining are not
+    supported.
+
+    Args:
+        utry (np.ndarray): The unitary matrix to synthesize.
+
+        model (str): The model to use during decomposition.
+
+        optimizer (str): The optimizer to use during decomposition.
+
+        tool (str): The native tool to use during instantiation.
+
+        combiner (str): The combiner to use during recombination.
+
+        hierarchy_fn (callable): This function determines the
+            decomposition hierarchy.
+
+        coupling_graph (None or list[tuple[int]]): Determines the
+            connection of qubits. If none, will be set to all-to-all.
+
+        basis_gates (None or list[str]): Determines the gate set
+            for the final circuit. Only works with tools that implement
+            this feature.
+
+        intermediate_solution_callback (None or callable): Callback
+            function for intermediate solutions, called in the event
+            loop. If not None, then a function that takes in a
+            list[Gates] and returns nothing.
+
+        model_options (Dict): kwargs for model. They must be picklable.
+
+        time_limit (None or float): The number of seconds decomposition
+            may take, see synthesize.
+
+        max_depth (None or int): The largest depth of every model used
+            during decomposition, see synthesize.
+
+        cache (None or DecompositionCache): If not None, the qasm and
+            decomposition of unitaries synthesized without budgets are
+            looked up in and stored to this cache.
+
+        pool (None or WorkerPool): The worker processes to use. If None,
+            a default pool shared by all calls is used.
+
+        max_concurrency (None or int): The largest number of models or
+            native tool calls this call runs at once. If None, all
+            independent work is submitted at once.
+
+        layout (None, str or tuple[int]): The region of a larger device
+            to synthesize on, see synthesize.
+
+        detect_diagonal (bool): If true, diagonal unitaries are
+            synthesized directly, see synthesize.
+
+        fuse (bool): If true, the decomposed gates are fused before
+            instantiation, see synthesize.
+
+        fuse_tolerance (float): The error budget of fusion,
+            see synthesize.
+
+    Returns:
+        (str): Qasm code implementing utry.
+
+    Raises:
+        TypeError: If the coupling_graph is invalid.
+
+        ValueError: If the layout is invalid.
+
+        RuntimeError: If the native tool cannot be found.
+    """
+
+    if coupling_graph is not None:
+        if not utils.is_valid_coupling_graph( coupling_graph ):
+            raise TypeError( "The specified coupling graph is invalid." )
+
+    if combiner not in plugins.get_combiners():
+        raise RuntimeError( "Cannot find combiner." )
+
+    if tool not in plugins.get_native_tools():
+        raise RuntimeError( "Cannot find native tool." )
+
+    target_gate_size = plugins.get_native_tool( tool )().get_maximum_size()
+
+    num_qubits = utils.get_num_qubits( utry )
+
+    if layout is not None:
+        layout, coupling_graph = _get_layout( coupling_graph, num_qubits,
+                                              layout, hierarchy_fn( num_qubits ) )
+
+    topology = Topology( num_qubits, coupling_graph )
+
+    key = None
+    if cache is not None and time_limit is None and max_depth is None:
+        key = _get_cache_key( cache, utry, topology, target_gate_size,
+                              model = model, optimizer = optimizer,
+                              portfolio = None, tool = tool,
+                              combiner = combiner, hierarchy_fn = hierarchy_fn,
+                              basis_gates = basis_gates,
+                              model_options = model_options,
+                              layout = layout, factorize = False,
+                              detect_diagonal = detect_diagonal,
+                              demultiplex = False, fuse = fuse,
+                              fuse_tolerance = fuse_tolerance )
+
+        entry = cache.get( key )
+
+        if entry is not None:
+            return entry[ "qasm" ]
+
+    if detect_diagonal and _use_diagonal( utry, basis_gates ):
+        qasm = diagonal.synthesize_diagonal( utry, topology )
+        qasm_list = [ ( qasm, tuple( range( num_qubits ) ) ) ]
+        return _recombine( qasm_list, combiner, layout, cache, key )
+
+    decomposer = AsyncDecomposer( utry, target_gate_size = target_gate_size,
+                                  model = model,
+                                  optimizer = optimizer,
+                                  topology = topology,
+                                  hierarchy_fn = hierarchy_fn,
+                                  intermediate_solution_callback = intermediate_solution_callback,
+                                  model_options = model_options,
+                                  cache = cache,
+                                  pool = pool,
+                                  max_concurrency = max_concurrency )
+
+    gate_list = await decomposer.decompose( time_limit, max_depth )
+
+    if fuse:
+        gate_list = _fuse( gate_list, topology, fuse_tolerance )
+
+    instantiater = AsyncInstantiater( tool, topology, basis_gates = basis_gates,
+                                      pool = pool,
+                                      max_concurrency = max_concurrency )
+    qasm_list = await instantiater.instantiate( gate_list )
+
+    return _recombine( qasm_list, combiner, layout, cache, key )
@@ -6,9 +6,95 @@ A Topology determines how the qubits are connected.
 
 import numpy     as np
 import itertools as it
+import functools as ft
 
 from qfast import utils
 
+
+def _enumerate_connected_subsets ( adjmasks, size ):
+    """
+    Enumerates the connected subsets of a graph's vertices (ESU).
+
+    Every connected subset is generated exactly once, from its smallest
+    vertex, by only extending with vertices larger than it that are not
+    yet adjacent to the subset. Subsets that are not connected are never
+    visited.
+
+    Args:
+        adjmasks (List[int]): The bitmask of every vertex's neighbors.
+
+        size (int): The number of vertices in each subset.
+
+    Yields:
+        (int): The bitmask of a connected subset.
+    """
+
+    for v, adjmask in enumerate( adjmasks ):
+        larger = ~( ( 2 << v ) - 1 )
+        stack = [ ( 1 << v, adjmask & larger, adjmask | ( 1 << v ), 1 ) ]
+
+        while len( stack ) > 0:
+            sub, ext, nbrs, sub_size = stack.pop()
+
+            if sub_size == size:
+                yield sub
+                continue
+
+            while ext:
+                w_bit = ext & -ext
+                ext ^= w_bit
+                w_adjmask = adjmasks[ w_bit.bit_length() - 1 ]
+                new_ext = ext | ( w_adjmask & ~nbrs & larger )
+                stack.append( ( sub | w_bit, new_ext, nbrs | w_adjmask,
+                                sub_size + 1 ) )
+
+
+@ft.lru_cache( maxsize = 64 )
+def _get_locations ( key, gate_size ):
+    """
+    Returns the connected locations of a coupling graph.
+
+    Results are cached by coupling graph and gate size, and the least
+    recently used entries are evicted, so the cache stays bounded.
+
+    Args:
+        key (Tuple[int, frozenset[Tuple[int]]]): The number of qubits
+            and edges of the coupling graph, see Topology.key.
+
+        gate_size (int): The size of each location.
+
+    Returns:
+        (Tuple[Tuple[int]]): The sorted connected locations.
+    """
+
+    num_qubits, edges = key
+    adjmasks = [ 0 for i in range( num_qubits ) ]
+    for q0, q1 in edges:
+        adjmasks[q0] |= 1 << q1
+        adjmasks[q1] |= 1 << q0
+
+    masks = _enumerate_connected_subsets( adjmasks, gate_size )
+    return tuple( sorted( _get_location( mask ) for mask in masks ) )
+
+
+def _get_mask ( location ):
+    """Returns the bitmask of the qubits in a location."""
+    mask = 0
+    for q in location:
+        mask |= 1 << q
+    return mask
+
+
+def _get_location ( mask ):
+    """Returns the sorted qubits in a location bitmask."""
+    location = []
+    while mask:
+        bit = mask & -mask
+        location.append( bit.bit_length() - 1 )
+        mask ^= bit
+    return tuple( location )
+
+
 class Topology:
     """The Topology Class."""
 
@@ -36,11 +122,18 @@ class Topology:
         self.coupling_graph = coupling_graph
         self.num_qubits = num_qubits
         self.cache = {}
+        self.subgraphs = {}
 
         self.adjlist = [ [] for i in range( self.num_qubits ) ]
+        self.adjmasks = [ 0 for i in range( self.num_qubits ) ]
         for q0, q1 in coupling_graph:
             self.adjlist[q0].append( q1 )
             self.adjlist[q1].append( q0 )
+            self.adjmasks[q0] |= 1 << q1
+            self.adjmasks[q1] |= 1 << q0
+
+        self.key = ( num_qubits, frozenset( tuple( sorted( edge ) )
+                                            for edge in coupling_graph ) )
 
     def get_locations ( self, gate_size ):
         """
@@ -50,6 +143,10 @@ class Topology:
         included if each pair of qubits is directly connected or connected
         through other qubits in the location.
 
+        Only connected locations are generated, so sparse topologies
+        with many qubits are cheap. Results of recently used coupling
+        graphs are shared by every Topology with the same graph.
+
         Args:
             gate_size (int): The size of each location in the final list.
 
@@ -68,27 +165,127 @@ class Topology:
 
         if gate_size in self.cache:
             return self.cache[ gate_size ]
-        
-        locations = []
 
-        for group in it.combinations( range( self.num_qubits ), gate_size ):
-            # Depth First Search
-            seen = set( [ group[0] ] )
-            frontier = [ group[0] ]
+        locations = list( _get_locations( self.key, gate_size ) )
+        self.cache[ gate_size ] = locations
+        return locations
+
+    def select_layout ( self, num_qubits, gate_size = 2 ):
+        """
+        Selects the best connected region of num_qubits qubits.
 
-            while len( frontier ) > 0 and len( seen ) < len( group ):
-                for q in group:
-                    if frontier[0] in self.adjlist[q] and q not in seen:
-                        seen.add( q )
-                        frontier.append( q )
+        Regions are ranked by how many gate_size locations they contain,
+        which is how many places a model on the region can put its
+        gates, and then by how many couplings they contain. Ties go to
+        the region that comes first in get_locations.
 
-                frontier = frontier[1:]
+        Args:
+            num_qubits (int): The number of qubits in the region.
 
-            if len( seen ) == len( group ):
-                locations.append( group )
+            gate_size (int): The size of the gates placed in the region.
 
-        self.cache[ gate_size ] = locations
-        return locations
+        Returns:
+            (Tuple[int]): The sorted qubits of the best region.
+
+        Raises:
+            ValueError: If num_qubits or gate_size is invalid, or no
+                connected region of num_qubits qubits exists.
+        """
+
+        if gate_size > num_qubits:
+            raise ValueError( "The gate_size is too large." )
+
+        regions = self.get_locations( num_qubits )
+
+        if len( regions ) == 0:
+            raise ValueError( "No connected region has %d qubits."
+                              % num_qubits )
+
+        best_score = None
+        best_region = None
+
+        for region in regions:
+            adjmasks = [ sum( 1 << i for i, q1 in enumerate( region )
+                              if self.adjmasks[ q0 ] >> q1 & 1 )
+                         for q0 in region ]
+
+            locations = _enumerate_connected_subsets( adjmasks, gate_size )
+            score = ( sum( 1 for _ in locations ),
+                      sum( bin( adjmask ).count( "1" ) for adjmask in adjmasks ) )
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best_region = region
+
+        return best_region
+
+    def is_connected ( self, location ):
+        """
+        Returns true if the qubits in location are connected.
+
+        Qubits are connected directly or through other qubits in
+        location, qubits outside of location are not used.
+
+        Args:
+            location (Tuple[int]): The qubits to check.
+
+        Returns:
+            (bool): If location's subgraph is connected.
+        """
+
+        mask = _get_mask( location )
+        seen = mask & -mask
+
+        while True:
+            reach = seen
+            for q in _get_location( seen ):
+                reach |= self.adjmasks[ q ] & mask
+
+            if reach == seen:
+                return seen == mask
+
+            seen = reach
+
+    def get_local_subgraph ( self, location ):
+        """
+        Returns the coupling graph within location, in location's qubits.
+
+        The pair (i, j) means that location[i] and location[j] are
+        coupled, with i < j. Subgraphs are indexed by the bitmask of
+        their qubits the first time they are requested, so repeated
+        lookups take constant time.
+
+        Args:
+            location (Tuple[int]): The qubits of the subgraph.
+
+        Returns:
+            (List[Tuple[int]]): The renumbered subgraph. It is shared
+                and must not be modified.
+        """
+
+        subgraph = self.index_subgraph( location )
+
+        if all( q0 < q1 for q0, q1 in zip( location, location[1:] ) ):
+            return subgraph
+
+        # The index is numbered by the sorted qubits
+        order = sorted( location )
+        index = [ location.index( q ) for q in order ]
+        return [ tuple( sorted( ( index[i], index[j] ) ) )
+                 for i, j in subgraph ]
+
+    def index_subgraph ( self, location ):
+        """Returns the indexed subgraph of location's sorted qubits."""
+        mask = _get_mask( location )
+
+        if mask not in self.subgraphs:
+            qubits = _get_location( mask )
+            self.subgraphs[ mask ] = [ ( i, j )
+                                       for i, q0 in enumerate( qubits )
+                                       for j, q1 in enumerate( qubits )
+                                       if i < j and self.adjmasks[ q0 ] >> q1 & 1 ]
+
+        return self.subgraphs[ mask ]
 
     def get_subgraph ( self, location ):
         """Returns the sub_coupling_graph with qubits in location."""
@@ -327,6 +327,67 @@ def softmax ( x, beta = 20 ):
     return exps / np.sum(exps)
 
 
+def partial_trace ( M, location ):
+    """
+    Traces out all qubits of M except those in location.
+
+    Args:
+        M (np.ndarray): The matrix to trace, acting on all qubits.
+
+        location (Tuple[int]): The qubits to keep. The reduced matrix
+            acts on these qubits in the order given.
+
+    Returns:
+        (np.ndarray): The reduced matrix.
+
+    Raises:
+        TypeError: If M is not a square matrix or location is invalid.
+    """
+
+    num_qubits = get_num_qubits( M )
+
+    if not is_valid_location( location, num_qubits ):
+        raise TypeError( "Invalid location." )
+
+    others = [ q for q in range( num_qubits ) if q not in location ]
+    order = list( location ) + others
+
+    T = M.reshape( [ 2 ] * ( 2 * num_qubits ) )
+    T = T.transpose( order + [ num_qubits + q for q in order ] )
+
+    dim_in = 2 ** len( location )
+    dim_out = 2 ** len( others )
+    T = T.reshape( ( dim_in, dim_out, dim_in, dim_out ) )
+    return np.einsum( "ajbj->ab", T )
+
+
+def hilbert_schmidt_distance ( U, V ):
+    """
+    Calculates the Hilbert-Schmidt based distance between U and V.
+
+    This is the distance models use to measure success. It ignores
+    global phase.
+
+    Args:
+        U (np.ndarray): The first unitary.
+
+        V (np.ndarray): The second unitary.
+
+    Returns:
+        (float): The distance 1 - |tr( U^dagger V )| / N.
+
+    Raises:
+        ValueError: If U and V have different shapes.
+    """
+
+    if U.shape != V.shape:
+        raise ValueError( "U and V must have the same shape." )
+
+    num = np.abs( np.trace( U.conj().T @ V ) )
+    dem = U.shape[0]
+    return 1 - ( num / dem )
+
+
 def closest_unitary ( A ):
     """
     Calculate the closest unitary to a given matrix.
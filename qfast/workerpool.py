@@ -0,0 +1,111 @@
+"""
+This module implements the WorkerPool class.
+
+A WorkerPool runs CPU-bound synthesis work in separate processes on
+behalf of asyncio coroutines, see synthesize_async.
+"""
+
+import os
+import atexit
+import asyncio
+import multiprocessing as mp
+import concurrent.futures as cf
+
+import logging
+logger = logging.getLogger( "qfast" )
+
+
+class WorkerPool():
+    """The WorkerPool Class."""
+
+    def __init__ ( self, num_workers = None ):
+        """
+        Starts a pool of worker processes.
+
+        Args:
+            num_workers (None or int): The number of worker processes.
+                If None, it defaults to the number of processors on
+                the machine.
+        """
+
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.executor = cf.ProcessPoolExecutor( self.num_workers )
+        self.manager = mp.Manager()
+
+        logger.debug( "Started worker pool." )
+
+    def create_event ( self ):
+        """
+        Returns an Event that can be sent to the worker processes.
+
+        Jobs that are given the Event stop once it is set, see
+        CircuitModel.budget_exhausted.
+        """
+
+        return self.manager.Event()
+
+    async def run ( self, cancel_event, fn, *args ):
+        """
+        Runs fn( *args ) in a worker process.
+
+        If the awaiting task is cancelled, the job is removed from the
+        pool if it has not started yet, and cancel_event is set to
+        stop it otherwise.
+
+        Args:
+            cancel_event (None or Event): The Event of the job's call,
+                see create_event.
+
+            fn (callable): The picklable function to run.
+
+            args (tuple): The picklable arguments of fn.
+
+        Returns:
+            (object): The result of fn.
+        """
+
+        future = self.executor.submit( fn, *args )
+
+        try:
+            return await asyncio.wrap_future( future )
+
+        except asyncio.CancelledError:
+            if not future.cancel() and cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    def shutdown ( self ):
+        """Stops the worker processes once their jobs are finished."""
+        self.executor.shutdown()
+        self.manager.shutdown()
+
+    def __enter__ ( self ):
+        return self
+
+    def __exit__ ( self, exc_type, exc_value, traceback ):
+        self.shutdown()
+
+
+_default_pool = None
+
+
+def get_default_pool ( ):
+    """Returns the WorkerPool shared by calls that are not given one."""
+    global _default_pool
+
+    if _default_pool is None:
+        _default_pool = WorkerPool()
+        atexit.register( _shutdown_default_pool )
+
+    return _default_pool
+
+
+def _shutdown_default_pool ( ):
+    """Shuts down the shared WorkerPool, see get_default_pool."""
+    global _default_pool
+
+    if _default_pool is not None:
+        _default_pool.shutdown()
+        _default_pool = None
+
+    atexit.unregister( _shutdown_default_pool )
@@ -0,0 +1,47 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.workerpool import WorkerPool
+from qfast.batch import synthesize_many, submit_many
+
+
+class TestSynthesizeMany ( ut.TestCase ):
+
+    CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                       [ 0, 1, 0, 0 ],
+                       [ 0, 0, 0, 1 ],
+                       [ 0, 0, 1, 0 ] ], dtype = np.complex128 )
+
+    @classmethod
+    def setUpClass ( cls ):
+        cls.pool = WorkerPool( 2 )
+
+    @classmethod
+    def tearDownClass ( cls ):
+        cls.pool.shutdown()
+
+    def test_synthesize_many_invalid ( self ):
+        self.assertRaises( ValueError, submit_many, [ self.CNOT ],
+                           pool = self.pool, max_in_flight = 0 )
+
+    def test_synthesize_many ( self ):
+        utrys = [ np.kron( self.CNOT, np.identity( 2 ) ),
+                  np.kron( np.identity( 2 ), self.CNOT ) ]
+        results = dict( synthesize_many( utrys, pool = self.pool,
+                                         max_in_flight = 1 ) )
+
+        self.assertEqual( sorted( results.keys() ), [ 0, 1 ] )
+
+        for qasm in results.values():
+            self.assertTrue( "OPENQASM" in qasm )
+            self.assertTrue( "cx" in qasm )
+
+    def test_synthesize_many_futures ( self ):
+        utry = np.kron( np.identity( 2 ), self.CNOT )
+        futures = submit_many( [ utry ], pool = self.pool )
+        self.assertEqual( len( futures ), 1 )
+        self.assertTrue( "OPENQASM" in futures[0].result() )
+
+
+if __name__ == '__main__':
+    ut.main()
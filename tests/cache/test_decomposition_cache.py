@@ -0,0 +1,84 @@
+import os
+import time
+import tempfile
+import numpy    as np
+import unittest as ut
+
+from qfast.cache import DecompositionCache
+from qfast.decomposition.decomposer import Decomposer
+
+
+class TestDecompositionCache ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def setUp ( self ):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DecompositionCache( self.directory.name )
+
+    def tearDown ( self ):
+        self.directory.cleanup()
+
+    def test_decomposition_cache_invalid ( self ):
+        self.assertRaises( ValueError, DecompositionCache,
+                           self.directory.name, max_size = 0 )
+        self.assertRaises( ValueError, DecompositionCache,
+                           self.directory.name, tol = 0 )
+
+    def test_decomposition_cache_key_phase ( self ):
+        key = self.cache.get_key( self.TOFFOLI, model = "PermModel" )
+        phased = np.exp( 1.2j ) * self.TOFFOLI
+        self.assertEqual( key, self.cache.get_key( phased,
+                                                   model = "PermModel" ) )
+        noisy = self.TOFFOLI + 1e-12
+        self.assertEqual( key, self.cache.get_key( noisy,
+                                                   model = "PermModel" ) )
+
+    def test_decomposition_cache_key_config ( self ):
+        key = self.cache.get_key( self.TOFFOLI, model = "PermModel",
+                                  model_options = { "beta": 1 } )
+        self.assertNotEqual( key, self.cache.get_key( self.TOFFOLI,
+                                                      model = "FixedModel" ) )
+        self.assertNotEqual( key, self.cache.get_key( np.identity( 8 ),
+                                                      model = "PermModel" ) )
+        options = { "beta": 1, "partial_solution_callback": print }
+        self.assertEqual( key, self.cache.get_key( self.TOFFOLI,
+                                                   model = "PermModel",
+                                                   model_options = options ) )
+
+    def test_decomposition_cache_get_put ( self ):
+        self.assertIsNone( self.cache.get( "a" ) )
+        self.cache.put( "a", [ 1, 2 ] )
+        self.assertEqual( self.cache.get( "a" ), [ 1, 2 ] )
+        self.cache.put( "a", [ 3 ] )
+        self.assertEqual( self.cache.get( "a" ), [ 3 ] )
+
+    def test_decomposition_cache_evict ( self ):
+        cache = DecompositionCache( self.directory.name, max_size = 2500 )
+        cache.put( "a", np.zeros( 100 ) )
+        cache.put( "b", np.zeros( 100 ) )
+        os.utime( cache.get_path( "a" ), ( 1, 1 ) )
+        cache.get( "b" )
+        cache.put( "c", np.zeros( 100 ) )
+        cache.put( "d", np.zeros( 100 ) )
+        self.assertIsNone( cache.get( "a" ) )
+        self.assertIsNotNone( cache.get( "d" ) )
+
+    def test_decomposition_cache_decomposer ( self ):
+        decomposer = Decomposer( self.TOFFOLI, cache = self.cache )
+        gate_list = decomposer.decompose()
+
+        start = time.time()
+        decomposer = Decomposer( self.TOFFOLI, cache = self.cache )
+        cached_gate_list = decomposer.decompose()
+        self.assertTrue( time.time() - start < 1 )
+
+        self.assertEqual( len( gate_list ), len( cached_gate_list ) )
+        for gate, cached_gate in zip( gate_list, cached_gate_list ):
+            self.assertEqual( gate.location, cached_gate.location )
+            self.assertTrue( np.allclose( gate.utry, cached_gate.utry ) )
+
+
+if __name__ == '__main__':
+    ut.main()
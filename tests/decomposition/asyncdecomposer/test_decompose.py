@@ -0,0 +1,66 @@
+import time
+import asyncio
+import numpy    as np
+import unittest as ut
+
+from qfast.topology import Topology
+from qfast.workerpool import WorkerPool
+from qfast.decomposition.asyncdecomposer import AsyncDecomposer
+
+class TestAsyncDecomposerDecompose ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    @classmethod
+    def setUpClass ( cls ):
+        cls.pool = WorkerPool( 1 )
+
+    @classmethod
+    def tearDownClass ( cls ):
+        cls.pool.shutdown()
+
+    def test_async_decomposer_decompose_invalid ( self ):
+        self.assertRaises( ValueError, AsyncDecomposer, self.TOFFOLI,
+                           pool = self.pool, max_concurrency = 0 )
+
+    def test_async_decomposer_decompose ( self ):
+        decomposer = AsyncDecomposer( self.TOFFOLI, pool = self.pool )
+        gate_list = asyncio.run( decomposer.decompose() )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-3 )
+
+    def test_async_decomposer_decompose_topology ( self ):
+        topology = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+        utry = np.kron( self.TOFFOLI, np.identity( 2 ) )
+        decomposer = AsyncDecomposer( utry, 2, hierarchy_fn = lambda x : 3 if x > 3 else 2,
+                                      topology = topology, pool = self.pool,
+                                      max_concurrency = 1 )
+        gate_list = asyncio.run( decomposer.decompose() )
+        self.assertTrue( all( gate.location in topology.get_locations( 2 )
+                              for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-2 )
+
+    def test_async_decomposer_decompose_cancel ( self ):
+        utry = np.linalg.qr( np.random.randn( 32, 32 )
+                             + 1j * np.random.randn( 32, 32 ) )[0]
+        decomposer = AsyncDecomposer( utry, pool = self.pool )
+
+        async def cancel ( ):
+            task = asyncio.ensure_future( decomposer.decompose() )
+            await asyncio.sleep( 1 )
+            task.cancel()
+
+            with self.assertRaises( asyncio.CancelledError ):
+                await task
+
+            # The only worker must be free again soon
+            start = time.time()
+            await AsyncDecomposer( self.TOFFOLI, pool = self.pool ).decompose()
+            return time.time() - start
+
+        self.assertTrue( asyncio.run( cancel() ) < 30 )
+
+
+if __name__ == '__main__':
+    ut.main()
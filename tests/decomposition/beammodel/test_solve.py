@@ -0,0 +1,62 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.beammodel import BeamModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestBeamModelSolve ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def get_model ( self, utry, **options ):
+        locations = Topology( 3 ).get_locations( 2 )
+        return BeamModel( utry, 2, locations, LBFGSOptimizer(),
+                          num_workers = 1, **options )
+
+    def test_beammodel_solve ( self ):
+        model = self.get_model( self.TOFFOLI, beam_width = 2 )
+        gate_list = model.solve()
+
+        self.assertTrue( model.distance() < model.success_threshold )
+        self.assertEqual( len( gate_list ), model.depth() )
+
+    def test_beammodel_solve_beam_width ( self ):
+        model = self.get_model( unitary_group.rvs( 8 ), beam_width = 2 )
+        model.solve( max_depth = 3 )
+
+        self.assertTrue( 0 < len( model.beam ) <= 2 )
+        self.assertTrue( all( member.depth() == model.depth()
+                              for member in model.beam ) )
+
+    def test_beammodel_solve_no_repeats ( self ):
+        model = self.get_model( unitary_group.rvs( 8 ), beam_width = 3 )
+        model.solve( max_depth = 3 )
+
+        for member in model.beam:
+            for location1, location2 in zip( member.structure,
+                                             member.structure[1:] ):
+                self.assertNotEqual( location1, location2 )
+
+    def test_beammodel_expand ( self ):
+        model = self.get_model( unitary_group.rvs( 8 ) )
+        member = model.make_candidate( [ (0, 1) ], np.array( [] ) )
+        children = model.expand( member )
+
+        self.assertEqual( len( children ), len( model.locations ) - 1 )
+        self.assertTrue( all( structure[0] == (0, 1) and structure[1] != (0, 1)
+                              for structure, _ in children ) )
+
+    def test_beammodel_invalid ( self ):
+        self.assertRaises( ValueError, self.get_model, self.TOFFOLI,
+                           beam_width = 0 )
+        self.assertRaises( ValueError, self.get_model, self.TOFFOLI,
+                           branch_factor = 0 )
+
+
+if __name__ == '__main__':
+    ut.main()
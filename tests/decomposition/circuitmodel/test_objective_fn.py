@@ -0,0 +1,71 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.fixedmodel import FixedModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestCircuitModelObjectiveFn ( ut.TestCase ):
+
+    def setUp ( self ):
+        self.rng = np.random.default_rng( 11 )
+        self.utry = unitary_group.rvs( 8, random_state = 11 )
+        self.locations = Topology( 3 ).get_locations( 2 )
+
+    def get_model ( self, utry, objective ):
+        return FixedModel( utry, 2, self.locations, LBFGSOptimizer(),
+                           structure = [ (0, 1), (1, 2) ],
+                           objective = objective )
+
+    def get_finite_differences ( self, model, x, eps = 1e-6 ):
+        grad = []
+
+        for i in range( len( x ) ):
+            step = np.zeros( len( x ) )
+            step[i] = eps
+            upper, _ = model.objective_fn( x + step )
+            lower, _ = model.objective_fn( x - step )
+            grad.append( ( upper - lower ) / ( 2 * eps ) )
+
+        return np.array( grad )
+
+    def test_objective_fn_gradient ( self ):
+        for objective in [ "trace", "phase_invariant" ]:
+            model = self.get_model( self.utry, objective )
+            x = self.rng.random( len( model.x ) )
+
+            _, jacs = model.objective_fn( x )
+            grad = self.get_finite_differences( model, x )
+
+            self.assertTrue( np.allclose( jacs, grad, atol = 1e-6 ) )
+
+    def test_objective_fn_phase_invariant ( self ):
+        phased = np.exp( 0.7j ) * self.utry
+        model = self.get_model( self.utry, "phase_invariant" )
+        phased_model = self.get_model( phased, "phase_invariant" )
+        x = self.rng.random( len( model.x ) )
+
+        obj, jacs = model.objective_fn( x )
+        phased_obj, phased_jacs = phased_model.objective_fn( x )
+
+        self.assertTrue( np.isclose( obj, phased_obj ) )
+        self.assertTrue( np.allclose( jacs, phased_jacs ) )
+
+    def test_objective_fn_phase_invariant_minimum ( self ):
+        # A circuit equal to the target up to phase is a global minimum
+        model = self.get_model( self.utry, "phase_invariant" )
+        x = self.rng.random( len( model.x ) )
+        M, _ = model.get_matrix_and_derivatives( x )
+        phased_model = self.get_model( np.exp( 1.3j ) * M, "phase_invariant" )
+
+        obj, jacs = phased_model.objective_fn( x )
+
+        self.assertTrue( np.isclose( obj, 0 ) )
+        self.assertTrue( np.allclose( jacs, 0 ) )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,44 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition import circuitmodel
+from qfast.decomposition.circuitmodel import optimize_models
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestOptimizeModels ( ut.TestCase ):
+
+    def get_models ( self, num_models ):
+        locations = Topology( 3 ).get_locations( 2 )
+        models = []
+
+        for i in range( num_models ):
+            utry = unitary_group.rvs( 8, random_state = i )
+            model = PermModel( utry, 2, locations, LBFGSOptimizer() )
+            model.x = np.random.default_rng( i ).random( len( model.x ) )
+            models.append( model )
+
+        return models
+
+    def test_optimize_models_parallel ( self ):
+        serial = optimize_models( self.get_models( 3 ), 1 )
+        parallel = optimize_models( self.get_models( 3 ), 2 )
+
+        for model, other in zip( serial, parallel ):
+            self.assertTrue( np.allclose( model.x, other.x ) )
+
+    def test_optimize_models_reuses_pool ( self ):
+        optimize_models( self.get_models( 2 ), 2 )
+        pool = circuitmodel._get_executor( 2 )
+
+        optimize_models( self.get_models( 2 ), 2 )
+        self.assertIs( circuitmodel._get_executor( 2 ), pool )
+        self.assertIsNot( circuitmodel._get_executor( 3 ), pool )
+
+
+if __name__ == '__main__':
+    ut.main()
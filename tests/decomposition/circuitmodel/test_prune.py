@@ -0,0 +1,84 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.fixedmodel import FixedModel
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.models.softpauli.softpaulimodel import SoftPauliModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestCircuitModelPrune ( ut.TestCase ):
+
+    def get_model ( self ):
+        # Only the first gate is needed
+        utry = np.kron( unitary_group.rvs( 4, random_state = 5 ),
+                        np.identity( 2 ) )
+        locations = Topology( 3 ).get_locations( 2 )
+        model = FixedModel( utry, 2, locations, LBFGSOptimizer(),
+                            structure = [ (0, 1), (1, 2), (0, 2) ] )
+        model.x = np.random.default_rng( 5 ).random( len( model.x ) )
+        return model
+
+    def test_circuitmodel_remove_gate ( self ):
+        model = self.get_model()
+        x = np.copy( model.x )
+
+        gate = model.remove_gate( 1 )
+
+        self.assertEqual( gate.location, (1, 2) )
+        self.assertEqual( [ g.location for g in model.gates ], [ (0, 1), (0, 2) ] )
+        self.assertEqual( model.param_ranges, [ 0, 16, 32 ] )
+        self.assertTrue( np.allclose( model.x, np.concatenate( ( x[:16], x[32:] ) ) ) )
+
+    def test_circuitmodel_prune ( self ):
+        model = self.get_model()
+        model.solve()
+        self.assertTrue( model.distance() < model.success_threshold )
+
+        num_removed = model.prune()
+
+        self.assertEqual( num_removed, 2 )
+        self.assertEqual( model.depth(), 1 )
+        self.assertTrue( model.distance() < model.success_threshold )
+
+    def test_circuitmodel_prune_max_attempts ( self ):
+        model = self.get_model()
+        model.solve()
+
+        self.assertTrue( model.prune( max_attempts = 1 ) <= 1 )
+        self.assertTrue( model.depth() >= 2 )
+        self.assertTrue( model.distance() < model.success_threshold )
+
+    def test_circuitmodel_prune_unsolved ( self ):
+        model = self.get_model()
+        self.assertEqual( model.prune(), 0 )
+        self.assertEqual( model.depth(), 3 )
+
+    def test_circuitmodel_prune_head_models ( self ):
+        utry = np.kron( unitary_group.rvs( 4, random_state = 5 ),
+                        np.identity( 2 ) )
+        locations = Topology( 3 ).get_locations( 2 )
+
+        for model_class in [ PermModel, SoftPauliModel ]:
+            for pruning in [ False, True ]:
+                model = model_class( utry, 2, locations, LBFGSOptimizer(),
+                                     initialization = "residual",
+                                     pruning = pruning )
+                model.start_budget()
+                model.reset_input()
+
+                # An unneeded gate in front of the head
+                model.expand( (1, 2) )
+                model.reset_input()
+                model.optimize()
+
+                gate_list = model.finalize()
+                self.assertTrue( model.distance() < model.success_threshold )
+                self.assertEqual( len( gate_list ), 1 if pruning else 2 )
+
+
+if __name__ == '__main__':
+    ut.main()
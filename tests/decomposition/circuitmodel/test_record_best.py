@@ -0,0 +1,56 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestCircuitModelRecordBest ( ut.TestCase ):
+
+    def get_model ( self ):
+        # A cold softmax blends the head's locations
+        utry = unitary_group.rvs( 8, random_state = 13 )
+        locations = Topology( 3 ).get_locations( 2 )
+        model = PermModel( utry, 2, locations, LBFGSOptimizer(),
+                           softmax_beta = 0.1 )
+        model.start_budget()
+        model.reset_input()
+        model.x = np.random.default_rng( 13 ).random( len( model.x ) )
+        return model
+
+    def test_record_best_hardened_distance ( self ):
+        model = self.get_model()
+        model.record_best()
+
+        distance = model.get_distance( model.best_gate_list )
+        self.assertFalse( np.isclose( model.distance(), distance ) )
+        self.assertTrue( np.isclose( model.best_distance, distance ) )
+
+    def test_record_best_keeps_closest ( self ):
+        model = self.get_model()
+        model.record_best()
+        best_gate_list = model.best_gate_list
+        best_distance = model.best_distance
+
+        # An identity head is further from the target
+        model.x = np.zeros( len( model.x ) )
+        self.assertTrue( model.get_distance( model.get_gate_list() )
+                         > best_distance )
+
+        model.record_best()
+        self.assertIs( model.best_gate_list, best_gate_list )
+        self.assertEqual( model.best_distance, best_distance )
+
+    def test_record_solution ( self ):
+        model = self.get_model()
+        gate_list = model.get_gate_list()
+        self.assertIs( model.record_solution( gate_list ), gate_list )
+        self.assertTrue( np.isclose( model.best_distance,
+                                     model.get_distance( gate_list ) ) )
+
+
+if __name__ == '__main__':
+    ut.main()
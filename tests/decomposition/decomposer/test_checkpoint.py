@@ -0,0 +1,82 @@
+import os
+import pickle
+import tempfile
+import numpy    as np
+import unittest as ut
+
+from qfast.decomposition.decomposer import Decomposer
+
+class Interrupt ( Exception ):
+    pass
+
+class TestDecomposerCheckpoint ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def setUp ( self ):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join( self.directory.name, "qfast.ckpt" )
+
+    def tearDown ( self ):
+        self.directory.cleanup()
+
+    def interrupt_after ( self, num_calls ):
+        calls = []
+
+        def callback ( gate_list ):
+            calls.append( gate_list )
+            if len( calls ) >= num_calls:
+                raise Interrupt()
+
+        return callback
+
+    def test_decomposer_checkpoint_resume ( self ):
+        options = { "partial_solution_callback": self.interrupt_after( 3 ) }
+        decomposer = Decomposer( self.TOFFOLI, model_options = options,
+                                 checkpoint_path = self.path,
+                                 checkpoint_interval = 0 )
+        self.assertRaises( Interrupt, decomposer.decompose )
+
+        with open( self.path, "rb" ) as f:
+            state = pickle.load( f )
+
+        self.assertEqual( state[ "index" ], 0 )
+        self.assertTrue( len( state[ "model_state" ][ "structure" ] ) > 0 )
+
+        decomposer = Decomposer( self.TOFFOLI, checkpoint_path = self.path )
+        gate_list = decomposer.decompose( resume = True )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-3 )
+
+        with open( self.path, "rb" ) as f:
+            state = pickle.load( f )
+
+        self.assertEqual( state[ "index" ], 1 )
+        self.assertEqual( len( state[ "new_gate_list" ] ), len( gate_list ) )
+
+    def test_decomposer_checkpoint_invalid ( self ):
+        decomposer = Decomposer( self.TOFFOLI, checkpoint_path = self.path )
+        decomposer.decompose()
+
+        other = Decomposer( np.identity( 8 ), checkpoint_path = self.path )
+        self.assertRaises( ValueError, other.decompose, resume = True )
+
+        other = Decomposer( self.TOFFOLI, model = "SoftPauliModel",
+                            checkpoint_path = self.path )
+        self.assertRaises( ValueError, other.decompose, resume = True )
+
+    def test_decomposer_checkpoint_unsupported ( self ):
+        for model in [ "BeamModel", "QSDModel" ]:
+            self.assertRaises( ValueError, Decomposer, self.TOFFOLI,
+                               model = model, checkpoint_path = self.path )
+
+        self.assertFalse( os.path.exists( self.path ) )
+
+        for model in [ "PermModel", "SoftPauliModel", "FixedModel" ]:
+            Decomposer( self.TOFFOLI, model = model,
+                        checkpoint_path = self.path )
+
+
+if __name__ == '__main__':
+    ut.main()
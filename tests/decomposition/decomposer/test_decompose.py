@@ -0,0 +1,43 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.topology import Topology
+from qfast.decomposition.decomposer import Decomposer
+
+class TestDecomposerDecompose ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def test_decomposer_decompose ( self ):
+        decomposer = Decomposer( self.TOFFOLI )
+        gate_list = decomposer.decompose()
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-3 )
+
+    def test_decomposer_decompose_max_depth ( self ):
+        decomposer = Decomposer( self.TOFFOLI )
+        gate_list = decomposer.decompose( max_depth = 2 )
+        self.assertTrue( len( gate_list ) <= 2 )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+        self.assertTrue( decomposer.distance > 1e-3 )
+
+    def test_decomposer_decompose_time_limit ( self ):
+        decomposer = Decomposer( self.TOFFOLI )
+        gate_list = decomposer.decompose( time_limit = 0 )
+        self.assertTrue( len( gate_list ) > 0 )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+
+    def test_decomposer_decompose_topology ( self ):
+        topology = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+        utry = np.kron( self.TOFFOLI, np.identity( 2 ) )
+        decomposer = Decomposer( utry, 2, hierarchy_fn = lambda x : 3 if x > 3 else 2,
+                                 topology = topology )
+        gate_list = decomposer.decompose()
+        self.assertTrue( all( gate.location in topology.get_locations( 2 )
+                              for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-2 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,43 @@
+import numpy     as np
+import unittest  as ut
+import functools as ft
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.decomposition.decomposer import Decomposer
+
+
+class TestDecomposerDecomposeGate ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def setUp ( self ):
+        # The gate's unitary differs from the decomposer's unitary
+        self.topology = Topology( 5, [ (0, 1), (1, 2), (2, 3), (3, 4), (0, 4) ] )
+        self.decomposer = Decomposer( np.identity( 32 ), 2,
+                                      topology = self.topology )
+        self.gate = Gate( self.TOFFOLI, (1, 2, 3) )
+
+    def test_decomposer_get_gate_model ( self ):
+        model = self.decomposer.get_gate_model( self.gate )
+        self.assertTrue( np.allclose( model.utry, self.TOFFOLI ) )
+        self.assertEqual( model.num_qubits, 3 )
+        self.assertEqual( sorted( model.locations ), [ (0, 1), (1, 2) ] )
+
+    def test_decomposer_decompose_gate ( self ):
+        gate_list = self.decomposer.decompose_gate( self.gate )
+
+        self.assertTrue( all( g.location in [ (1, 2), (2, 3) ]
+                              for g in gate_list ) )
+
+        relative = [ Gate( g.utry, tuple( q - 1 for q in g.location ) )
+                     for g in gate_list ]
+        matrices = [ g.get_circuit_matrix( 3 ) for g in relative ]
+        M = ft.reduce( np.matmul, reversed( matrices ) )
+        self.assertTrue( utils.hilbert_schmidt_distance( self.TOFFOLI, M ) < 1e-2 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,43 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.decomposition.decomposer import Decomposer
+
+class TestDecomposerDecomposeIter ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def test_decomposer_decompose_iter ( self ):
+        utry = np.kron( self.TOFFOLI, np.identity( 2 ) )
+        hierarchy_fn = lambda x : 3 if x > 3 else 2
+
+        np.random.seed( 5 )
+        decomposer = Decomposer( utry, hierarchy_fn = hierarchy_fn )
+        gate_list = decomposer.decompose()
+
+        np.random.seed( 5 )
+        decomposer = Decomposer( utry, hierarchy_fn = hierarchy_fn )
+        iterator = decomposer.decompose_iter()
+        positions, iter_gate_list = zip( *iterator )
+
+        self.assertEqual( list( positions ), list( range( len( gate_list ) ) ) )
+        self.assertEqual( len( iter_gate_list ), len( gate_list ) )
+
+        for gate, iter_gate in zip( gate_list, iter_gate_list ):
+            self.assertEqual( gate.location, iter_gate.location )
+            self.assertTrue( np.allclose( gate.utry, iter_gate.utry ) )
+
+        self.assertTrue( decomposer.distance < 1e-2 )
+
+    def test_decomposer_decompose_iter_lazy ( self ):
+        decomposer = Decomposer( self.TOFFOLI )
+        iterator = decomposer.decompose_iter()
+        position, gate = next( iterator )
+        self.assertEqual( position, 0 )
+        self.assertEqual( gate.num_qubits, 2 )
+        self.assertFalse( hasattr( decomposer, "distance" ) )
+
+
+if __name__ == '__main__':
+    ut.main()
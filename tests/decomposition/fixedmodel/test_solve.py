@@ -0,0 +1,92 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.decomposition.models.fixedmodel import FixedModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestFixedModelSolve ( ut.TestCase ):
+
+    STRUCTURE = [ (0, 1), (1, 2) ]
+
+    def setUp ( self ):
+        # Three repetitions of the structure implement the target
+        self.utry = np.identity( 8 )
+        for i in range( 3 * len( self.STRUCTURE ) ):
+            utry = unitary_group.rvs( 4, random_state = i )
+            location = self.STRUCTURE[ i % len( self.STRUCTURE ) ]
+            self.utry = Gate( utry, location ).get_circuit_matrix( 3 ) @ self.utry
+
+        self.locations = Topology( 3 ).get_locations( 2 )
+
+    def get_model ( self, optimizer = None, **kwargs ):
+        return FixedModel( self.utry, 2, self.locations,
+                           optimizer or LBFGSOptimizer(),
+                           structure = self.STRUCTURE, repeat = True,
+                           **kwargs )
+
+    def test_fixedmodel_bisect_matches_linear ( self ):
+        linear = self.get_model( depth_search = "linear" )
+        linear_gates = linear.solve()
+
+        bisect = self.get_model( depth_search = "bisect" )
+        bisect_gates = bisect.solve()
+
+        self.assertEqual( len( linear_gates ), 6 )
+        self.assertEqual( len( bisect_gates ), len( linear_gates ) )
+        self.assertTrue( bisect.distance() < bisect.success_threshold )
+        self.assertTrue( bisect.best_distance < bisect.success_threshold )
+
+    def test_fixedmodel_bisect_max_depth ( self ):
+        model = self.get_model( depth_search = "bisect" )
+        gate_list = model.solve( max_depth = 4 )
+        self.assertTrue( len( gate_list ) <= 4 )
+        self.assertTrue( model.best_distance > model.success_threshold )
+
+    def test_fixedmodel_probe ( self ):
+        model = self.get_model( depth_search = "bisect" )
+        model.start_budget()
+
+        self.assertFalse( model.probe( 1 ) )
+        self.assertEqual( model.depth(), 2 )
+        self.assertTrue( model.probe( 3, model.x ) )
+        self.assertEqual( model.depth(), 6 )
+
+    def test_fixedmodel_prescreen_threshold ( self ):
+        optimizer = LBFGSOptimizer()
+        fine_calls = []
+        minimize_fine = optimizer.minimize_fine
+
+        def counting_minimize_fine ( objective_fn, xin ):
+            fine_calls.append( len( xin ) )
+            return minimize_fine( objective_fn, xin )
+
+        optimizer.minimize_fine = counting_minimize_fine
+
+        # No coarse optimization is close enough for a fine one
+        model = self.get_model( optimizer, depth_search = "bisect",
+                                prescreen_threshold = 0 )
+        model.start_budget()
+        model.probe( 1 )
+        model.probe( 3 )
+        self.assertEqual( fine_calls, [] )
+
+        model.prescreen_threshold = 1
+        model.probe( 1 )
+        self.assertEqual( len( fine_calls ), 1 )
+
+    def test_fixedmodel_invalid_depth_search ( self ):
+        self.assertRaises( ValueError, self.get_model, depth_search = "binary" )
+        self.assertRaises( ValueError, self.get_model, depth_search = None )
+
+    def test_fixedmodel_no_structure ( self ):
+        self.assertRaises( ValueError, FixedModel, self.utry, 2,
+                           self.locations, LBFGSOptimizer() )
+
+
+if __name__ == '__main__':
+    ut.main()
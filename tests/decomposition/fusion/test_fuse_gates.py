@@ -0,0 +1,80 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.decomposition.fusion import fuse_gates
+
+
+class TestFuseGates ( ut.TestCase ):
+
+    def get_product ( self, gate_list, num_qubits ):
+        M = np.identity( 2 ** num_qubits )
+        for gate in gate_list:
+            M = gate.get_circuit_matrix( num_qubits ) @ M
+        return M
+
+    def test_fuse_gates_nested ( self ):
+        gate_list = [ Gate( unitary_group.rvs( 4 ), (0, 1) ),
+                      Gate( unitary_group.rvs( 2 ), (1,) ),
+                      Gate( unitary_group.rvs( 4 ), (0, 1) ),
+                      Gate( unitary_group.rvs( 4 ), (1, 2) ) ]
+
+        fused_list, error = fuse_gates( gate_list, 2 )
+
+        self.assertEqual( [ g.location for g in fused_list ], [ (0, 1), (1, 2) ] )
+        self.assertEqual( error, 0 )
+        self.assertTrue( utils.hilbert_schmidt_distance(
+                         self.get_product( gate_list, 3 ),
+                         self.get_product( fused_list, 3 ) ) < 1e-8 )
+
+    def test_fuse_gates_commuting ( self ):
+        # The last gate acts on other qubits than the one between them
+        gate_list = [ Gate( unitary_group.rvs( 4 ), (0, 1) ),
+                      Gate( unitary_group.rvs( 4 ), (2, 3) ),
+                      Gate( unitary_group.rvs( 4 ), (0, 1) ) ]
+
+        fused_list, _ = fuse_gates( gate_list, 2 )
+
+        self.assertEqual( [ g.location for g in fused_list ], [ (0, 1), (2, 3) ] )
+        self.assertTrue( utils.hilbert_schmidt_distance(
+                         self.get_product( gate_list, 4 ),
+                         self.get_product( fused_list, 4 ) ) < 1e-8 )
+
+    def test_fuse_gates_topology ( self ):
+        gate_list = [ Gate( unitary_group.rvs( 4 ), (0, 1) ),
+                      Gate( unitary_group.rvs( 2 ), (2,) ) ]
+
+        self.assertEqual( len( fuse_gates( gate_list, 3 )[0] ), 1 )
+
+        topology = Topology( 3, [ (0, 1), (0, 2) ] )
+        self.assertEqual( len( fuse_gates( gate_list, 3, topology )[0] ), 1 )
+
+        topology = Topology( 4, [ (0, 1), (1, 3), (2, 3) ] )
+        self.assertEqual( len( fuse_gates( gate_list, 3, topology )[0] ), 2 )
+
+    def test_fuse_gates_identity ( self ):
+        near_identity = np.diag( [ 1, np.exp( 1e-2j ), 1, 1 ] )
+        gate_list = [ Gate( unitary_group.rvs( 4 ), (0, 1) ),
+                      Gate( near_identity, (1, 2) ),
+                      Gate( unitary_group.rvs( 4 ), (2, 3) ) ]
+
+        fused_list, error = fuse_gates( gate_list, 2 )
+        self.assertEqual( len( fused_list ), 3 )
+        self.assertEqual( error, 0 )
+
+        fused_list, error = fuse_gates( gate_list, 2, max_error = 1e-4 )
+        self.assertEqual( [ g.location for g in fused_list ], [ (0, 1), (2, 3) ] )
+        self.assertTrue( 0 < error <= 1e-4 )
+
+    def test_fuse_gates_invalid ( self ):
+        gate_list = [ Gate( unitary_group.rvs( 4 ), (0, 1) ) ]
+        self.assertRaises( ValueError, fuse_gates, gate_list, 0 )
+        self.assertRaises( ValueError, fuse_gates, gate_list, 2, None, -1 )
+
+
+if __name__ == '__main__':
+    ut.main()
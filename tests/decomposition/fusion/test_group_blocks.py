@@ -0,0 +1,57 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.decomposition.fusion import group_blocks, merge_block
+
+
+class TestGroupBlocks ( ut.TestCase ):
+
+    def get_ops ( self, locations ):
+        return [ ( location, unitary_group.rvs( 2 ** len( location ),
+                                                random_state = i ) )
+                 for i, location in enumerate( locations ) ]
+
+    def test_group_blocks_fits ( self ):
+        ops = self.get_ops( [ (0, 1), (1,), (1, 2), (0, 1) ] )
+
+        blocks = group_blocks( ops, lambda qubits : len( qubits ) <= 2 )
+        self.assertEqual( [ b[0] for b in blocks ], [ {0, 1}, {1, 2}, {0, 1} ] )
+        self.assertEqual( [ len( b[1] ) for b in blocks ], [ 2, 1, 1 ] )
+
+        blocks = group_blocks( ops, lambda qubits : len( qubits ) <= 3 )
+        self.assertEqual( [ b[0] for b in blocks ], [ {0, 1, 2} ] )
+
+    def test_group_blocks_other_qubits ( self ):
+        # The block on (2, 3) acts on other qubits than the last gate
+        ops = self.get_ops( [ (0, 1), (2, 3), (0,) ] )
+
+        def fits ( qubits ):
+            return qubits <= {0, 1} or qubits <= {2, 3}
+
+        blocks = group_blocks( ops, fits )
+        self.assertEqual( [ b[0] for b in blocks ], [ {0, 1}, {2, 3} ] )
+        self.assertEqual( blocks[0][1], [ ops[0], ops[2] ] )
+
+    def test_group_blocks_nothing_fits ( self ):
+        ops = self.get_ops( [ (0,), (0,), (1,) ] )
+        blocks = group_blocks( ops, lambda qubits : False )
+        self.assertEqual( [ b[1] for b in blocks ], [ [ op ] for op in ops ] )
+
+    def test_merge_block ( self ):
+        ops = self.get_ops( [ (0, 2), (2,), (0, 2) ] )
+
+        M = merge_block( (0, 1, 2), ops )
+
+        expected = np.identity( 8 )
+        for location, utry in ops:
+            expected = Gate( utry, location ).get_circuit_matrix( 3 ) @ expected
+        self.assertTrue( utils.hilbert_schmidt_distance( M, expected ) < 1e-12 )
+        self.assertTrue( np.allclose( M, expected ) )
+
+
+if __name__ == '__main__':
+    ut.main()
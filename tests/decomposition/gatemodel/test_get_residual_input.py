@@ -0,0 +1,78 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.models.perm.fixedgate import FixedGate as PermFixedGate
+from qfast.decomposition.models.perm.genericgate import GenericGate as PermGenericGate
+from qfast.decomposition.models.softpauli.softpaulimodel import SoftPauliModel
+from qfast.decomposition.models.softpauli.fixedgate import FixedGate as SoftPauliFixedGate
+from qfast.decomposition.models.softpauli.genericgate import GenericGate as SoftPauliGenericGate
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestGateModelGetResidualInput ( ut.TestCase ):
+
+    def setUp ( self ):
+        # The residual only acts on (0, 2)
+        self.utry = unitary_group.rvs( 4, random_state = 3 )
+        self.residual = Gate( self.utry, (0, 2) ).get_circuit_matrix( 3 )
+        self.locations = Topology( 3 ).get_locations( 2 )
+
+    def assert_undoes_residual ( self, M ):
+        # The ideal next gate is the inverse of the residual
+        distance = utils.hilbert_schmidt_distance( M, self.residual.conj().T )
+        self.assertTrue( distance < 1e-8 )
+
+    def test_get_residual_input_fixed_gates ( self ):
+        for gate_class in [ PermFixedGate, SoftPauliFixedGate ]:
+            gate = gate_class( 3, 2, (0, 2) )
+            x = gate.get_residual_input( self.residual, (0, 2) )
+            self.assert_undoes_residual( gate.get_matrix( x ) )
+
+            # The opposite sign reproduces the residual instead
+            distance = utils.hilbert_schmidt_distance( gate.get_matrix( -x ),
+                                                       self.residual.conj().T )
+            self.assertTrue( distance > 1e-2 )
+
+    def test_get_residual_input_small_rotation ( self ):
+        # A small residual checks the scale of the inputs
+        H = np.diag( [ 1, -1, 2, 0 ] )
+        utry = utils.closest_unitary( np.identity( 4 ) + 0.05j * H )
+        self.residual = Gate( utry, (0, 2) ).get_circuit_matrix( 3 )
+
+        for gate_class in [ PermFixedGate, SoftPauliFixedGate ]:
+            gate = gate_class( 3, 2, (0, 2) )
+            x = gate.get_residual_input( self.residual, (0, 2) )
+            self.assert_undoes_residual( gate.get_matrix( x ) )
+
+    def test_get_residual_input_generic_gates ( self ):
+        for gate_class in [ PermGenericGate, SoftPauliGenericGate ]:
+            gate = gate_class( 3, 2, self.locations, beta = 1000 )
+            x = gate.get_initial_input( self.residual )
+            self.assertEqual( gate.get_location( x ), (0, 2) )
+            self.assert_undoes_residual( gate.get_matrix( x ) )
+
+    def test_get_residual_input_models ( self ):
+        target = self.residual.conj().T
+
+        for model_class in [ PermModel, SoftPauliModel ]:
+            model = model_class( target, 2, self.locations, LBFGSOptimizer(),
+                                 initialization = "residual",
+                                 softmax_beta = 1000 )
+            model.reset_input()
+            residual_distance = model.distance()
+
+            model.initialization = "random"
+            model.reset_input()
+
+            self.assertTrue( residual_distance < 1e-8 )
+            self.assertTrue( residual_distance < model.distance() )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,96 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.genericgate import GenericGate as PermGate
+from qfast.decomposition.models.softpauli.genericgate import GenericGate as SoftPauliGate
+
+
+class TestGenericGateModelSample ( ut.TestCase ):
+
+    def setUp ( self ):
+        self.locations = Topology( 4 ).get_locations( 2 )
+
+        # Only (0, 1) has to be corrected
+        utry = unitary_group.rvs( 4, random_state = 3 )
+        self.residual = np.kron( utry, np.identity( 4 ) )
+
+    def get_gates ( self ):
+        return [ PermGate( 4, 2, self.locations ),
+                 SoftPauliGate( 4, 2, self.locations ) ]
+
+    def get_working_data ( self, gate ):
+        if isinstance( gate, PermGate ):
+            return gate.working_perms
+        return gate.working_sigmav
+
+    def test_sample ( self ):
+        for gate in self.get_gates():
+            gate.sample( 2 )
+            self.assertEqual( len( gate.working_locations ), 2 )
+            self.assertEqual( len( gate.unsampled_locations ), 4 )
+            self.assertEqual( len( self.get_working_data( gate ) ), 2 )
+            self.assertEqual( gate.get_location_count(), 2 )
+            self.assertEqual( set( gate.working_locations
+                                   + gate.unsampled_locations ),
+                              set( self.locations ) )
+
+    def test_sample_unsample ( self ):
+        for gate in self.get_gates():
+            param_count = gate.get_param_count()
+            working_data = np.copy( self.get_working_data( gate ) )
+
+            gate.sample( 2 )
+            self.assertTrue( gate.get_param_count() < param_count )
+            gate.unsample()
+
+            self.assertEqual( gate.working_locations, self.locations )
+            self.assertEqual( gate.unsampled_locations, [] )
+            self.assertEqual( gate.get_param_count(), param_count )
+            self.assertTrue( np.allclose( self.get_working_data( gate ),
+                                          working_data ) )
+
+    def test_sample_keeps_restrictions ( self ):
+        for gate in self.get_gates():
+            gate.restrict( (0, 1) )
+
+            for i in range( 10 ):
+                gate.sample( 2 )
+                self.assertNotIn( (0, 1), gate.working_locations )
+                self.assertNotIn( (0, 1), gate.unsampled_locations )
+
+    def test_sample_weighting ( self ):
+        for gate in self.get_gates():
+            num_draws = 400
+            uniform_count = 0
+            score_count = 0
+
+            for i in range( num_draws ):
+                gate.sample( 1 )
+                uniform_count += gate.working_locations == [ (0, 1) ]
+                gate.sample( 1, self.residual )
+                score_count += gate.working_locations == [ (0, 1) ]
+
+            # (0, 1) holds 41% of the score but a sixth of the locations
+            self.assertTrue( uniform_count < 120 )
+            self.assertTrue( score_count > 120 )
+
+    def test_set_working_locations ( self ):
+        for gate in self.get_gates():
+            gate.set_working_locations( [ (2, 3), (0, 2) ], [ (1, 3) ] )
+            self.assertEqual( gate.working_locations, [ (2, 3), (0, 2) ] )
+            self.assertEqual( gate.unsampled_locations, [ (1, 3) ] )
+
+            data = self.get_working_data( gate )
+            full = gate.perms if isinstance( gate, PermGate ) else gate.sigmav
+            self.assertTrue( np.allclose( data[0], full[5] ) )
+            self.assertTrue( np.allclose( data[1], full[1] ) )
+
+            gate.unsample()
+            self.assertEqual( gate.working_locations, [ (0, 2), (1, 3), (2, 3) ] )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,78 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.genericgate import GenericGate as PermGate
+from qfast.decomposition.models.softpauli.genericgate import GenericGate as SoftPauliGate
+
+
+class TestGenericGateModelScreen ( ut.TestCase ):
+
+    def setUp ( self ):
+        self.locations = Topology( 4 ).get_locations( 2 )
+
+        # Only (1, 3) has to be corrected
+        utry = unitary_group.rvs( 4, random_state = 5 )
+        self.residual = Gate( utry, (1, 3) ).get_circuit_matrix( 4 )
+
+    def get_gates ( self ):
+        return [ PermGate( 4, 2, self.locations ),
+                 SoftPauliGate( 4, 2, self.locations ) ]
+
+    def get_full_data ( self, gate ):
+        if isinstance( gate, PermGate ):
+            return gate.perms, gate.working_perms
+        return gate.sigmav, gate.working_sigmav
+
+    def test_get_location_scores ( self ):
+        for gate in self.get_gates():
+            scores = gate.get_location_scores( self.residual )
+            self.assertEqual( len( scores ), len( self.locations ) )
+            self.assertEqual( np.argmax( scores ), self.locations.index( (1, 3) ) )
+
+            scores = gate.get_location_scores( np.identity( 16 ) )
+            self.assertTrue( np.allclose( scores, 0 ) )
+
+    def test_screen_keeps_planted_location ( self ):
+        for gate in self.get_gates():
+            gate.screen( self.residual, 1 )
+            self.assertEqual( gate.working_locations, [ (1, 3) ] )
+            self.assertEqual( gate.get_location_count(), 1 )
+
+            full, working = self.get_full_data( gate )
+            idx = self.locations.index( (1, 3) )
+            self.assertTrue( np.allclose( working[0], full[ idx ] ) )
+
+    def test_screen_keeps_order ( self ):
+        for gate in self.get_gates():
+            gate.screen( self.residual, 3 )
+            self.assertEqual( len( gate.working_locations ), 3 )
+            self.assertIn( (1, 3), gate.working_locations )
+
+            indices = [ self.locations.index( l ) for l in gate.working_locations ]
+            self.assertEqual( indices, sorted( indices ) )
+
+            full, working = self.get_full_data( gate )
+            self.assertTrue( np.allclose( working, full[ indices ] ) )
+
+    def test_screen_too_many ( self ):
+        for gate in self.get_gates():
+            gate.screen( self.residual, len( self.locations ) )
+            self.assertEqual( gate.working_locations, self.locations )
+
+    def test_screen_after_restrict ( self ):
+        for gate in self.get_gates():
+            gate.restrict( (1, 3) )
+            gate.screen( self.residual, 2 )
+            self.assertNotIn( (1, 3), gate.working_locations )
+            self.assertEqual( len( gate.working_locations ), 2 )
+
+            gate.lift_restrictions()
+            self.assertEqual( gate.working_locations, self.locations )
+
+
+if __name__ == '__main__':
+    ut.main()
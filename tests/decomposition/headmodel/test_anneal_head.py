@@ -0,0 +1,51 @@
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.models.softpauli.softpaulimodel import SoftPauliModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestHeadModelAnnealHead ( ut.TestCase ):
+
+    def get_models ( self, **kwargs ):
+        utry = unitary_group.rvs( 8, random_state = 7 )
+        locations = Topology( 3 ).get_locations( 2 )
+        return [ model_class( utry, 2, locations, LBFGSOptimizer(), **kwargs )
+                 for model_class in [ PermModel, SoftPauliModel ] ]
+
+    def test_anneal_head_growth ( self ):
+        for model in self.get_models( softmax_beta = 10, softmax_growth = 2 ):
+            self.assertEqual( model.head.beta, 10 )
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 20 )
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 40 )
+
+    def test_anneal_head_max_beta ( self ):
+        for model in self.get_models( softmax_beta = 10, softmax_growth = 2,
+                                      softmax_max_beta = 30 ):
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 20 )
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 30 )
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 30 )
+
+    def test_anneal_head_default ( self ):
+        for model in self.get_models( softmax_beta = 10 ):
+            model.anneal_head()
+            self.assertEqual( model.head.beta, 10 )
+
+    def test_anneal_head_reset_on_expand ( self ):
+        for model in self.get_models( softmax_beta = 10, softmax_growth = 2 ):
+            model.reset_input()
+            model.anneal_head()
+            model.expand( (0, 1) )
+            self.assertEqual( model.head.beta, 10 )
+
+
+if __name__ == '__main__':
+    ut.main()
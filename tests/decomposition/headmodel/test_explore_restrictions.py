@@ -0,0 +1,134 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.models.softpauli.softpaulimodel import SoftPauliModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestHeadModelExploreRestrictions ( ut.TestCase ):
+
+    def get_stalled_model ( self, model_class ):
+        utry = unitary_group.rvs( 8, random_state = 7 )
+        locations = Topology( 3 ).get_locations( 2 )
+        model = model_class( utry, 2, locations, LBFGSOptimizer(),
+                             restrict_workers = 2,
+                             initialization = "residual" )
+        model.reset_input()
+        model.optimize()
+        return model
+
+    def check_explore_restrictions ( self, model_class ):
+        model = self.get_stalled_model( model_class )
+        values = model.head.get_location_values( model.get_input_slice( -1 ) )
+        ranked = [ model.head.working_locations[ idx ]
+                   for idx in np.argsort( -values, kind = "stable" ) ]
+        num_evaluations = model.num_evaluations
+        callback = lambda gate_list : None
+        model.partial_solution_callback = callback
+
+        results = model.explore_restrictions()
+
+        # Two variants were optimized and the closest one was adopted
+        self.assertEqual( len( results ), 1 )
+        self.assertTrue( model.distance() <= results[0][1] )
+        self.assertTrue( model.num_evaluations > num_evaluations )
+
+        # The adopted variant excludes the highest ranked locations
+        num_restricted = len( ranked ) - len( model.head.working_locations )
+        self.assertIn( num_restricted, [ 1, 2 ] )
+        self.assertEqual( model.head.working_locations,
+                          sorted( ranked[ num_restricted : ] ) )
+
+        # The adopted variant keeps the model's callbacks
+        self.assertIs( model.partial_solution_callback, callback )
+
+    def check_explore_restrictions_one_fewer ( self, model_class ):
+        model = self.get_stalled_model( model_class )
+        values = model.head.get_location_values( model.get_input_slice( -1 ) )
+        top = model.head.working_locations[ np.argmax( values ) ]
+        num_locations = len( model.head.working_locations )
+        model.restrict_workers = 1
+
+        self.assertEqual( model.explore_restrictions(), [] )
+        self.assertEqual( len( model.head.working_locations ),
+                          num_locations - 1 )
+        self.assertNotIn( top, model.head.working_locations )
+
+    def check_explore_restrictions_sampled ( self, model_class ):
+        utry = unitary_group.rvs( 16, random_state = 7 )
+        locations = Topology( 4 ).get_locations( 2 )
+        model = model_class( utry, 2, locations, LBFGSOptimizer(),
+                             restrict_workers = 2, sample_size = 2 )
+        model.sample_head()
+        model.head.restrict( model.head.working_locations[0] )
+        model.reset_input()
+        model.optimize()
+
+        # A single working location is left, the rest are sampled out
+        self.assertEqual( len( model.head.working_locations ), 1 )
+        top = model.head.working_locations[0]
+        num_locations = len( model.head.unsampled_locations ) + 1
+
+        self.assertEqual( model.explore_restrictions(), [] )
+        self.assertEqual( len( model.head.working_locations ), 2 )
+        self.assertNotIn( top, model.head.working_locations )
+        self.assertNotIn( top, model.head.unsampled_locations )
+        self.assertEqual( len( model.head.working_locations )
+                          + len( model.head.unsampled_locations ),
+                          num_locations - 1 )
+
+    def check_solve_sampled ( self, model_class ):
+        np.random.seed( 0 )
+        utry = unitary_group.rvs( 16, random_state = 0 )
+        locations = Topology( 4 ).get_locations( 2 )
+        model = model_class( utry, 2, locations, LBFGSOptimizer(),
+                             restrict_workers = 2, sample_size = 2,
+                             progress_threshold = 5e-2 )
+        gate_list = model.solve( time_limit = 10 )
+        self.assertTrue( len( gate_list ) > 0 )
+
+    def test_explore_restrictions_perm ( self ):
+        self.check_explore_restrictions( PermModel )
+
+    def test_explore_restrictions_softpauli ( self ):
+        self.check_explore_restrictions( SoftPauliModel )
+
+    def test_explore_restrictions_one_fewer_perm ( self ):
+        self.check_explore_restrictions_one_fewer( PermModel )
+
+    def test_explore_restrictions_one_fewer_softpauli ( self ):
+        self.check_explore_restrictions_one_fewer( SoftPauliModel )
+
+    def test_explore_restrictions_sampled_perm ( self ):
+        self.check_explore_restrictions_sampled( PermModel )
+
+    def test_explore_restrictions_sampled_softpauli ( self ):
+        self.check_explore_restrictions_sampled( SoftPauliModel )
+
+    def test_explore_restrictions_solve_sampled ( self ):
+        self.check_solve_sampled( PermModel )
+
+    def test_explore_restrictions_adopts_best ( self ):
+        model = self.get_stalled_model( PermModel )
+        variants = []
+
+        for num_restricted in [ 1, 2 ]:
+            variant = model.fork()
+            values = variant.head.get_location_values( variant.get_input_slice( -1 ) )
+            order = np.argsort( -values, kind = "stable" )
+            for idx in order[ : num_restricted ]:
+                variant.head.restrict( model.head.working_locations[ idx ] )
+            variant.reset_input()
+            variant.optimize()
+            variants.append( variant.distance() )
+
+        model.explore_restrictions()
+        self.assertTrue( np.isclose( model.distance(), min( variants ) ) )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,56 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast.topology import Topology
+from qfast.decomposition.models.perm.permmodel import PermModel
+from qfast.decomposition.models.softpauli.softpaulimodel import SoftPauliModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestHeadModelGetState ( ut.TestCase ):
+
+    def check_get_state ( self, model_class ):
+        utry = unitary_group.rvs( 8, random_state = 3 )
+        locations = Topology( 3 ).get_locations( 2 )
+        model = model_class( utry, 2, locations, LBFGSOptimizer() )
+        model.reset_input()
+        model.optimize()
+        model.expand( locations[1] )
+        model.head.restrict( locations[0] )
+        model.reset_input()
+        model.optimize()
+
+        other = model_class( utry, 2, locations, LBFGSOptimizer() )
+        other.set_state( model.get_state() )
+
+        self.assertEqual( [ type( g ) for g in other.gates ],
+                          [ type( g ) for g in model.gates ] )
+        self.assertEqual( [ g.location for g in other.gates[ : -1 ] ],
+                          [ locations[1] ] )
+        self.assertEqual( other.head.working_locations,
+                          model.head.working_locations )
+        self.assertTrue( np.isclose( other.distance(), model.distance() ) )
+
+    def test_get_state_perm ( self ):
+        self.check_get_state( PermModel )
+
+    def test_get_state_softpauli ( self ):
+        self.check_get_state( SoftPauliModel )
+
+    def test_set_state_invalid ( self ):
+        utry = unitary_group.rvs( 8, random_state = 3 )
+        locations = Topology( 3 ).get_locations( 2 )
+        model = PermModel( utry, 2, locations, LBFGSOptimizer() )
+        model.reset_input()
+        model.expand( locations[1] )
+        state = model.get_state()
+        state[ "param_ranges" ][1] += 1
+
+        other = PermModel( utry, 2, locations, LBFGSOptimizer() )
+        self.assertRaises( ValueError, other.set_state, state )
+
+
+if __name__ == '__main__':
+    ut.main()
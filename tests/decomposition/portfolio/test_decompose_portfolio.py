@@ -0,0 +1,73 @@
+import os
+import pickle
+import numpy    as np
+import unittest as ut
+import multiprocessing as mp
+
+from qfast.decomposition.decomposer import Decomposer
+from qfast.decomposition.portfolio import decompose_portfolio
+
+
+def exit_hierarchy_fn ( num_qubits ):
+    os._exit( 1 )
+
+
+class TestDecomposePortfolio ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def test_decompose_portfolio_invalid ( self ):
+        self.assertRaises( ValueError, decompose_portfolio,
+                           self.TOFFOLI, [] )
+        self.assertRaises( RuntimeError, decompose_portfolio, self.TOFFOLI,
+                           [ ( "test_dummy_model", "LBFGSOptimizer", {} ) ] )
+
+    def test_decompose_portfolio_first ( self ):
+        portfolio = [ ( "PermModel", "LBFGSOptimizer", {} ),
+                      ( "SoftPauliModel", "LBFGSOptimizer", {} ) ]
+        gate_list = decompose_portfolio( self.TOFFOLI, portfolio )
+        self.assertTrue( len( gate_list ) > 0 )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+
+    def test_decompose_portfolio_best ( self ):
+        portfolio = [ ( "PermModel", "LBFGSOptimizer", {} ),
+                      ( "PermModel", "LBFGSOptimizer",
+                        { "objective": "phase_invariant" } ) ]
+        gate_list = decompose_portfolio( self.TOFFOLI, portfolio,
+                                         wait_for_best = True )
+        self.assertTrue( len( gate_list ) > 0 )
+
+    def test_decompose_portfolio_converged ( self ):
+        portfolio = [ ( "PermModel", "LBFGSOptimizer", {} ),
+                      ( "FixedModel", "LBFGSOptimizer",
+                        { "structure": [ ( 0, 1 ) ] } ) ]
+
+        for wait_for_best in [ False, True ]:
+            gate_list = decompose_portfolio( self.TOFFOLI, portfolio,
+                                             wait_for_best = wait_for_best )
+            self.assertTrue( len( gate_list ) > 1 )
+
+    def test_decompose_portfolio_closest ( self ):
+        portfolio = [ ( "FixedModel", "LBFGSOptimizer",
+                        { "structure": [ ( 0, 1 ) ] } ) ]
+        gate_list = decompose_portfolio( self.TOFFOLI, portfolio )
+        self.assertEqual( len( gate_list ), 1 )
+
+    def test_decompose_portfolio_crashed ( self ):
+        portfolio = [ ( "PermModel", "LBFGSOptimizer", {} ) ]
+        self.assertRaises( RuntimeError, decompose_portfolio, self.TOFFOLI,
+                           portfolio, hierarchy_fn = exit_hierarchy_fn )
+
+    def test_decompose_portfolio_spawn ( self ):
+        pickle.dumps( Decomposer( self.TOFFOLI ) )
+
+        portfolio = [ ( "PermModel", "LBFGSOptimizer", {} ) ]
+        gate_list = decompose_portfolio( self.TOFFOLI, portfolio,
+                                         mp_context = mp.get_context( "spawn" ) )
+        self.assertTrue( len( gate_list ) > 0 )
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+
+
+if __name__ == '__main__':
+    ut.main()
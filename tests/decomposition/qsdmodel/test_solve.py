@@ -0,0 +1,70 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.topology import Topology
+from qfast.decomposition.decomposer import Decomposer
+from qfast.decomposition.models.qsdmodel import QSDModel
+from qfast.decomposition.optimizers.lbfgs import LBFGSOptimizer
+
+
+class TestQSDModelSolve ( ut.TestCase ):
+
+    def get_product ( self, gate_list, num_qubits ):
+        M = np.identity( 2 ** num_qubits )
+        for gate in gate_list:
+            M = gate.get_circuit_matrix( num_qubits ) @ M
+        return M
+
+    def test_qsdmodel_solve ( self ):
+        for num_qubits, gate_size in [ (3, 2), (4, 2), (4, 3) ]:
+            utry = unitary_group.rvs( 2 ** num_qubits )
+            locations = Topology( num_qubits ).get_locations( gate_size )
+            model = QSDModel( utry, gate_size, locations, LBFGSOptimizer() )
+            gate_list = model.solve()
+
+            self.assertTrue( all( gate.location in locations
+                                  for gate in gate_list ) )
+            self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                             self.get_product( gate_list, num_qubits ) ) < 1e-8 )
+            self.assertTrue( model.distance() < 1e-8 )
+            self.assertEqual( model.get_structure(),
+                              [ gate.location for gate in gate_list ] )
+
+    def test_qsdmodel_solve_topology ( self ):
+        topology = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+
+        for gate_size in [ 2, 3 ]:
+            utry = unitary_group.rvs( 16 )
+            locations = topology.get_locations( gate_size )
+            model = QSDModel( utry, gate_size, locations, LBFGSOptimizer() )
+            gate_list = model.solve()
+
+            self.assertTrue( all( gate.location in locations
+                                  for gate in gate_list ) )
+            self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                             self.get_product( gate_list, 4 ) ) < 1e-8 )
+
+    def test_qsdmodel_solve_deterministic ( self ):
+        utry = unitary_group.rvs( 8 )
+        locations = Topology( 3 ).get_locations( 2 )
+        gate_list1 = QSDModel( utry, 2, locations, LBFGSOptimizer() ).solve()
+        gate_list2 = QSDModel( utry, 2, locations, LBFGSOptimizer() ).solve()
+
+        self.assertEqual( len( gate_list1 ), len( gate_list2 ) )
+        self.assertTrue( all( np.allclose( g1.utry, g2.utry )
+                              for g1, g2 in zip( gate_list1, gate_list2 ) ) )
+
+    def test_qsdmodel_solve_decomposer ( self ):
+        utry = unitary_group.rvs( 32 )
+        decomposer = Decomposer( utry, 2, model = "QSDModel" )
+        gate_list = decomposer.decompose()
+
+        self.assertTrue( all( gate.num_qubits == 2 for gate in gate_list ) )
+        self.assertTrue( decomposer.distance < 1e-8 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,80 @@
+import re
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.diagonal import synthesize_diagonal
+
+
+CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                   [ 0, 1, 0, 0 ],
+                   [ 0, 0, 0, 1 ],
+                   [ 0, 0, 1, 0 ] ] )
+
+
+class TestSynthesizeDiagonal ( ut.TestCase ):
+
+    def get_matrix ( self, qasm, num_qubits, topology = None ):
+        M = np.identity( 2 ** num_qubits )
+        for line in qasm.splitlines():
+            cx = re.match( r"cx q\[(\d+)\],q\[(\d+)\];", line )
+            rz = re.match( r"rz\((.+)\) q\[(\d+)\];", line )
+
+            if cx is not None:
+                location = ( int( cx.group( 1 ) ), int( cx.group( 2 ) ) )
+                if topology is not None:
+                    self.assertIn( tuple( sorted( location ) ),
+                                   topology.coupling_graph )
+                g = Gate( CNOT, location )
+
+            elif rz is not None:
+                theta = float( rz.group( 1 ) )
+                utry = np.diag( [ np.exp( -0.5j * theta ),
+                                  np.exp( 0.5j * theta ) ] )
+                g = Gate( utry, ( int( rz.group( 2 ) ), ) )
+
+            else:
+                continue
+
+            M = g.get_circuit_matrix( num_qubits ) @ M
+        return M
+
+    def get_diagonal ( self, num_qubits ):
+        phases = np.random.uniform( 0, 2 * np.pi, 2 ** num_qubits )
+        return np.diag( np.exp( 1j * phases ) )
+
+    def test_synthesize_diagonal_all_to_all ( self ):
+        for num_qubits in range( 1, 5 ):
+            utry = self.get_diagonal( num_qubits )
+            qasm = synthesize_diagonal( utry )
+            self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                             self.get_matrix( qasm, num_qubits ) ) < 1e-8 )
+
+    def test_synthesize_diagonal_topology ( self ):
+        line = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+        star = Topology( 4, [ (0, 2), (1, 2), (2, 3) ] )
+
+        for topology in [ line, star ]:
+            utry = self.get_diagonal( 4 )
+            qasm = synthesize_diagonal( utry, topology )
+            M = self.get_matrix( qasm, 4, topology )
+            self.assertTrue( utils.hilbert_schmidt_distance( utry, M ) < 1e-8 )
+
+    def test_synthesize_diagonal_cz ( self ):
+        utry = np.diag( [ 1, 1, 1, -1 ] )
+        qasm = synthesize_diagonal( utry )
+        self.assertEqual( qasm.count( "cx" ), 2 )
+        self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                         self.get_matrix( qasm, 2 ) ) < 1e-8 )
+
+    def test_synthesize_diagonal_invalid ( self ):
+        self.assertRaises( ValueError, synthesize_diagonal,
+                           unitary_group.rvs( 4 ) )
+
+
+if __name__ == '__main__':
+    ut.main()
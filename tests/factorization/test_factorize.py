@@ -0,0 +1,65 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import perm
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.factorization import factorize
+
+
+class TestFactorize ( ut.TestCase ):
+
+    def get_product ( self, factors, num_qubits ):
+        M = np.identity( 2 ** num_qubits )
+        for location, utry in factors:
+            M = Gate( utry, location ).get_circuit_matrix( num_qubits ) @ M
+        return M
+
+    def test_factorize_product ( self ):
+        A = unitary_group.rvs( 4 )
+        B = unitary_group.rvs( 2 )
+        C = unitary_group.rvs( 4 )
+        utry = np.kron( np.kron( A, B ), C )
+        P = perm.calc_permutation_matrix( 5, (1, 3, 0, 2, 4) )
+        utry = P @ utry @ P.T
+
+        factors = factorize( utry )
+
+        self.assertEqual( sorted( location for location, _ in factors ),
+                          [ (0, 4), (1, 3), (2,) ] )
+        self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                         self.get_product( factors, 5 ) ) < 1e-8 )
+
+    def test_factorize_idle ( self ):
+        utry = np.kron( unitary_group.rvs( 4 ), np.identity( 2 ) )
+        factors = factorize( utry )
+
+        self.assertEqual( [ location for location, _ in factors ],
+                          [ (2,), (0, 1) ] )
+        self.assertTrue( np.allclose( np.abs( factors[0][1] ), np.identity( 2 ) ) )
+
+    def test_factorize_topology ( self ):
+        # Qubits 0 and 2 are not connected within their factor
+        utry = np.kron( unitary_group.rvs( 4 ), unitary_group.rvs( 2 ) )
+        P = perm.calc_permutation_matrix( 3, (0, 2, 1) )
+        utry = P @ utry @ P.T
+
+        self.assertEqual( len( factorize( utry ) ), 2 )
+
+        topology = Topology( 3, [ (0, 1), (1, 2) ] )
+        self.assertEqual( len( factorize( utry, topology ) ), 1 )
+
+    def test_factorize_entangled ( self ):
+        utry = unitary_group.rvs( 8 )
+        factors = factorize( utry )
+
+        self.assertEqual( len( factors ), 1 )
+        self.assertEqual( factors[0][0], (0, 1, 2) )
+        self.assertTrue( factors[0][1] is utry )
+
+
+if __name__ == '__main__':
+    ut.main()
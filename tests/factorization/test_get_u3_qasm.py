@@ -0,0 +1,34 @@
+import re
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.factorization import get_u3_qasm
+
+
+class TestGetU3Qasm ( ut.TestCase ):
+
+    def get_u3 ( self, qasm ):
+        match = re.search( r"u3\((.*)\) q\[0\];", qasm )
+        theta, phi, lam = [ float( a ) for a in match.group( 1 ).split( "," ) ]
+        return np.array( [ [ np.cos( theta / 2 ),
+                             -np.exp( 1j * lam ) * np.sin( theta / 2 ) ],
+                           [ np.exp( 1j * phi ) * np.sin( theta / 2 ),
+                             np.exp( 1j * ( phi + lam ) ) * np.cos( theta / 2 ) ] ] )
+
+    def test_get_u3_qasm ( self ):
+        utrys = [ unitary_group.rvs( 2 ) for i in range( 5 ) ]
+        utrys.append( np.array( [ [ 0, 1 ], [ 1, 0 ] ] ) )
+        utrys.append( np.diag( [ 1, 1j ] ) )
+
+        for utry in utrys:
+            qasm = get_u3_qasm( utry )
+            self.assertTrue( "qreg q[1];" in qasm )
+            self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                             self.get_u3( qasm ) ) < 1e-12 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,27 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.gate import Gate
+
+class TestGateGetCircuitMatrix ( ut.TestCase ):
+
+    X = np.array( [ [ 0, 1 ], [ 1, 0 ] ], dtype = np.complex128 )
+    I = np.identity( 2 )
+
+    def test_gate_get_circuit_matrix_in_order ( self ):
+        gate = Gate( np.kron( self.X, self.I ), (0, 1) )
+        M = np.kron( np.kron( self.X, self.I ), self.I )
+        self.assertTrue( np.allclose( gate.get_circuit_matrix( 3 ), M ) )
+
+    def test_gate_get_circuit_matrix_out_of_order ( self ):
+        gate = Gate( np.kron( self.X, self.I ), (2, 0) )
+        M = np.kron( np.kron( self.I, self.I ), self.X )
+        self.assertTrue( np.allclose( gate.get_circuit_matrix( 3 ), M ) )
+
+    def test_gate_get_circuit_matrix_invalid ( self ):
+        gate = Gate( np.kron( self.X, self.I ), (2, 0) )
+        self.assertRaises( ValueError, gate.get_circuit_matrix, 2 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,54 @@
+import asyncio
+import numpy    as np
+import unittest as ut
+
+from qfast import gate
+from qfast.topology import Topology
+from qfast.workerpool import WorkerPool
+from qfast.instantiation.asyncinstantiater import AsyncInstantiater
+
+
+class TestAsyncInstantiaterInstantiate ( ut.TestCase ):
+
+    CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                       [ 0, 1, 0, 0 ],
+                       [ 0, 0, 0, 1 ],
+                       [ 0, 0, 1, 0 ] ], dtype = np.complex128 )
+
+    @classmethod
+    def setUpClass ( cls ):
+        cls.pool = WorkerPool( 2 )
+
+    @classmethod
+    def tearDownClass ( cls ):
+        cls.pool.shutdown()
+
+    def test_async_instantiater_instantiate_invalid ( self ):
+        instantiater = AsyncInstantiater( "QSearchTool", Topology( 3, None ),
+                                          pool = self.pool )
+
+        self.assertRaises( TypeError, asyncio.run,
+                           instantiater.instantiate( 0 ) )
+        self.assertRaises( TypeError, asyncio.run,
+                           instantiater.instantiate( [ ( self.CNOT, ( 0, 1 ) ) ] ) )
+        self.assertRaises( ValueError, AsyncInstantiater, "QSearchTool",
+                           Topology( 3, None ), max_concurrency = 0 )
+
+    def test_async_instantiater_instantiate_valid ( self ):
+        instantiater = AsyncInstantiater( "QSearchTool", Topology( 3, None ),
+                                          pool = self.pool,
+                                          max_concurrency = 1 )
+        locations = [ (0, 1), (1, 2) ]
+        gate_list = [ gate.Gate( self.CNOT, location ) for location in locations ]
+
+        qasm_list = asyncio.run( instantiater.instantiate( gate_list ) )
+
+        self.assertEqual( [ loc for _, loc in qasm_list ], locations )
+
+        for qasm, _ in qasm_list:
+            self.assertTrue( "OPENQASM" in qasm )
+            self.assertTrue( "cx" in qasm )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,43 @@
+import numpy    as np
+import unittest as ut
+
+from qfast import gate
+from qfast.topology import Topology
+from qfast.instantiation.instantiater import Instantiater
+
+
+class TestInstantiaterInstantiateIter ( ut.TestCase ):
+
+    CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                       [ 0, 1, 0, 0 ],
+                       [ 0, 0, 0, 1 ],
+                       [ 0, 0, 1, 0 ] ], dtype = np.complex128 )
+
+    def test_instantiater_instantiate_iter_invalid ( self ):
+        instantiater = Instantiater( "QSearchTool", Topology( 3, None ) )
+        gates = [ ( 0, gate.Gate( self.CNOT, (0, 1) ) ) ]
+
+        self.assertRaises( ValueError, list,
+                           instantiater.instantiate_iter( gates, 1, 0 ) )
+        self.assertRaises( TypeError, list,
+                           instantiater.instantiate_iter( [ ( 0, "a" ) ], 1 ) )
+
+    def test_instantiater_instantiate_iter_order ( self ):
+        instantiater = Instantiater( "QSearchTool", Topology( 3, None ) )
+        locations = [ (0, 1), (1, 2), (0, 2) ]
+        gates = [ ( i, gate.Gate( self.CNOT, location ) )
+                  for i, location in enumerate( locations ) ]
+
+        qasm_list = list( instantiater.instantiate_iter( reversed( gates ),
+                                                         2, 1 ) )
+
+        self.assertEqual( len( qasm_list ), 3 )
+        self.assertEqual( [ loc for _, loc in qasm_list ], locations )
+
+        for qasm, _ in qasm_list:
+            self.assertTrue( "OPENQASM" in qasm )
+            self.assertTrue( "cx" in qasm )
+
+
+if __name__ == '__main__':
+    ut.main()
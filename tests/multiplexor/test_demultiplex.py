@@ -0,0 +1,67 @@
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast.gate import Gate
+from qfast.topology import Topology
+from qfast.diagonal import is_diagonal
+from qfast.multiplexor import reorder, get_control, demultiplex
+
+
+class TestDemultiplex ( ut.TestCase ):
+
+    def get_product ( self, blocks, num_qubits ):
+        M = np.identity( 2 ** num_qubits )
+        for location, utry in blocks:
+            M = Gate( utry, location ).get_circuit_matrix( num_qubits ) @ M
+        return M
+
+    def get_multiplexor ( self, num_qubits, control ):
+        A = unitary_group.rvs( 2 ** ( num_qubits - 1 ) )
+        B = unitary_group.rvs( 2 ** ( num_qubits - 1 ) )
+        Z = np.zeros_like( A )
+        return reorder( np.block( [ [ A, Z ], [ Z, B ] ] ), control,
+                        inverse = True )
+
+    def test_demultiplex ( self ):
+        for num_qubits in range( 2, 5 ):
+            for control in range( num_qubits ):
+                utry = self.get_multiplexor( num_qubits, control )
+                self.assertEqual( get_control( utry, Topology( num_qubits ) ),
+                                  control )
+
+                blocks = demultiplex( utry, control )
+                rest = tuple( q for q in range( num_qubits ) if q != control )
+
+                self.assertEqual( blocks[0][0], rest )
+                self.assertEqual( blocks[2][0], rest )
+                self.assertTrue( is_diagonal( blocks[1][1] ) )
+                self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                                 self.get_product( blocks, num_qubits ) ) < 1e-8 )
+
+    def test_demultiplex_toffoli ( self ):
+        utry = np.identity( 8 )
+        utry[ 6:, 6: ] = [ [ 0, 1 ], [ 1, 0 ] ]
+
+        self.assertEqual( get_control( utry, Topology( 3 ) ), 0 )
+        self.assertTrue( utils.hilbert_schmidt_distance( utry,
+                         self.get_product( demultiplex( utry, 0 ), 3 ) ) < 1e-8 )
+
+    def test_demultiplex_topology ( self ):
+        # Without the middle qubit of a line, the others are disconnected
+        utry = self.get_multiplexor( 3, 1 )
+        self.assertEqual( get_control( utry, Topology( 3 ) ), 1 )
+
+        topology = Topology( 3, [ (0, 1), (1, 2) ] )
+        self.assertEqual( get_control( utry, topology ), None )
+
+    def test_demultiplex_invalid ( self ):
+        utry = unitary_group.rvs( 8 )
+        self.assertEqual( get_control( utry, Topology( 3 ) ), None )
+        self.assertRaises( ValueError, demultiplex, utry, 0 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,38 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.pauli import get_location_expansion, get_norder_paulis
+
+
+class TestGetLocationExpansion ( ut.TestCase ):
+
+    def test_get_location_expansion_local ( self ):
+        paulis = get_norder_paulis( 2 )
+        alpha = np.random.random( len( paulis ) )
+        A = np.sum( [ a * p for a, p in zip( alpha, paulis ) ], 0 )
+        I = np.identity( 2 )
+
+        H = np.kron( A, I )
+        self.assertTrue( np.allclose( get_location_expansion( H, (0, 1) ),
+                                      alpha ) )
+
+        H = np.kron( I, A )
+        self.assertTrue( np.allclose( get_location_expansion( H, (1, 2) ),
+                                      alpha ) )
+
+    def test_get_location_expansion_order ( self ):
+        X = get_norder_paulis( 1 )[1]
+        Z = get_norder_paulis( 1 )[3]
+        H = np.kron( X, Z )
+
+        expansion = get_location_expansion( H, (1, 0) )
+        expected = get_location_expansion( np.kron( Z, X ), (0, 1) )
+        self.assertTrue( np.allclose( expansion, expected ) )
+
+    def test_get_location_expansion_invalid ( self ):
+        H = np.identity( 4 )
+        self.assertRaises( TypeError, get_location_expansion, H, (2,) )
+
+
+if __name__ == '__main__':
+    ut.main()
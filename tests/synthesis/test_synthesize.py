@@ -0,0 +1,206 @@
+import os
+import re
+import time
+import asyncio
+import tempfile
+import numpy    as np
+import unittest as ut
+
+from scipy.stats import unitary_group
+
+from qfast import utils
+from qfast import synthesize
+from qfast.cache import DecompositionCache
+from qfast.synthesis import synthesize_async
+from qfast import multiplexor
+from qfast.gate import Gate
+from qfast.synthesis import _Budget
+
+
+CNOT = np.array( [ [ 1, 0, 0, 0 ],
+                   [ 0, 1, 0, 0 ],
+                   [ 0, 0, 0, 1 ],
+                   [ 0, 0, 1, 0 ] ], dtype = np.complex128 )
+
+
+def get_u3 ( theta, phi, lam ):
+    return np.array( [ [ np.cos( theta / 2 ),
+                         -np.exp( 1j * lam ) * np.sin( theta / 2 ) ],
+                       [ np.exp( 1j * phi ) * np.sin( theta / 2 ),
+                         np.exp( 1j * ( phi + lam ) ) * np.cos( theta / 2 ) ] ] )
+
+
+def get_matrix ( qasm ):
+    """Simulates the u3, rz, sx, x and cx gates of a qasm program."""
+    num_qubits = int( re.search( r"qreg q\[(\d+)\];", qasm ).group( 1 ) )
+    M = np.identity( 2 ** num_qubits, dtype = np.complex128 )
+
+    for line in qasm.splitlines():
+        match = re.match( r"(\w+)(\((.*)\))? (q\[\d+\](,q\[\d+\])*);", line )
+
+        if match is None or match.group( 1 ) == "qreg":
+            continue
+
+        name = match.group( 1 )
+        params = [ float( p ) for p in match.group( 3 ).split( "," ) ] \
+                 if match.group( 3 ) else []
+        location = tuple( int( q ) for q in re.findall( r"\d+", match.group( 4 ) ) )
+
+        if name == "cx":
+            utry = CNOT
+        elif name == "u3":
+            utry = get_u3( *params )
+        elif name == "rz":
+            utry = np.diag( [ np.exp( -0.5j * params[0] ),
+                              np.exp( 0.5j * params[0] ) ] )
+        elif name == "sx":
+            utry = np.array( [ [ 1 + 1j, 1 - 1j ], [ 1 - 1j, 1 + 1j ] ] ) / 2
+        elif name == "x":
+            utry = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+        else:
+            raise ValueError( "Unknown gate: %s" % name )
+
+        M = Gate( utry, location ).get_circuit_matrix( num_qubits ) @ M
+
+    return M
+
+
+class TestSynthesize ( ut.TestCase ):
+
+    TOFFOLI = np.identity( 8, dtype = np.complex128 )
+    TOFFOLI[ 6:, 6: ] = np.array( [ [ 0, 1 ], [ 1, 0 ] ] )
+
+    def assert_implements ( self, qasm, utry ):
+        distance = utils.hilbert_schmidt_distance( utry, get_matrix( qasm ) )
+        self.assertTrue( distance < 1e-6 )
+
+    def assert_follows ( self, qasm, coupling_graph ):
+        for cx in re.findall( r"cx q\[(\d+)\],q\[(\d+)\];", qasm ):
+            self.assertIn( tuple( sorted( int( q ) for q in cx ) ),
+                           coupling_graph )
+
+    def test_synthesize_factorize ( self ):
+        U0 = unitary_group.rvs( 2, random_state = 1 )
+        U3 = unitary_group.rvs( 2, random_state = 2 )
+        utry = np.kron( np.kron( U0, CNOT ), U3 )
+
+        qasm = synthesize( utry, factorize = True )
+        self.assert_implements( qasm, utry )
+
+    def test_synthesize_factorize_coupling_graph ( self ):
+        U0 = unitary_group.rvs( 2, random_state = 3 )
+        U3 = unitary_group.rvs( 2, random_state = 4 )
+        utry = np.kron( np.kron( U0, CNOT ), U3 )
+        coupling_graph = [ (0, 1), (1, 2), (2, 3) ]
+
+        qasm = synthesize( utry, coupling_graph = coupling_graph,
+                           factorize = True )
+        self.assert_implements( qasm, utry )
+        self.assert_follows( qasm, coupling_graph )
+
+    def test_synthesize_demultiplex ( self ):
+        qasm = synthesize( self.TOFFOLI, demultiplex = True )
+        self.assert_implements( qasm, self.TOFFOLI )
+
+    def test_synthesize_demultiplex_coupling_graph ( self ):
+        coupling_graph = [ (0, 1), (1, 2) ]
+        qasm = synthesize( self.TOFFOLI, coupling_graph = coupling_graph,
+                           demultiplex = True )
+        self.assert_implements( qasm, self.TOFFOLI )
+        self.assert_follows( qasm, coupling_graph )
+
+    def test_synthesize_demultiplex_middle_control ( self ):
+        # A multiplexor controlled by qubit 1 of random blocks
+        A = unitary_group.rvs( 4, random_state = 5 )
+        B = unitary_group.rvs( 4, random_state = 6 )
+        blocks = np.zeros( ( 8, 8 ), dtype = np.complex128 )
+        blocks[ :4, :4 ] = A
+        blocks[ 4:, 4: ] = B
+        utry = multiplexor.reorder( blocks, 1, inverse = True )
+
+        with self.assertLogs( "qfast", level = "INFO" ) as logs:
+            qasm = synthesize( utry, demultiplex = True )
+
+        self.assert_implements( qasm, utry )
+        self.assertTrue( any( "Demultiplexed unitary on qubit 1." in line
+                              for line in logs.output ) )
+
+    def test_synthesize_factorize_budget ( self ):
+        # A CNOT chain on 4 qubits is decomposed as its own block
+        chain = np.identity( 16 )
+        for q in range( 3 ):
+            chain = Gate( CNOT, ( q, q + 1 ) ).get_circuit_matrix( 4 ) @ chain
+
+        utry = np.kron( unitary_group.rvs( 2, random_state = 1 ), chain )
+        calls = []
+
+        qasm = synthesize( utry, factorize = True, time_limit = 30,
+                           intermediate_solution_callback = calls.append )
+        self.assert_implements( qasm, utry )
+
+        # Blocks report gates on their own qubits, so they are not forwarded
+        self.assertEqual( calls, [] )
+
+    def test_synthesize_budget_split ( self ):
+        blocks = [ ( ( 0, 1, 2 ), unitary_group.rvs( 8, random_state = 9 ) ),
+                   ( ( 3, ), unitary_group.rvs( 2, random_state = 10 ) ),
+                   ( ( 4, 5, 6 ), np.identity( 8 ) ),
+                   ( ( 7, 8, 9 ), unitary_group.rvs( 8, random_state = 11 ) ) ]
+
+        budget = _Budget( time.time() + 10, 9, blocks, 2 )
+        options = [ budget.split( block, location, { "fuse": True } )
+                    for location, block in blocks ]
+
+        # Only the two blocks that are synthesized share the budgets
+        self.assertEqual( options[1], { "fuse": True } )
+        self.assertEqual( options[2], { "fuse": True } )
+        self.assertEqual( options[0][ "max_depth" ], 4 )
+        self.assertEqual( options[3][ "max_depth" ], 4 )
+        self.assertTrue( 4 < options[0][ "time_limit" ] <= 5 )
+        self.assertTrue( 9 < options[3][ "time_limit" ] <= 10 )
+        self.assertTrue( options[0][ "fuse" ] )
+
+        budget = _Budget( None, None, blocks, 2 )
+        options = budget.split( blocks[0][1], blocks[0][0], {} )
+        self.assertIsNone( options[ "time_limit" ] )
+        self.assertIsNone( options[ "max_depth" ] )
+
+    def check_shared_cache ( self, first, second ):
+        utry = np.diag( np.exp( 1j * np.array( [ 0.1, 0.2, 0.3, 0.4 ] ) ) )
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DecompositionCache( directory )
+            first( utry, cache )
+            names = os.listdir( directory )
+            self.assertEqual( len( names ), 1 )
+
+            # Replace the entry to tell a cache hit from a new synthesis
+            cache.put( names[0][ : -len( ".pkl" ) ], { "qasm": "cached" } )
+            self.assertEqual( second( utry, cache ), "cached" )
+
+    def test_synthesize_async_shared_cache ( self ):
+        sync = lambda utry, cache : synthesize( utry, cache = cache )
+        run_async = lambda utry, cache : asyncio.run(
+            synthesize_async( utry, cache = cache ) )
+
+        self.check_shared_cache( sync, run_async )
+        self.check_shared_cache( run_async, sync )
+
+    def test_synthesize_fuse ( self ):
+        utry = np.kron( np.identity( 2 ), CNOT )
+
+        with self.assertLogs( "qfast", level = "INFO" ) as logs:
+            qasm = synthesize( utry, fuse = True, fuse_tolerance = 1e-6 )
+
+        self.assert_implements( qasm, utry )
+        self.assertTrue( any( "of its 1.000000e-06 error budget" in line
+                              for line in logs.output ) )
+
+    def test_synthesize_fuse_invalid_tolerance ( self ):
+        utry = np.kron( np.identity( 2 ), CNOT )
+        self.assertRaises( ValueError, synthesize, utry, fuse = True,
+                           fuse_tolerance = -1 )
+
+
+if __name__ == '__main__':
+    ut.main()
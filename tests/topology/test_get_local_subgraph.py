@@ -0,0 +1,45 @@
+import numpy     as np
+import unittest  as ut
+import itertools as it
+
+from qfast.topology import Topology
+
+
+class TestTopologyGetLocalSubgraph ( ut.TestCase ):
+
+    def test_topology_get_local_subgraph_1 ( self ):
+        t = Topology( 4, [ (0, 1), (1, 2), (3, 2) ] )
+
+        self.assertEqual( t.get_local_subgraph( (1, 2, 3) ), [ (0, 1), (1, 2) ] )
+        self.assertEqual( t.get_local_subgraph( (0, 3) ), [] )
+        self.assertEqual( t.get_local_subgraph( (3, 2, 1) ), [ (1, 2), (0, 1) ] )
+
+    def test_topology_get_local_subgraph_brute_force ( self ):
+        rng = np.random.default_rng( 0 )
+        edges = list( it.combinations( range( 6 ), 2 ) )
+        cgraph = [ e for e in edges if rng.random() < 0.5 ]
+        t = Topology( 6, cgraph )
+        t.get_locations( 3 )
+
+        for size in range( 1, 5 ):
+            for location in it.permutations( range( 6 ), size ):
+                expected = sorted( tuple( sorted( ( location.index( q0 ),
+                                                    location.index( q1 ) ) ) )
+                                   for q0, q1 in t.get_subgraph( location ) )
+                subgraph = t.get_local_subgraph( location )
+                self.assertEqual( sorted( subgraph ), expected )
+
+    def test_topology_get_local_subgraph_lazy ( self ):
+        t = Topology( 8, [ ( i, i + 1 ) for i in range( 7 ) ] )
+        t.get_locations( 3 )
+        self.assertEqual( len( t.subgraphs ), 0 )
+
+        self.assertEqual( t.get_local_subgraph( (2, 3, 4) ), [ (0, 1), (1, 2) ] )
+        self.assertEqual( len( t.subgraphs ), 1 )
+
+        self.assertEqual( t.get_local_subgraph( (4, 3, 2) ), [ (1, 2), (0, 1) ] )
+        self.assertEqual( len( t.subgraphs ), 1 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -1,7 +1,8 @@
-import numpy    as np
-import unittest as ut
+import numpy     as np
+import unittest  as ut
+import itertools as it
 
-from qfast.topology import Topology 
+from qfast.topology import Topology, _get_locations
 
 
 class TestTopologyGetLocations ( ut.TestCase ):
@@ -35,6 +36,73 @@ class TestTopologyGetLocations ( ut.TestCase ):
         self.assertTrue( (0, 2, 3) in l )
         self.assertTrue( (1, 2, 3) in l )
 
+    def test_topology_get_locations_brute_force ( self ):
+        rng = np.random.default_rng( 0 )
+
+        for num_qubits in range( 2, 9 ):
+            edges = list( it.combinations( range( num_qubits ), 2 ) )
+            cgraph = [ e for e in edges if rng.random() < 0.4 ] or [ (0, 1) ]
+            t = Topology( num_qubits, cgraph )
+
+            for gate_size in range( 1, num_qubits + 1 ):
+                expected = []
+                for group in it.combinations( range( num_qubits ), gate_size ):
+                    seen = set( [ group[0] ] )
+                    frontier = [ group[0] ]
+                    while len( frontier ) > 0:
+                        q0 = frontier.pop()
+                        for q1 in group:
+                            if q1 not in seen and ( ( q0, q1 ) in cgraph
+                                                    or ( q1, q0 ) in cgraph ):
+                                seen.add( q1 )
+                                frontier.append( q1 )
+                    if len( seen ) == gate_size:
+                        expected.append( group )
+
+                self.assertEqual( t.get_locations( gate_size ), expected )
+
+    def test_topology_get_locations_shared ( self ):
+        t0 = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+        t1 = Topology( 4, [ (3, 2), (0, 1), (2, 1) ] )
+
+        l0 = t0.get_locations( 2 )
+        l0.append( (0, 3) )
+
+        self.assertEqual( t1.get_locations( 2 ), [ (0, 1), (1, 2), (2, 3) ] )
+
+    def test_topology_get_locations_large ( self ):
+        cgraph = []
+        for q in range( 100 ):
+            if q % 10 < 9:
+                cgraph.append( ( q, q + 1 ) )
+            if q < 90:
+                cgraph.append( ( q, q + 10 ) )
+
+        t = Topology( 100, cgraph )
+
+        self.assertEqual( len( t.get_locations( 2 ) ), 180 )
+        self.assertEqual( len( t.get_locations( 4 ) ), 1373 )
+
+    def test_topology_get_locations_cache_evicts ( self ):
+        maxsize = _get_locations.cache_info().maxsize
+        topologies = [ Topology( n, [ ( q, q + 1 ) for q in range( n - 1 ) ] )
+                       for n in range( 2, maxsize + 3 ) ]
+
+        for t in topologies:
+            t.get_locations( 2 )
+
+        # The first coupling graph was evicted, so it is recomputed
+        misses = _get_locations.cache_info().misses
+        other = Topology( 2, [ ( 0, 1 ) ] )
+        self.assertEqual( other.get_locations( 2 ), [ ( 0, 1 ) ] )
+        self.assertEqual( _get_locations.cache_info().misses, misses + 1 )
+
+        # The last coupling graph is still cached
+        last = topologies[-1]
+        other = Topology( last.num_qubits, last.coupling_graph )
+        other.get_locations( 2 )
+        self.assertEqual( _get_locations.cache_info().misses, misses + 1 )
+
     def test_topology_get_locations_invalid ( self ):
         cgraph = [ (0, 1), (1, 2), (2, 3) ]
         t = Topology( 4, cgraph )
@@ -0,0 +1,41 @@
+import numpy     as np
+import unittest  as ut
+import itertools as it
+
+from qfast.topology import Topology
+
+
+class TestTopologyIsConnected ( ut.TestCase ):
+
+    def test_topology_is_connected_line ( self ):
+        t = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+
+        self.assertTrue( t.is_connected( (2,) ) )
+        self.assertTrue( t.is_connected( (1, 2) ) )
+        self.assertTrue( t.is_connected( (3, 1, 2) ) )
+        self.assertTrue( t.is_connected( (0, 1, 2, 3) ) )
+        self.assertFalse( t.is_connected( (0, 2) ) )
+        self.assertFalse( t.is_connected( (0, 1, 3) ) )
+
+    def test_topology_is_connected_all_to_all ( self ):
+        t = Topology( 4 )
+
+        for size in range( 1, 5 ):
+            for location in it.combinations( range( 4 ), size ):
+                self.assertTrue( t.is_connected( location ) )
+
+    def test_topology_is_connected_brute_force ( self ):
+        rng = np.random.default_rng( 0 )
+        edges = list( it.combinations( range( 6 ), 2 ) )
+        cgraph = [ e for e in edges if rng.random() < 0.3 ]
+        t = Topology( 6, cgraph )
+
+        for size in range( 1, 7 ):
+            expected = set( t.get_locations( size ) )
+            for location in it.combinations( range( 6 ), size ):
+                self.assertEqual( t.is_connected( location ),
+                                  location in expected )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,35 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.topology import Topology
+
+
+class TestTopologySelectLayout ( ut.TestCase ):
+
+    # A line 0-1-2-3 leading to the triangle 4-5-6
+    CGRAPH = [ (0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (4, 6) ]
+
+    def test_topology_select_layout_1 ( self ):
+        t = Topology( 7, self.CGRAPH )
+        self.assertEqual( t.select_layout( 3, 2 ), (4, 5, 6) )
+
+    def test_topology_select_layout_2 ( self ):
+        # Star 0-1, 0-2, 0-3 beats the line 3-4-5-6 for 3-qubit gates
+        cgraph = [ (0, 1), (0, 2), (0, 3), (3, 4), (4, 5), (5, 6) ]
+        t = Topology( 7, cgraph )
+        self.assertEqual( t.select_layout( 4, 3 ), (0, 1, 2, 3) )
+
+    def test_topology_select_layout_ties ( self ):
+        t = Topology( 4, [ (0, 1), (1, 2), (2, 3) ] )
+        self.assertEqual( t.select_layout( 2, 2 ), (0, 1) )
+
+    def test_topology_select_layout_invalid ( self ):
+        t = Topology( 5, [ (0, 1), (1, 2), (3, 4) ] )
+
+        self.assertRaises( ValueError, t.select_layout, 4, 2 )
+        self.assertRaises( ValueError, t.select_layout, 2, 3 )
+        self.assertRaises( ValueError, t.select_layout, 6, 2 )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,28 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.utils import hilbert_schmidt_distance
+
+
+class TestHilbertSchmidtDistance ( ut.TestCase ):
+
+    X = np.array( [ [ 0, 1 ], [ 1, 0 ] ], dtype = np.complex128 )
+    Z = np.array( [ [ 1, 0 ], [ 0, -1 ] ], dtype = np.complex128 )
+
+    def test_hilbert_schmidt_distance_equal ( self ):
+        self.assertAlmostEqual( hilbert_schmidt_distance( self.X, self.X ), 0 )
+
+    def test_hilbert_schmidt_distance_phase ( self ):
+        U = np.exp( 0.3j ) * self.X
+        self.assertAlmostEqual( hilbert_schmidt_distance( self.X, U ), 0 )
+
+    def test_hilbert_schmidt_distance_orthogonal ( self ):
+        self.assertAlmostEqual( hilbert_schmidt_distance( self.X, self.Z ), 1 )
+
+    def test_hilbert_schmidt_distance_invalid ( self ):
+        self.assertRaises( ValueError, hilbert_schmidt_distance,
+                           self.X, np.identity( 4 ) )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,39 @@
+import numpy    as np
+import unittest as ut
+
+from qfast.utils import partial_trace
+
+
+class TestPartialTrace ( ut.TestCase ):
+
+    A = np.array( [ [ 1, 2 ], [ 3, 4 ] ], dtype = np.complex128 )
+    B = np.array( [ [ 0, 1j ], [ 2, 5 ] ], dtype = np.complex128 )
+
+    def test_partial_trace_keep_first ( self ):
+        M = np.kron( self.A, self.B )
+        R = partial_trace( M, (0,) )
+        self.assertTrue( np.allclose( R, self.A * np.trace( self.B ) ) )
+
+    def test_partial_trace_keep_second ( self ):
+        M = np.kron( self.A, self.B )
+        R = partial_trace( M, (1,) )
+        self.assertTrue( np.allclose( R, self.B * np.trace( self.A ) ) )
+
+    def test_partial_trace_order ( self ):
+        M = np.kron( np.kron( self.A, np.identity( 2 ) ), self.B )
+        R = partial_trace( M, (2, 0) )
+        self.assertTrue( np.allclose( R, 2 * np.kron( self.B, self.A ) ) )
+
+    def test_partial_trace_all ( self ):
+        M = np.kron( self.A, self.B )
+        self.assertTrue( np.allclose( partial_trace( M, (0, 1) ), M ) )
+
+    def test_partial_trace_invalid ( self ):
+        M = np.kron( self.A, self.B )
+        self.assertRaises( TypeError, partial_trace, M, (2,) )
+        self.assertRaises( TypeError, partial_trace, M, (0, 0) )
+        self.assertRaises( TypeError, partial_trace, "a", (0,) )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,28 @@
+import unittest as ut
+
+from qfast import workerpool
+from qfast.workerpool import get_default_pool
+
+
+class TestGetDefaultPool ( ut.TestCase ):
+
+    def tearDown ( self ):
+        workerpool._shutdown_default_pool()
+
+    def test_get_default_pool_shared ( self ):
+        pool = get_default_pool()
+        self.assertIs( get_default_pool(), pool )
+
+    def test_get_default_pool_shutdown ( self ):
+        pool = get_default_pool()
+        workerpool._shutdown_default_pool()
+        self.assertIsNone( workerpool._default_pool )
+
+        # Shutting down twice, as atexit would after a manual shutdown
+        workerpool._shutdown_default_pool()
+
+        self.assertIsNot( get_default_pool(), pool )
+
+
+if __name__ == '__main__':
+    ut.main()